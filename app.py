@@ -1,11 +1,17 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
+import json
 from datetime import datetime
 from pathlib import Path
-import joblib
-import nflreadpy as nfl
+
+from src import season_performance
+from src.data_source import get_current_week
+from src.feature_store import last_modified, seasons
+from src.instrumentation import load_last_run
+from src.live_wp import LIVE_PATH
+from src.odds import add_vegas_implied
+from src.refresh import current_version, read_manifest
 
 st.set_page_config(
     page_title="NFL Game Predictions",
@@ -15,69 +21,41 @@ st.set_page_config(
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def moneyline_to_prob(ml):
-    """Convert American moneyline to raw implied probability (before vig removal)."""
-    if ml < 0:
-        return abs(ml) / (abs(ml) + 100)
-    return 100 / (ml + 100)
-
-def add_vegas_implied(df):
-    """Add vig-normalized Vegas implied probability columns to a dataframe."""
-    df = df.copy()
-    df["away_implied_raw"] = df["away_moneyline"].apply(moneyline_to_prob)
-    df["home_implied_raw"] = df["home_moneyline"].apply(moneyline_to_prob)
-    total = df["away_implied_raw"] + df["home_implied_raw"]
-    df["away_implied"] = df["away_implied_raw"] / total
-    df["home_implied"] = df["home_implied_raw"] / total
-    df.drop(columns=["away_implied_raw", "home_implied_raw"], inplace=True)
-    return df
-
-def get_last_updated():
-    path = Path("data/latest_predictions.csv")
-    ts = path.stat().st_mtime
+def get_last_updated(manifest):
+    if manifest is not None:
+        ts = datetime.fromisoformat(manifest["published_at"]).timestamp()
+    else:
+        ts = Path("data/latest_predictions.csv").stat().st_mtime
     return datetime.fromtimestamp(ts).strftime("%b %d, %Y %I:%M %p")
 
 # ── Data loading ──────────────────────────────────────────────────────────────
 
-@st.cache_data
-def load_predictions():
+# Keyed on the published version (src/refresh.py): a refresh reloads these
+# once, and the superseded entry is dropped.
+@st.cache_data(max_entries=1)
+def load_predictions(version):
     df = pd.read_csv("data/latest_predictions.csv")
     return add_vegas_implied(df)
 
-@st.cache_data
-def load_season_performance():
-    """Apply the saved model to all 2025 regular-season games and return results."""
-    features = joblib.load("models/feature_list.pkl")
-    scaler   = joblib.load("models/scaler.pkl")
-    model    = joblib.load("models/finalized_model.pkl")
-
-    df = pd.read_csv("data/games_with_stats.csv")
-    season = df[(df["season"] == 2025) & (df["game_type"] == "REG")].copy()
-    season = season.dropna(subset=features + ["home_win", "away_moneyline", "home_moneyline"])
-
-    X = scaler.transform(season[features])
-    season["home_win_prob"] = model.predict_proba(X)[:, 1]
-    season["away_win_prob"] = 1 - season["home_win_prob"]
-    season["pred_home_win"] = (season["home_win_prob"] > 0.5).astype(int)
-    season["model_correct"] = (season["pred_home_win"] == season["home_win"]).astype(int)
-
-    season = add_vegas_implied(season)
-    season["vegas_pred_home_win"] = (season["home_implied"] > 0.5).astype(int)
-    season["vegas_correct"] = (season["vegas_pred_home_win"] == season["home_win"]).astype(int)
-
-    season["matchup"] = season["away_team"] + " @ " + season["home_team"]
-    season["predicted_winner"] = season.apply(
-        lambda r: r["home_team"] if r["pred_home_win"] == 1 else r["away_team"], axis=1
-    )
-    season["actual_winner"] = season.apply(
-        lambda r: r["home_team"] if r["home_win"] == 1 else r["away_team"], axis=1
-    )
-
-    return season.sort_values(["week", "gameday"]).reset_index(drop=True)
-
-predictions_df   = load_predictions()
-season_df        = load_season_performance()
-current_week     = nfl.get_current_week()
+# Keyed on the table's own modification time: the weekly update and the
+# notebook rewrite it without publishing new predictions.
+@st.cache_data(max_entries=8)
+def load_season_performance(season, modified):
+    """Precomputed model vs Vegas results for one season (see src/season_performance.py)."""
+    return season_performance.load_season_performance(season)
+
+def load_live():
+    """Latest board from src/live_wp.py, or None when nothing is being tracked."""
+    if not LIVE_PATH.exists():
+        return None
+    return json.loads(LIVE_PATH.read_text())
+
+manifest         = read_manifest()
+version          = current_version()
+performance_season = seasons("season_performance")[-1]
+predictions_df   = load_predictions(version)
+season_df        = load_season_performance(performance_season, last_modified("season_performance"))
+current_week     = get_current_week()
 
 # ── Sidebar ───────────────────────────────────────────────────────────────────
 
@@ -85,7 +63,31 @@ with st.sidebar:
     st.header("Settings")
     st.markdown("---")
     st.markdown("**Model Info**")
-    st.info(f"Last updated: {get_last_updated()}")
+    st.info(f"Last updated: {get_last_updated(manifest)}")
+
+    last_run = load_last_run()
+    with st.expander("Last pipeline run"):
+        if last_run is None:
+            st.caption("No traced runs yet. Run the weekly update or predictor with `NFL_TRACE=1`.")
+        else:
+            stages = pd.DataFrame(last_run["spans"]).sort_values("started_at")
+            total = stages.loc[stages["depth"] == 0, "duration_s"].sum()
+            stages["stage"] = stages["depth"].map(lambda d: "· " * d) + stages["stage"]
+            stages["share"] = stages["duration_s"] / total
+            stages["peak_mb"] = stages["peak_bytes"] / 1e6
+            st.caption(f"{last_run['pipeline']} · {stages['started_at'].iloc[0][:19]} UTC · {total:.2f}s")
+            st.dataframe(
+                stages[["stage", "duration_s", "share", "rows", "peak_mb"]],
+                hide_index=True,
+                column_config={
+                    "stage":      st.column_config.TextColumn("Stage"),
+                    "duration_s": st.column_config.NumberColumn("Seconds", format="%.3f"),
+                    "share":      st.column_config.ProgressColumn("Share", format="%.0f%%", min_value=0, max_value=1),
+                    "rows":       st.column_config.NumberColumn("Rows", format="%d"),
+                    "peak_mb":    st.column_config.NumberColumn("Peak MB", format="%.1f"),
+                },
+            )
+
     st.markdown("---")
     st.header("Filters")
 
@@ -100,7 +102,9 @@ with st.sidebar:
 
 # ── Tabs ──────────────────────────────────────────────────────────────────────
 
-tab_week, tab_season = st.tabs([f"Week {current_week} Predictions", "2025 Season Performance"])
+tab_week, tab_season, tab_live = st.tabs(
+    [f"Week {current_week} Predictions", f"{performance_season} Season Performance", "Live"]
+)
 
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 1 — THIS WEEK
@@ -205,11 +209,11 @@ with tab_week:
     )
 
 # ══════════════════════════════════════════════════════════════════════════════
-# TAB 2 — 2025 SEASON PERFORMANCE
+# TAB 2 — SEASON PERFORMANCE
 # ══════════════════════════════════════════════════════════════════════════════
 
 with tab_season:
-    st.title("2025 Season Performance")
+    st.title(f"{performance_season} Season Performance")
     st.markdown("How the model performed on completed regular-season games vs Vegas moneylines")
     st.markdown("---")
 
@@ -346,3 +350,76 @@ with tab_season:
             "model_correct":     st.column_config.CheckboxColumn("Model Correct"),
         },
     )
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 3 — LIVE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def clock_label(game):
+    if game["done"]:
+        return "Final"
+    if game.get("qtr") is not None:
+        quarter, left = int(game["qtr"]), int(game["quarter_seconds_left"])
+    else:
+        # Boards written before the engine tracked the quarter.
+        game_left = int(game["seconds_left"])
+        quarter = 4 - max(game_left - 1, 0) // 900
+        left = game_left - (4 - quarter) * 900
+    period = "OT" if quarter > 4 else f"Q{quarter}"
+    return f"{period} {left // 60}:{left % 60:02d}"
+
+def render_live():
+    live = load_live()
+    if live is None:
+        st.info("No live games. Start the engine with `python -m src.live_wp` "
+                "(or `--replay <play-by-play file>`).")
+        return
+
+    games = pd.DataFrame(live["games"])
+    games["matchup"] = games["away_team"] + " @ " + games["home_team"]
+    games["score"] = games["away_score"].astype(str) + " - " + games["home_score"].astype(str)
+    games["clock"] = [clock_label(g) for g in live["games"]]
+    status = "final" if live["finished"] else "in progress"
+    st.caption(f"Updated {live['updated_at'][:19].replace('T', ' ')} UTC · {len(games)} games {status}")
+
+    st.dataframe(
+        games[["matchup", "score", "clock", "prior", "home_win_prob", "last_play"]],
+        width="stretch",
+        hide_index=True,
+        column_config={
+            "matchup":       st.column_config.TextColumn("Matchup"),
+            "score":         st.column_config.TextColumn("Score (away - home)"),
+            "clock":         st.column_config.TextColumn("Clock"),
+            "prior":         st.column_config.ProgressColumn("Pregame Home %", format="%.0f%%", min_value=0, max_value=1),
+            "home_win_prob": st.column_config.ProgressColumn("Live Home %", format="%.0f%%", min_value=0, max_value=1),
+            "last_play":     st.column_config.TextColumn("Last Play"),
+        },
+    )
+
+    fig_live = go.Figure()
+    for game in live["games"]:
+        elapsed, probs = zip(*game["history"])
+        fig_live.add_trace(go.Scatter(
+            x=[e / 60 for e in elapsed], y=probs, mode="lines",
+            name=f"{game['away_team']} @ {game['home_team']}",
+        ))
+    fig_live.add_hline(y=0.5, line_dash="dash", line_color="gray", opacity=0.4)
+    fig_live.update_layout(
+        xaxis=dict(title="Game minute", range=[0, 60]),
+        yaxis=dict(tickformat=".0%", range=[0, 1], title="Home Win Probability"),
+        height=420,
+        margin=dict(l=10, r=10, t=30, b=40),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    st.plotly_chart(fig_live, width="stretch")
+
+with tab_live:
+    st.title("Live Win Probability")
+    st.markdown("Pregame model probabilities updated after every play")
+    st.markdown("---")
+
+    live = load_live()
+    # Rerun just this tab every few seconds while games are being played.
+    refresh_every = 5 if live is not None and not live["finished"] else None
+    st.fragment(run_every=refresh_every)(render_live)()
@@ -0,0 +1,60 @@
+"""Benchmark the vectorized EWMA engine against the notebook's groupby/transform.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_ewma --seasons 5 --repeat 3
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_team_stats
+from src.feature_engine import (
+    EWMA_ALPHA,
+    INDEPENDENT_VARIABLES,
+    add_derived_features,
+    compute_ewma,
+)
+
+
+def groupby_transform_ewma(team_stats, variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """The notebook's original per-group lambda implementation."""
+    out = pd.DataFrame(index=team_stats.index)
+    for var in variables:
+        out[f'{var}_ewma'] = team_stats.groupby(['team', 'season'])[var].transform(
+            lambda x: x.ewm(alpha=alpha, adjust=False).mean()
+        )
+    return out
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    team_stats = add_derived_features(synthetic_team_stats(args.seasons))
+
+    old_time, expected = best_of(lambda: groupby_transform_ewma(team_stats), args.repeat)
+    new_time, (actual, _) = best_of(lambda: compute_ewma(team_stats), args.repeat)
+
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+    print(f"rows: {len(team_stats):,}  features: {len(INDEPENDENT_VARIABLES)}")
+    print(f"groupby/transform: {old_time * 1000:8.1f} ms")
+    print(f"feature engine:    {new_time * 1000:8.1f} ms")
+    print(f"speedup:           {old_time / new_time:8.1f}x  (outputs identical)")
+
+
+if __name__ == "__main__":
+    main()
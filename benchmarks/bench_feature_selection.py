@@ -0,0 +1,81 @@
+"""Feature selectors vs. the original 200-tree random forest.
+
+Uses the notebook's split (train on seasons before the last, test on the
+last) and its final model: each selector picks the top ``--k`` features,
+then a standardized logistic regression is fit on them and scored on the
+test season. Selection time is measured cold (no cache) and on a cache hit.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_feature_selection
+    python -m benchmarks.bench_feature_selection --k 8 --repeat 3
+"""
+import argparse
+import tempfile
+import time
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.backtest import probability_scores
+from src.feature_engine import INDEPENDENT_VARIABLES
+from src.feature_selection import SELECTORS, rank_features
+from src.feature_store import load_table
+
+FEATURES = [f'{var}_ewma_diff' for var in INDEPENDENT_VARIABLES]
+
+
+def load_split():
+    games = load_table('games_with_stats', columns=['season', 'home_win'] + FEATURES)
+    games = games.fillna({'pat_pct_ewma_diff': 0, 'fg_pct_ewma_diff': 0}).dropna()
+    test_season = games['season'].max()
+    train, test = games[games['season'] < test_season], games[games['season'] == test_season]
+    return train[FEATURES], train['home_win'], test[FEATURES], test['home_win']
+
+
+def evaluate(features, X_train, y_train, X_test, y_test):
+    scaler = StandardScaler().fit(X_train[features])
+    model = LogisticRegression(random_state=41, max_iter=1000)
+    model.fit(scaler.transform(X_train[features]), y_train)
+    probs = model.predict_proba(scaler.transform(X_test[features]))[:, 1]
+    return probability_scores(y_test.to_numpy(), probs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--k', type=int, default=10, help="features to keep")
+    parser.add_argument('--repeat', type=int, default=1, help="cold runs per selector (best is kept)")
+    args = parser.parse_args()
+
+    X_train, y_train, X_test, y_test = load_split()
+    print(f"train {len(X_train)} games, test {len(X_test)} games, {len(FEATURES)} candidate features\n")
+
+    baseline = None
+    print(f"{'selector':<14} {'cold ms':>9} {'cached ms':>10} {'accuracy':>9} {'log-loss':>9} "
+          f"{'overlap w/ RF':>14}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for selector in ['random_forest'] + [s for s in SELECTORS if s != 'random_forest']:
+            cold = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                ranking = rank_features(X_train, y_train, selector, cache_dir=None)
+                cold.append(time.perf_counter() - start)
+
+            rank_features(X_train, y_train, selector, cache_dir=cache_dir)
+            start = time.perf_counter()
+            rank_features(X_train, y_train, selector, cache_dir=cache_dir)
+            cached = time.perf_counter() - start
+
+            selected = ranking.head(args.k)['feature'].to_list()
+            baseline = baseline or set(selected)
+            scores = evaluate(selected, X_train, y_train, X_test, y_test)
+            print(f"{selector:<14} {min(cold) * 1000:9.1f} {cached * 1000:10.2f} "
+                  f"{scores['accuracy']:9.3f} {scores['log_loss']:9.3f} "
+                  f"{len(baseline & set(selected)):>11}/{args.k}")
+
+    scores = evaluate(FEATURES, X_train, y_train, X_test, y_test)
+    print(f"{'(all)':<14} {'':>9} {'':>10} {scores['accuracy']:9.3f} {scores['log_loss']:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
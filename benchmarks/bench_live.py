@@ -0,0 +1,72 @@
+"""Replay harness for the live win probability engine (``src/live_wp.py``).
+
+Replays a slate of games through ``run_slate``, one asyncio task per game,
+and reports the latency of each per-play update (p50/p99/max), the total
+throughput in plays per second, and how often the board was published. The
+slate is simulated (``benchmarks.synthetic.synthetic_pbp``) unless
+``--file`` points at real play-by-play.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_live                         # one 16-game Sunday, as fast as possible
+    python -m benchmarks.bench_live --games 160 --repeat 5  # ten slates at once
+    python -m benchmarks.bench_live --file data/pbp_2025.parquet --speed 600
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_pbp
+from src.live_wp import game_states, play_records, read_pbp, replay_game, run_slate
+
+
+def replay(records, games, priors, speed, publish_dir, publish_interval):
+    """One replay; returns (update latencies in ns, wall seconds, publishes)."""
+    states = game_states(games, priors)
+    sources = [replay_game(records[g], speed) for g in games['game_id']]
+    path = Path(publish_dir) / 'live_wp.json'
+    latencies = []
+    start = time.perf_counter()
+    asyncio.run(run_slate(states, sources, path, publish_interval, latencies))
+    wall = time.perf_counter() - start
+    return np.array(latencies), wall, json.loads(path.read_text())['sequence']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--file', help="play-by-play Parquet/CSV to replay instead of a simulated slate")
+    parser.add_argument('--speed', type=float, default=0.0, help="game seconds per wall second (0: unpaced)")
+    parser.add_argument('--publish-interval', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.file:
+        pbp = read_pbp(args.file)
+        priors = {}
+    else:
+        pbp, prior_frame = synthetic_pbp(args.games, args.seed)
+        priors = dict(zip(prior_frame['game_id'], prior_frame['win_prob']))
+    records = play_records(pbp)
+    games = pd.DataFrame([plays[0] for plays in records.values()])
+
+    print(f"{len(games)} games, {len(pbp):,} plays, speed {args.speed or 'unpaced'}")
+    print(f"{'run':>4} {'p50 us':>8} {'p99 us':>8} {'max us':>8} {'wall s':>8} {'plays/s':>12} {'publishes':>10}")
+    with tempfile.TemporaryDirectory() as publish_dir:
+        for i in range(args.repeat):
+            latencies, wall, published = replay(
+                records, games, priors, args.speed, publish_dir, args.publish_interval)
+            p50, p99 = np.percentile(latencies, [50, 99]) / 1000
+            print(f"{i + 1:>4} {p50:>8.2f} {p99:>8.2f} {latencies.max() / 1000:>8.1f} "
+                  f"{wall:>8.3f} {len(latencies) / wall:>12,.0f} {published:>10}")
+
+
+if __name__ == "__main__":
+    main()
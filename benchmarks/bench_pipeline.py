@@ -0,0 +1,222 @@
+"""Benchmark the pipeline's hot paths on synthetic league data.
+
+Generates a league with ``benchmarks/synthetic.py`` (no network, no files
+from ``data/``; only the model bundle is read) and times:
+
+- ``ewma_features``: team stats to ``df_clean`` (``build_team_features``);
+- ``merge_diff_notebook``: home/away stats and diffs over all games
+  (``build_games_with_stats``);
+- ``merge_diff_predictor``: ``get_nfl_diffs``' diffs against the latest
+  stats (``matchup_diffs``) for every game of the last season;
+- ``score_bundle`` / ``score_sklearn``: scoring every game with the model
+  bundle, and with ``StandardScaler.transform`` + ``predict_proba``;
+- ``season_performance_build`` / ``season_performance_load``: building the
+  Season Performance table, and the store read behind ``app.py``'s
+  ``load_season_performance``;
+- ``explore_table_build`` / ``explore_lookup`` / ``explore_filter``: the
+  Explore Stats table, one team-season lookup per team of the last season,
+  and the same lookups done with the page's old boolean filter + aggregation;
+- ``odds_history_proportional`` / ``odds_history_shin`` /
+  ``odds_history_power``: moneyline, spread and total implied probabilities
+  for 8 books x 12 snapshots of every game (``implied_lines``).
+
+Each case reports the best and median of ``--repeat`` runs. Results are
+written as JSON (with the scale, versions and git commit) so runs can be
+compared over time with ``--compare``.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --seasons 50 --teams 320 --repeat 3   # 100x today's data
+    python -m benchmarks.bench_pipeline --compare outputs/benchmarks/previous.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_league, synthetic_lines
+from src.feature_engine import (
+    add_derived_features,
+    build_games_with_stats,
+    build_team_features,
+    completed_games,
+    latest_team_stats,
+)
+from src.model_bundle import load_bundle
+from src.nfl_predictor import matchup_diffs
+from src.odds import VIG_METHODS, implied_lines
+from src.season_performance import (
+    build_season_performance,
+    load_season_performance,
+    write_season_performance,
+)
+from src.team_table import TeamStatsTable
+
+RESULTS_DIR = Path('outputs/benchmarks')
+
+
+def sklearn_scorer(games, features):
+    """A scaler and logistic regression fit on ``games``, as the notebook saved them."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    X = games[features].to_numpy()
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), games['home_win'])
+    return lambda: model.predict_proba(scaler.transform(games[features].to_numpy()))[:, 1]
+
+
+def explore_filter(df_clean, season, teams, stat):
+    """The Explore Stats page's per-rerun work before ``TeamStatsTable``."""
+    season_df = df_clean[df_clean['season'] == season]
+    for team in teams:
+        team_df = season_df[season_df['team'] == team].sort_values('week')
+        values = team_df[stat]
+        [values.mean(), values.max(), values.min(), values.std(), values.iloc[-1]]
+
+
+def build_cases(schedule, team_stats, bundle, store_dir):
+    """``{name: (rows, fn)}``; inputs are prepared here, outside the timed calls."""
+    raw = add_derived_features(team_stats)
+    df_clean, state = build_team_features(raw)
+    games = completed_games(schedule)
+    games_with_stats = build_games_with_stats(games, df_clean)
+    scored = games_with_stats.dropna(subset=bundle.features)
+
+    last_season = int(games['season'].max())
+    last_games = schedule[schedule['season'] == last_season]
+    latest = latest_team_stats(state)
+
+    write_season_performance(games_with_stats, bundle, store_dir=store_dir)
+    performance_rows = len(load_season_performance(last_season, store_dir))
+
+    table = TeamStatsTable(df_clean)
+    teams = table.teams_in(last_season)
+    stat = table.stat_columns[0]
+
+    lines = synthetic_lines(schedule)
+
+    cases = {
+        'ewma_features': (len(raw), lambda: build_team_features(raw)),
+        'merge_diff_notebook': (len(games), lambda: build_games_with_stats(games, df_clean)),
+        'merge_diff_predictor': (len(last_games), lambda: matchup_diffs(last_games, latest, bundle)),
+        'score_bundle': (len(scored), lambda: bundle.predict_proba(scored)),
+        'score_sklearn': (len(scored), sklearn_scorer(scored, bundle.features)),
+        'season_performance_build': (len(games_with_stats),
+                                     lambda: build_season_performance(games_with_stats, bundle)),
+        'season_performance_load': (performance_rows,
+                                    lambda: load_season_performance(last_season, store_dir)),
+        'explore_table_build': (len(df_clean), lambda: TeamStatsTable(df_clean)),
+        'explore_lookup': (len(teams), lambda: [
+            (table.team_frame(last_season, team, stat), table.summary(last_season, team, stat))
+            for team in teams
+        ]),
+        'explore_filter': (len(teams), lambda: explore_filter(df_clean, last_season, teams, stat)),
+    }
+    for method in VIG_METHODS:
+        cases[f'odds_history_{method}'] = (len(lines), partial(implied_lines, lines, method))
+    return cases
+
+
+def time_case(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(n_seasons=5, n_teams=32, weeks=18, seed=0, repeat=5, only=None):
+    """Run the benchmark cases and return the JSON-ready report."""
+    schedule, team_stats = synthetic_league(n_seasons, n_teams, weeks, seed)
+    bundle = load_bundle()
+
+    results = []
+    with tempfile.TemporaryDirectory() as store_dir:
+        cases = build_cases(schedule, team_stats, bundle, store_dir)
+        for name, (rows, fn) in cases.items():
+            if only and name not in only:
+                continue
+            best, median = time_case(fn, repeat)
+            results.append({
+                'case': name,
+                'rows': rows,
+                'best_ms': round(best * 1000, 3),
+                'median_ms': round(median * 1000, 3),
+                'rows_per_s': round(rows / best) if best > 0 else None,
+            })
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'scale': {'seasons': n_seasons, 'teams': n_teams, 'weeks': weeks, 'seed': seed,
+                  'games': len(schedule), 'team_weeks': len(team_stats)},
+        'repeat': repeat,
+        'model_hash': bundle.content_hash,
+        'results': results,
+    }
+
+
+def print_report(report, baseline=None):
+    previous = {r['case']: r for r in baseline['results']} if baseline else {}
+    scale = report['scale']
+    print(f"{scale['seasons']} seasons x {scale['teams']} teams x {scale['weeks']} weeks: "
+          f"{scale['games']:,} games, {scale['team_weeks']:,} team-weeks")
+    header = f"{'case':<26} {'rows':>9} {'best ms':>10} {'median ms':>10} {'rows/s':>12}"
+    print(header + ("  vs baseline" if previous else ""))
+    for r in report['results']:
+        line = (f"{r['case']:<26} {r['rows']:>9,} {r['best_ms']:>10.2f} {r['median_ms']:>10.2f} "
+                f"{r['rows_per_s'] or 0:>12,}")
+        if r['case'] in previous:
+            line += f"  {previous[r['case']]['best_ms'] / r['best_ms']:>6.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--teams', type=int, default=32)
+    parser.add_argument('--weeks', type=int, default=18)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--case', action='append', help="run only this case (repeatable)")
+    parser.add_argument('--out', help="results JSON (default: outputs/benchmarks/pipeline-<time>.json)")
+    parser.add_argument('--compare', help="earlier results JSON to show speedups against")
+    args = parser.parse_args()
+
+    report = run(args.seasons, args.teams, args.weeks, args.seed, args.repeat, args.case)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / (
+        'pipeline-' + datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ') + '.json')
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + '\n')
+    print(f"\nSaved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Peak memory and throughput of the chunked player stats ingestion.
+
+Writes a synthetic league's weekly player stats as one Parquet file per
+season (``benchmarks.synthetic.synthetic_player_stats``), then builds the
+team-week ``PLAYER_VARIABLES`` (``src/player_stats.py``) two ways:
+
+- eager: every column of every season loaded into one pandas frame, like
+  ``data_source.load_player_stats``, and reduced at once;
+- chunked: ``season_features`` per season at each ``--chunk-rows``.
+
+Each case runs in a fresh process, so peak memory is that case's alone: the
+peak RSS above the RSS after imports (the peak is reset first through
+``/proc/self/clear_refs``, so this needs Linux), and the peak of Arrow's
+memory pool. Outputs of every case must be identical.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_player_stats                          # 5 and 20 seasons of 64 teams
+    python -m benchmarks.bench_player_stats --seasons 5 --teams 32 --chunk-rows 8192 65536
+    python -m benchmarks.bench_player_stats --data data/synthetic    # keep the files for later runs
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_player_stats, synthetic_team_stats, write_dataset
+from src.player_stats import (
+    CHUNK_ROWS,
+    KEYS,
+    PLAYER_VARIABLES,
+    qb_features,
+    reduce_chunk,
+    season_features,
+    usage_out,
+)
+
+
+def eager_features(paths):
+    """Load every season whole, then reduce."""
+    stats = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+    qbs, usage = reduce_chunk(stats)
+    features = usage_out(usage).merge(qb_features(qbs), on=KEYS, how='left')
+    return features[KEYS + PLAYER_VARIABLES], len(stats)
+
+
+def chunked_features(paths, chunk_rows):
+    frames, rows = [], 0
+    for path in paths:
+        features, season_rows = season_features(path, chunk_rows)
+        frames.append(features)
+        rows += season_rows
+    return pd.concat(frames, ignore_index=True), rows
+
+
+def memory_kb(field):
+    """``VmRSS`` or ``VmHWM`` (peak RSS) of this process, in kB."""
+    for line in Path('/proc/self/status').read_text().splitlines():
+        if line.startswith(field + ':'):
+            return int(line.split()[1])
+    raise KeyError(field)
+
+
+def measure(paths, chunk_rows=None):
+    """One case in this (fresh) process: ``(features, rows, seconds, rss_mb, arrow_mb)``."""
+    import pyarrow as pa
+
+    # Reset the peak RSS to the current RSS, dropping the peak during imports.
+    Path('/proc/self/clear_refs').write_text('5')
+    before = memory_kb('VmRSS')
+    start = time.perf_counter()
+    if chunk_rows is None:
+        features, rows = eager_features(paths)
+    else:
+        features, rows = chunked_features(paths, chunk_rows)
+    seconds = time.perf_counter() - start
+    rss_mb = (memory_kb('VmHWM') - before) / 1024
+    return features, rows, seconds, rss_mb, pa.default_memory_pool().max_memory() / 2**20
+
+
+def write_player_stats(n_seasons, n_teams, out_dir):
+    team_stats = synthetic_team_stats(n_seasons, n_teams)
+    for season, season_stats in team_stats.groupby('season'):
+        write_dataset(synthetic_player_stats(season_stats, seed=int(season)), 'player_stats', out_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, nargs='+', default=[5, 20],
+                        help="numbers of seasons to ingest (the largest is generated)")
+    parser.add_argument('--teams', type=int, default=64)
+    parser.add_argument('--chunk-rows', type=int, nargs='+', default=[8192, CHUNK_ROWS, 262_144])
+    parser.add_argument('--data', help="directory with player_stats/<season>.parquet (generated if missing)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(args.data or tmp)
+        paths = sorted((data_dir / 'player_stats').glob('*.parquet'))
+        if len(paths) < max(args.seasons):
+            start = time.perf_counter()
+            write_player_stats(max(args.seasons), args.teams, data_dir)
+            paths = sorted((data_dir / 'player_stats').glob('*.parquet'))
+            print(f"Generated {len(paths)} seasons of {args.teams} teams in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'seasons':>7} {'case':>14} {'rows':>11} {'seconds':>8} {'rows/s':>11} "
+              f"{'peak RSS MB':>12} {'Arrow MB':>9}")
+        context = multiprocessing.get_context('spawn')
+        for n_seasons in args.seasons:
+            season_paths = paths[:n_seasons]
+            cases = [('eager', None)] + [(f'chunk {rows:,}', rows) for rows in args.chunk_rows]
+            expected = None
+            for name, chunk_rows in cases:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    features, rows, seconds, rss_mb, arrow_mb = pool.submit(
+                        measure, season_paths, chunk_rows).result()
+                if expected is None:
+                    expected = features
+                pd.testing.assert_frame_equal(features, expected)
+                print(f"{n_seasons:>7} {name:>14} {rows:>11,} {seconds:>8.2f} {rows / seconds:>11,.0f} "
+                      f"{rss_mb:>12.0f} {arrow_mb:>9.0f}")
+    print("Outputs identical across cases")
+
+
+if __name__ == "__main__":
+    main()
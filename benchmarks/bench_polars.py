@@ -0,0 +1,75 @@
+"""Time the lazy Polars feature build against the pandas path at multi-season scale.
+
+Writes a synthetic league (``benchmarks.synthetic``) as Parquet fixtures,
+then builds ``df_clean``, ``games_with_stats`` and ``most_recent_stats``
+from the files both ways:
+
+- pandas: ``load_team_stats``/``load_schedules`` (each season read and
+  converted to pandas), then ``feature_engine``;
+- polars: ``polars_features.build_features``, one lazy query collected at
+  the end.
+
+Both start from the files and end with the tables in memory; the Polars
+tables are then converted with ``.to_pandas()`` and must match the pandas
+ones up to float rounding (``polars_features.compare``).
+
+Run from the repo root:
+
+    python -m benchmarks.bench_polars                           # 5, 20 and 50 seasons of 32 teams
+    python -m benchmarks.bench_polars --seasons 50 --teams 320 --repeat 3
+"""
+import argparse
+import tempfile
+import time
+
+import polars as pl
+
+from benchmarks.synthetic import synthetic_league, write_fixtures
+from src import data_source
+from src.polars_features import build_features, compare, pandas_features
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, nargs='+', default=[5, 20, 50],
+                        help="numbers of seasons to build (the largest is generated)")
+    parser.add_argument('--teams', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    saved = data_source.current_config()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        schedule, team_stats = synthetic_league(max(args.seasons), args.teams)
+        write_fixtures(schedule, team_stats, tmp)
+        print(f"Generated {max(args.seasons)} seasons of {args.teams} teams in {time.perf_counter() - start:.1f}s")
+        data_source.configure(fixtures_dir=tmp, offline=True)
+        last = int(team_stats['season'].max())
+        del schedule, team_stats
+
+        print(f"threads: {pl.thread_pool_size()}")
+        print(f"{'seasons':>7} {'team-weeks':>11} {'pandas s':>9} {'polars s':>9} {'speedup':>8} {'max diff':>9}")
+        try:
+            for n_seasons in args.seasons:
+                seasons = list(range(last - n_seasons + 1, last + 1))
+                pandas_time, expected = best_of(lambda: pandas_features(seasons), args.repeat)
+                polars_time, actual = best_of(lambda: build_features(seasons), args.repeat)
+                difference = max(compare(expected, actual).values())
+                print(f"{n_seasons:>7} {len(expected[0]):>11,} {pandas_time:>9.3f} {polars_time:>9.3f} "
+                      f"{pandas_time / polars_time:>7.1f}x {difference:>9.1e}")
+        finally:
+            data_source.configure(**saved)
+    print("Polars tables match pandas")
+
+
+if __name__ == "__main__":
+    main()
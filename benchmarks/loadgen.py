@@ -0,0 +1,113 @@
+"""Load generator for the prediction service.
+
+Run from the repo root against a running service, or let it start one:
+
+    python -m src.prediction_service --port 8000 &
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --clients 8 --duration 10
+
+    python -m benchmarks.loadgen --spawn --batch 16
+"""
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from src.prediction_service import P50_TARGET_MS, P99_TARGET_MS
+
+
+def _get_json(conn, path):
+    conn.request('GET', path)
+    return json.loads(conn.getresponse().read())
+
+
+def wait_for_service(url, timeout=30):
+    parts = urlparse(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            return _get_json(conn, '/health')['teams']
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def client(url, teams, duration, batch, latencies, seed):
+    parts = urlparse(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port)
+    rng = random.Random(seed)
+    headers = {'Content-Type': 'application/json'}
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        if batch > 1:
+            games = [dict(zip(('home_team', 'away_team'), rng.sample(teams, 2))) for _ in range(batch)]
+            body = json.dumps({'games': games})
+            start = time.perf_counter()
+            conn.request('POST', '/predict/batch', body, headers)
+        else:
+            home, away = rng.sample(teams, 2)
+            start = time.perf_counter()
+            conn.request('GET', f'/predict?home={home}&away={away}')
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"service returned {response.status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against the prediction service.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--batch', type=int, default=1, help="games per request (1 = single-game endpoint)")
+    parser.add_argument('--spawn', action='store_true', help="start the service in a subprocess")
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        port = str(urlparse(args.url).port)
+        service = subprocess.Popen([sys.executable, '-m', 'src.prediction_service', '--port', port])
+
+    try:
+        teams = wait_for_service(args.url)
+        per_client = [[] for _ in range(args.clients)]
+        threads = [
+            threading.Thread(target=client, args=(args.url, teams, args.duration, args.batch, lat, i))
+            for i, lat in enumerate(per_client)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+    latencies = np.concatenate([np.asarray(lat) for lat in per_client]) * 1000
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    requests = len(latencies)
+
+    print(f"clients: {args.clients}  batch: {args.batch}  duration: {elapsed:.1f}s")
+    print(f"requests:   {requests:,}  ({requests / elapsed:,.0f} req/s)")
+    print(f"games:      {requests * args.batch:,}  ({requests * args.batch / elapsed:,.0f} games/s)")
+    print(f"latency ms: p50 {p50:.3f}  p90 {p90:.3f}  p99 {p99:.3f}")
+    if args.batch == 1:
+        ok = p50 <= P50_TARGET_MS and p99 <= P99_TARGET_MS
+        print(f"targets:    p50 <= {P50_TARGET_MS} ms, p99 <= {P99_TARGET_MS} ms -> {'PASS' if ok else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
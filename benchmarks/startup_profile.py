@@ -0,0 +1,234 @@
+"""Cold-start profile of the Streamlit pages and the ``src`` modules.
+
+Each entry point runs ``--runs`` times, each in a fresh interpreter so nothing
+is already imported, and the run with the median import time is reported
+(single cold runs vary by tens of percent on a busy machine):
+
+- pages (``app.py``, ``pages/*.py``): streamlit is imported first, as it is
+  under ``streamlit run``; then each of the page's top-level imports is timed
+  on its own, and the page is rendered once with ``streamlit.testing`` to get
+  time-to-first-render (imports + first script run, cold ``st.cache_data``);
+- modules (``src.*``): ``python -X importtime`` gives the total import time
+  and the heaviest direct dependencies.
+
+Run from the repo root:
+
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --check --json outputs/startup_profile.json
+
+``--check`` exits non-zero when an entry point's median goes over
+``IMPORT_BUDGET_MS``.
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PAGES = [
+    'app.py',
+    'pages/2_explore_stats.py',
+    'pages/3_about.py',
+    'pages/4_playoff_odds.py',
+    'pages/5_matchups.py',
+]
+MODULES = [
+    'src.batch_score',
+    'src.data_source',
+    'src.feature_engine',
+    'src.feature_store',
+    'src.featurizer',
+    'src.instrumentation',
+    'src.live_wp',
+    'src.matchup_matrix',
+    'src.model_bundle',
+    'src.nfl_predictor',
+    'src.pipeline',
+    'src.player_stats',
+    'src.polars_features',
+    'src.prediction_service',
+    'src.refresh',
+    'src.season_performance',
+    'src.season_sim',
+    'src.team_table',
+    'src.weekly_update',
+]
+
+# Import-time budgets in ms, for the median run. Pages are measured on top of
+# an already-imported streamlit; modules from a bare interpreter. Each is at
+# least 1.5x the median measured on one core, to leave room for noisy hosts.
+IMPORT_BUDGET_MS = {
+    'app.py': 1000,
+    'pages/2_explore_stats.py': 1000,
+    'pages/3_about.py': 50,
+    'pages/4_playoff_odds.py': 1100,
+    'pages/5_matchups.py': 1000,
+    'src.data_source': 50,
+    'src.feature_engine': 1000,
+    'src.feature_store': 1000,
+    'src.matchup_matrix': 1200,
+    'src.model_bundle': 300,
+    'src.nfl_predictor': 1000,
+    'src.prediction_service': 1200,
+    'src.season_performance': 1200,
+    'src.season_sim': 1300,
+    'src.weekly_update': 1600,
+}
+
+# Never imported at startup by the entry points in this file.
+DEFERRED = ['matplotlib', 'nflreadpy', 'plotly.express', 'polars', 'sklearn']
+
+
+def _top_level_imports(source):
+    """Source of each module-level import statement, in order."""
+    tree = ast.parse(source)
+    return [
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+
+def profile_page(path):
+    """Time one page's imports and first render in this (fresh) process."""
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+    streamlit_ms = (time.perf_counter() - start) * 1000
+
+    sys.path.insert(0, str(Path.cwd()))
+    namespace = {}
+    imports = []
+    for statement in _top_level_imports(Path(path).read_text()):
+        start = time.perf_counter()
+        exec(statement, namespace)
+        imports.append({'statement': statement, 'ms': (time.perf_counter() - start) * 1000})
+
+    start = time.perf_counter()
+    app = AppTest.from_file(str(Path(path).resolve()), default_timeout=120).run()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    import_ms = sum(i['ms'] for i in imports)
+    return {
+        'entry_point': path,
+        'kind': 'page',
+        'streamlit_ms': streamlit_ms,
+        'import_ms': import_ms,
+        'first_render_ms': import_ms + render_ms,
+        'imports': imports,
+        'deferred_loaded': [m for m in DEFERRED if m in sys.modules],
+        'errors': [e.value for e in app.exception],
+    }
+
+
+def _parse_importtime(stderr):
+    """``(depth, cumulative_us, name)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(cumulative), name.strip()))
+    return rows
+
+
+def profile_module(module, top=5):
+    """Import ``module`` in a child interpreter under ``-X importtime``."""
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules.keys() & {set(DEFERRED)!r})))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True,
+    )
+    rows = _parse_importtime(result.stderr)
+
+    # Output is post-order: a module's direct imports are the depth-1 rows
+    # since the last depth-0 row before it.
+    children, total_us = [], 0
+    for depth, cumulative, name in rows:
+        if depth == 0:
+            if name == module:
+                total_us = cumulative
+                break
+            children = []
+        elif depth == 1:
+            children.append((cumulative, name))
+
+    heaviest = sorted(children, reverse=True)[:top]
+    return {
+        'entry_point': module,
+        'kind': 'module',
+        'import_ms': total_us / 1000,
+        'imports': [{'statement': f'import {name}', 'ms': us / 1000} for us, name in heaviest],
+        'deferred_loaded': json.loads(result.stdout.strip() or '[]'),
+        'errors': [result.stderr.strip().splitlines()[-1]] if result.returncode else [],
+    }
+
+
+def _run_page(path):
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup_profile', '--page', path],
+        capture_output=True, text=True,
+    )
+    if result.returncode:
+        return {'entry_point': path, 'kind': 'page', 'import_ms': float('nan'),
+                'first_render_ms': float('nan'), 'imports': [], 'deferred_loaded': [],
+                'errors': [result.stderr.strip().splitlines()[-1]]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def median_run(profile, entry_point, runs):
+    """The result with the median import time of ``runs`` cold runs."""
+    results = sorted((profile(entry_point) for _ in range(runs)),
+                     key=lambda r: (r['import_ms'] != r['import_ms'], r['import_ms']))
+    result = results[(len(results) - 1) // 2]
+    result['runs_ms'] = [r['import_ms'] for r in results]
+    return result
+
+
+def print_report(results):
+    for r in results:
+        budget = IMPORT_BUDGET_MS.get(r['entry_point'])
+        status = '' if budget is None else ('  OK' if r['import_ms'] <= budget else '  OVER BUDGET')
+        runs = r.get('runs_ms', [r['import_ms']])
+        line = f"{r['entry_point']:<28} import {r['import_ms']:8.1f} ms ({min(runs):.0f}-{max(runs):.0f})"
+        if r['kind'] == 'page':
+            line += f"  first render {r['first_render_ms']:8.1f} ms"
+        print(f"{line}  (budget {budget} ms){status}")
+        for i in sorted(r['imports'], key=lambda i: i['ms'], reverse=True)[:5]:
+            print(f"    {i['ms']:8.1f} ms  {i['statement']}")
+        if r['deferred_loaded']:
+            print(f"    eagerly imports: {', '.join(r['deferred_loaded'])}")
+        for error in r['errors']:
+            print(f"    error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile cold-start import and render times.")
+    parser.add_argument('--json', help="write the full report to this path")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any entry point is over budget")
+    parser.add_argument('--runs', type=int, default=5, help="cold runs per entry point (median reported)")
+    parser.add_argument('--page', help=argparse.SUPPRESS)  # child process mode
+    args = parser.parse_args()
+
+    if args.page:
+        print(json.dumps(profile_page(args.page)))
+        return
+
+    results = ([median_run(_run_page, p, args.runs) for p in PAGES]
+               + [median_run(profile_module, m, args.runs) for m in MODULES])
+    print_report(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + '\n')
+
+    over = [r['entry_point'] for r in results
+            if not r['import_ms'] <= IMPORT_BUDGET_MS.get(r['entry_point'], float('inf'))]
+    if args.check and over:
+        sys.exit(f"over import budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
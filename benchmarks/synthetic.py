@@ -0,0 +1,475 @@
+"""Synthetic league data shaped like ``nflreadpy`` schedules and team stats.
+
+Generates a consistent league at any scale: every team plays one game a week,
+each game has a schedule row and two team-stat rows (``opponent_team`` set
+both ways), and scores, stats and moneylines all follow a hidden per-season
+team strength, so models trained on the output have real signal. Columns and
+dtypes follow ``load_schedules`` and ``load_team_stats`` (weekly level) as
+returned through ``src/data_source.py``. Everything is generated locally.
+
+Today's store holds about 5 seasons of 32 teams; ``--seasons 50 --teams 320``
+is 100x that.
+
+    from benchmarks.synthetic import synthetic_league
+
+    schedule, team_stats = synthetic_league(n_seasons=5, n_teams=32)
+
+``synthetic_lines`` adds many books' line history per game,
+``synthetic_pbp`` simulates a slate of games play by play, for the live
+engine's replay harness (``benchmarks/bench_live.py``), and
+``synthetic_player_stats`` expands team stats into weekly player stats, for
+the chunked player ingestion (``benchmarks/bench_player_stats.py``).
+
+Or write one Parquet file per dataset and season, usable as ``NFL_FIXTURES_DIR``:
+
+    python -m benchmarks.synthetic --seasons 50 --teams 320 --out data/synthetic
+    python -m benchmarks.synthetic --seasons 20 --teams 64 --players --out data/synthetic
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
+    'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+    'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
+]
+LAST_SEASON = 2025
+HOME_EDGE = 2.0
+
+SCHEDULE_COLUMNS = [
+    'game_id', 'season', 'game_type', 'week', 'gameday', 'weekday', 'gametime',
+    'away_team', 'away_score', 'home_team', 'home_score', 'location', 'result',
+    'total', 'overtime', 'old_game_id', 'gsis', 'nfl_detail_id', 'pfr', 'pff',
+    'espn', 'ftn', 'away_rest', 'home_rest', 'away_moneyline', 'home_moneyline',
+    'spread_line', 'away_spread_odds', 'home_spread_odds', 'total_line',
+    'under_odds', 'over_odds', 'div_game', 'roof', 'surface', 'temp', 'wind',
+    'away_qb_id', 'home_qb_id', 'away_qb_name', 'home_qb_name', 'away_coach',
+    'home_coach', 'referee', 'stadium_id', 'stadium',
+]
+
+# Team-stat counts not read by the pipeline, as (column, Poisson mean); they
+# only make frames as wide as the real ones.
+OTHER_COUNTS = [
+    ('sack_yards_lost', 15), ('sack_fumbles', 0.3), ('passing_air_yards', 280),
+    ('passing_yards_after_catch', 110), ('passing_first_downs', 11),
+    ('passing_2pt_conversions', 0.1), ('carries', 27), ('rushing_fumbles', 0.4),
+    ('rushing_first_downs', 6), ('rushing_2pt_conversions', 0.05), ('receptions', 22),
+    ('targets', 33), ('receiving_yards', 230), ('receiving_tds', 1.5),
+    ('receiving_fumbles', 0.2), ('receiving_air_yards', 280),
+    ('receiving_yards_after_catch', 110), ('receiving_first_downs', 11),
+    ('receiving_2pt_conversions', 0.1), ('special_teams_tds', 0.1),
+    ('def_tackles_solo', 40), ('def_tackles_with_assist', 15), ('def_tackle_assists', 20),
+    ('def_tackles_for_loss_yards', 15), ('def_fumbles_forced', 0.8), ('def_sacks', 2.4),
+    ('def_sack_yards', 15), ('def_qb_hits', 5), ('def_interception_yards', 12),
+    ('def_pass_defended', 5), ('def_tds', 0.2), ('def_safeties', 0.03), ('misc_yards', 1),
+    ('fumble_recovery_own', 0.3), ('fumble_recovery_opp', 0.5), ('fumble_recovery_tds', 0.05),
+    ('penalties', 6), ('timeouts', 3), ('punt_returns', 2), ('punt_return_yards', 18),
+    ('kickoff_returns', 2), ('kickoff_return_yards', 45), ('fg_made', 1.7), ('fg_att', 2),
+    ('fg_blocked', 0.03), ('fg_long', 45), ('pat_made', 2.4), ('pat_att', 2.5),
+    ('pat_blocked', 0.02),
+]
+
+# Each team-season's roster as (position, players); about 50 players a week
+# have a row, like ``load_player_stats`` at the weekly level.
+ROSTER = [
+    ('QB', 3), ('RB', 4), ('WR', 6), ('TE', 3), ('OL', 9), ('DL', 8),
+    ('LB', 7), ('CB', 6), ('S', 4), ('K', 1), ('P', 1),
+]
+# Weekly mean carries and targets by depth chart slot.
+CARRIES = {'QB': [3, 0.3, 0.1], 'RB': [13, 6, 2, 1], 'WR': [0.2] * 6}
+TARGETS = {'RB': [3, 2, 1, 0.5], 'WR': [8, 6, 4, 2, 1, 1], 'TE': [5, 2, 1]}
+
+# Player-stat columns not read by the pipeline, as (column, Poisson mean).
+PLAYER_OTHER_COUNTS = [
+    ('sack_fumbles', 0.02), ('sack_fumbles_lost', 0.01), ('passing_air_yards', 20),
+    ('passing_yards_after_catch', 8), ('passing_first_downs', 1), ('passing_2pt_conversions', 0.01),
+    ('rushing_tds', 0.05), ('rushing_fumbles', 0.02), ('rushing_fumbles_lost', 0.01),
+    ('rushing_first_downs', 0.5), ('rushing_2pt_conversions', 0.01), ('receiving_tds', 0.1),
+    ('receiving_fumbles', 0.01), ('receiving_fumbles_lost', 0.01), ('receiving_air_yards', 20),
+    ('receiving_yards_after_catch', 8), ('receiving_first_downs', 1), ('special_teams_tds', 0.01),
+    ('def_tackles_solo', 1.5), ('def_tackle_assists', 1), ('def_tackles_for_loss', 0.2),
+    ('def_fumbles_forced', 0.03), ('def_sacks', 0.1), ('def_qb_hits', 0.2),
+    ('def_interceptions', 0.03), ('def_pass_defended', 0.2), ('def_tds', 0.01),
+    ('fg_made', 0.1), ('fg_att', 0.1), ('pat_made', 0.1), ('pat_att', 0.1),
+]
+
+
+def team_codes(n_teams):
+    """The real team codes, extended with ``T033``, ``T034``... past 32."""
+    return TEAMS[:n_teams] + [f'T{i:03d}' for i in range(len(TEAMS) + 1, n_teams + 1)]
+
+
+def _moneyline(prob):
+    """American odds for a win probability, with a ~4.5% total overround."""
+    prob = np.clip(prob * 1.0225, 0.02, 0.98)
+    return np.where(prob >= 0.5, -100 * prob / (1 - prob), 100 * (1 - prob) / prob).round()
+
+
+def synthetic_league(n_seasons=5, n_teams=32, weeks=18, seed=0):
+    """``(schedule, team_stats)`` for ``n_seasons`` seasons ending in 2025."""
+    if n_teams % 2:
+        raise ValueError("n_teams must be even so every team plays each week")
+    rng = np.random.default_rng(seed)
+    teams = np.array(team_codes(n_teams))
+    seasons = np.arange(LAST_SEASON - n_seasons + 1, LAST_SEASON + 1)
+    n_slates = n_seasons * weeks
+    n_games = n_slates * n_teams // 2
+
+    # One random pairing of all teams per (season, week).
+    order = rng.permuted(np.tile(np.arange(n_teams), (n_slates, 1)), axis=1)
+    away_idx = order[:, 0::2].ravel()
+    home_idx = order[:, 1::2].ravel()
+    season = np.repeat(seasons, weeks * n_teams // 2)
+    week = np.tile(np.repeat(np.arange(1, weeks + 1), n_teams // 2), n_seasons)
+
+    strength = rng.normal(0, 4, (n_seasons, n_teams))
+    season_idx = season - seasons[0]
+    home_strength = strength[season_idx, home_idx]
+    away_strength = strength[season_idx, away_idx]
+    expected_margin = home_strength - away_strength + HOME_EDGE
+
+    margin = np.round(expected_margin + rng.normal(0, 13, n_games))
+    total = np.clip(np.round(rng.normal(44, 10, n_games)), np.abs(margin), None)
+    home_score = ((total + margin) // 2).astype(np.int64)
+    away_score = (total - home_score).astype(np.int64)
+    home_prob = 1 / (1 + np.exp(-expected_margin / 6.5))
+
+    dates = pd.to_datetime([f'{s}-09-07' for s in season]) + pd.to_timedelta((week - 1) * 7, unit='D')
+    home, away = teams[home_idx], teams[away_idx]
+    game_id = pd.Series(season.astype(str)) + '_' + pd.Series(week).map('{:02d}'.format) + \
+        '_' + away + '_' + home
+
+    schedule = pd.DataFrame({
+        'game_id': game_id,
+        'season': season,
+        'game_type': 'REG',
+        'week': week,
+        'gameday': dates.strftime('%Y-%m-%d'),
+        'weekday': 'Sunday',
+        'gametime': rng.choice(['13:00', '16:25', '20:20'], n_games),
+        'away_team': away,
+        'away_score': away_score,
+        'home_team': home,
+        'home_score': home_score,
+        'location': 'Home',
+        'result': home_score - away_score,
+        'total': home_score + away_score,
+        'overtime': (rng.random(n_games) < 0.05).astype(np.int64),
+        'old_game_id': None,
+        'gsis': None,
+        'nfl_detail_id': None,
+        'pfr': None,
+        'pff': None,
+        'espn': None,
+        'ftn': None,
+        'away_rest': 7,
+        'home_rest': 7,
+        'away_moneyline': _moneyline(1 - home_prob),
+        'home_moneyline': _moneyline(home_prob),
+        'spread_line': np.round(expected_margin * 2) / 2,
+        'away_spread_odds': -110.,
+        'home_spread_odds': -110.,
+        'total_line': np.round(rng.normal(44, 3, n_games) * 2) / 2,
+        'under_odds': -110.,
+        'over_odds': -110.,
+        'div_game': (rng.random(n_games) < 0.35).astype(np.int64),
+        'roof': rng.choice(['outdoors', 'dome', 'closed', 'open'], n_games, p=[0.6, 0.2, 0.15, 0.05]),
+        'surface': rng.choice(['grass', 'fieldturf'], n_games),
+        'temp': np.where(rng.random(n_games) < 0.3, np.nan, rng.integers(20, 95, n_games)),
+        'wind': np.where(rng.random(n_games) < 0.3, np.nan, rng.integers(0, 25, n_games)),
+        'away_qb_id': None,
+        'home_qb_id': None,
+        'away_qb_name': None,
+        'home_qb_name': None,
+        'away_coach': None,
+        'home_coach': None,
+        'referee': None,
+        'stadium_id': None,
+        'stadium': None,
+    })[SCHEDULE_COLUMNS]
+
+    # Two team-stat rows per game: all home sides, then all away sides.
+    team_idx = np.concatenate([home_idx, away_idx])
+    opponent_idx = np.concatenate([away_idx, home_idx])
+    edge = np.concatenate([expected_margin, -expected_margin]) / 4
+    n = len(team_idx)
+
+    attempts = rng.integers(25, 50, n)
+    interceptions = rng.poisson(np.clip(0.8 - edge / 10, 0.1, None))
+    fumbles_lost = rng.poisson(0.1, (3, n))
+    fg_att = rng.poisson(2, n)
+    pat_att = rng.poisson(2.5, n)
+
+    team_stats = pd.DataFrame({
+        'season': np.tile(season, 2),
+        'week': np.tile(week, 2),
+        'team': teams[team_idx],
+        'season_type': 'REG',
+        'opponent_team': teams[opponent_idx],
+        'completions': rng.binomial(attempts, np.clip(0.64 + edge / 50, 0.4, 0.85)),
+        'attempts': attempts,
+        'passing_yards': np.round(rng.normal(225 + 6 * edge, 60, n)),
+        'passing_tds': rng.poisson(np.clip(1.5 + edge / 8, 0.2, None)),
+        'passing_interceptions': interceptions,
+        'sacks_suffered': rng.poisson(np.clip(2.4 - edge / 6, 0.3, None)),
+        'sack_fumbles_lost': fumbles_lost[0],
+        'passing_epa': rng.normal(edge, 8, n),
+        'passing_cpoe': rng.normal(0, 8, n),
+        'rushing_yards': np.round(rng.normal(115 + 4 * edge, 40, n)),
+        'rushing_tds': rng.poisson(np.clip(0.9 + edge / 10, 0.1, None)),
+        'rushing_fumbles_lost': fumbles_lost[1],
+        'rushing_epa': rng.normal(edge / 2, 6, n),
+        'receiving_fumbles_lost': fumbles_lost[2],
+        'receiving_epa': rng.normal(edge, 8, n),
+        'def_tackles_for_loss': rng.poisson(np.clip(5 + edge / 4, 1, None)),
+        'def_interceptions': rng.poisson(np.clip(0.8 + edge / 10, 0.1, None)),
+        'def_fumbles': rng.poisson(0.4, n),
+        'penalty_yards': np.round(rng.normal(50, 20, n)),
+        'fg_pct': rng.uniform(0.5, 1.0, n),
+        'pat_pct': rng.uniform(0.8, 1.0, n),
+    })
+    for column, mean in OTHER_COUNTS:
+        team_stats[column] = rng.poisson(mean, n)
+    # Kickers without an attempt have no percentage, as in nflverse data.
+    team_stats.loc[fg_att == 0, 'fg_pct'] = np.nan
+    team_stats.loc[pat_att == 0, 'pat_pct'] = np.nan
+
+    team_stats = team_stats.sort_values(['season', 'week', 'team'], kind='stable').reset_index(drop=True)
+    return schedule, team_stats
+
+
+def synthetic_team_stats(n_seasons=5, n_teams=32, weeks=18, seed=0):
+    """Just the team-stats frame of ``synthetic_league``."""
+    return synthetic_league(n_seasons, n_teams, weeks, seed)[1]
+
+
+def synthetic_pbp(n_games=16, seed=0, season=LAST_SEASON, week=1):
+    """``(pbp, priors)`` for a slate of ``n_games`` simulated games.
+
+    ``pbp`` has the ``src.live_wp.PBP_COLUMNS`` of nflverse play-by-play:
+    down, distance, field position and possession before each snap, scores
+    after it, and a final ``END GAME`` row. Drives are a random walk of
+    gains tilted by a hidden home edge; ``priors`` holds each game's pregame
+    home win probability (``game_id``, ``win_prob``) from that edge.
+    """
+    rng = np.random.default_rng(seed)
+    teams = team_codes(max(2 * n_games, 2))
+    rows, priors = [], []
+    for g in range(n_games):
+        home, away = teams[2 * g + 1], teams[2 * g]
+        game_id = f'{season}_{week:02d}_{away}_{home}'
+        edge = rng.normal(0, 0.6)
+        priors.append((game_id, 1 / (1 + np.exp(-(edge * 6 + HOME_EDGE) / 6.5))))
+
+        score = {home: 0, away: 0}
+        posteam, defteam = away, home
+        yardline, down, togo = 75, 1, 10
+        elapsed, play_id = 0, 1
+        while elapsed < 3600:
+            gain = int(round(rng.normal(4.5 + (edge if posteam == home else -edge), 7)))
+            qtr = min(elapsed // 900 + 1, 4)
+            row = [game_id, play_id, home, away, posteam, qtr, qtr * 900 - elapsed, 3600 - elapsed,
+                   yardline, down, togo]
+            elapsed += int(rng.integers(5, 45))
+            change = False
+            if gain >= yardline:
+                score[posteam] += 7
+                change, desc, next_yardline = True, 'touchdown', 75
+            elif down == 4:
+                if yardline <= 35 and rng.random() < 0.85:
+                    score[posteam] += 3
+                    change, desc, next_yardline = True, 'field goal', 75
+                else:
+                    change, desc = True, 'punt'
+                    next_yardline = int(np.clip(100 - (yardline - 42), 1, 99))
+            else:
+                desc = 'run' if gain % 2 else 'pass'
+                yardline -= gain
+                yardline = min(yardline, 99)
+                togo -= gain
+                down, togo = (1, min(10, yardline)) if togo <= 0 else (down + 1, togo)
+            if change:
+                posteam, defteam = defteam, posteam
+                yardline, down, togo = next_yardline, 1, 10
+            rows.append(row + [score[home], score[away], desc])
+            play_id += 1
+        rows.append([game_id, play_id, home, away, None, 4, 0, 0, None, None, None,
+                     score[home], score[away], 'END GAME'])
+
+    pbp = pd.DataFrame(rows, columns=[
+        'game_id', 'play_id', 'home_team', 'away_team', 'posteam', 'qtr',
+        'quarter_seconds_remaining', 'game_seconds_remaining', 'yardline_100',
+        'down', 'ydstogo', 'total_home_score', 'total_away_score', 'desc',
+    ])
+    return pbp, pd.DataFrame(priors, columns=['game_id', 'win_prob'])
+
+
+def synthetic_lines(schedule, n_books=8, n_snapshots=12, seed=0):
+    """Line history for ``schedule``: one row per game, book and snapshot.
+
+    Each book moves its moneyline, spread and total in a random walk around
+    the schedule's closing lines, with its own vig (``-105`` to ``-115``
+    on spreads and totals).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(schedule) * n_books * n_snapshots
+    reps = n_books * n_snapshots
+    games = schedule.loc[schedule.index.repeat(reps)].reset_index(drop=True)
+    drift = rng.normal(0, 0.4, (len(schedule), n_books, n_snapshots)).cumsum(axis=2)[:, :, ::-1].ravel()
+    vig = np.repeat(rng.uniform(1.01, 1.03, len(schedule) * n_books), n_snapshots)
+
+    home_prob = 1 / (1 + np.exp(-(games['spread_line'].to_numpy() + drift) / 6.5))
+    juice = np.round(-100 * 1.1 * vig / 1.0225).clip(-115, -105)
+    return pd.DataFrame({
+        'game_id': games['game_id'],
+        'book': np.tile(np.repeat([f'book{b}' for b in range(n_books)], n_snapshots), len(schedule)),
+        'snapshot': np.tile(np.arange(n_snapshots), len(schedule) * n_books),
+        'home_moneyline': _moneyline(home_prob * vig / 1.0225),
+        'away_moneyline': _moneyline((1 - home_prob) * vig / 1.0225),
+        'spread_line': np.round((games['spread_line'].to_numpy() + drift) * 2) / 2,
+        'home_spread_odds': juice,
+        'away_spread_odds': juice,
+        'total_line': np.round((games['total_line'].to_numpy() + rng.normal(0, 0.5, n)) * 2) / 2,
+        'over_odds': juice,
+        'under_odds': juice,
+    })
+
+
+def synthetic_player_stats(team_stats, seed=0, injury_rate=0.04):
+    """Weekly player stats for every team-week row of ``team_stats``.
+
+    Each team-season has a fixed ``ROSTER``. Players miss spells of weeks
+    (a new spell starts with probability ``injury_rate`` a week and lasts
+    2.5 weeks on average); absent players have no row, and the first
+    healthy QB on the depth chart starts. Columns follow nflverse's
+    ``stats_player_week`` files.
+    """
+    rng = np.random.default_rng(seed)
+    games = team_stats[['season', 'week', 'team', 'opponent_team']]
+    games = games.sort_values(['season', 'team', 'week'], kind='stable').reset_index(drop=True)
+    grouped = games.groupby(['season', 'team'], sort=False)
+    group, game = grouped.ngroup().to_numpy(), grouped.cumcount().to_numpy()
+
+    positions = np.repeat([p for p, _ in ROSTER], [n for _, n in ROSTER])
+    depth = np.concatenate([np.arange(n) for _, n in ROSTER])
+    n_roster, n_games = len(positions), game.max() + 1
+
+    # Injury spells: a Markov chain per player over the team's games.
+    out = np.zeros((grouped.ngroups, n_roster, n_games), dtype=bool)
+    for g in range(n_games):
+        started = rng.random(out.shape[:2]) < injury_rate
+        out[:, :, g] = started | (out[:, :, g - 1] & (rng.random(out.shape[:2]) < 0.6) if g else started)
+
+    playing = ~out[group, :, game]
+    qb = positions == 'QB'
+    # The first healthy QB starts; the backup-of-last-resort plays if all are out.
+    starter_slot = np.where(playing[:, qb].any(axis=1), playing[:, qb].argmax(axis=1), qb.sum() - 1)
+    starter = np.zeros_like(playing)
+    starter[np.arange(len(games)), starter_slot] = True
+    playing |= starter
+
+    row, slot = np.nonzero(playing)
+    n = len(row)
+    pos, rank, is_starter = positions[slot], depth[slot], starter[row, slot]
+    skill = rng.normal(0, 0.05, (grouped.ngroups, n_roster))[group[row], slot]
+
+    def by_slot(means):
+        rate = np.zeros(n)
+        for position, slot_means in means.items():
+            mask = pos == position
+            rate[mask] = np.asarray(slot_means)[rank[mask]]
+        return rate
+
+    attempts = rng.poisson(np.where(is_starter, 33, np.where(pos == 'QB', 0.5, 0)))
+    sacks = rng.poisson(np.where(is_starter, 2.3, 0))
+    carries = rng.poisson(np.where((pos == 'QB') & ~is_starter, 0.1, by_slot(CARRIES)))
+    targets = rng.poisson(by_slot(TARGETS))
+    completions = rng.binomial(attempts, np.clip(0.64 + skill, 0.3, 0.9))
+    receptions = rng.binomial(targets, 0.65)
+    passed = attempts > 0
+
+    season, team = games['season'].to_numpy()[row], games['team'].to_numpy()[row]
+    team_idx = pd.factorize(games['team'])[0][row]
+    player_id = pd.Series((season * 10_000 + team_idx) * 100 + slot).astype(str).radd('00-').to_numpy()
+    names = pd.Series(pos).str.cat(pd.Series(rank + 1).astype(str), sep='').to_numpy()
+
+    stats = pd.DataFrame({
+        'player_id': player_id,
+        'player_name': team + ' ' + names,
+        'player_display_name': team + ' ' + names,
+        'position': pos,
+        'position_group': pos,
+        'headshot_url': '',
+        'season': season,
+        'week': games['week'].to_numpy()[row],
+        'season_type': np.where(games['week'].to_numpy()[row] <= 18, 'REG', 'POST'),
+        'team': team,
+        'opponent_team': games['opponent_team'].to_numpy()[row],
+        'completions': completions,
+        'attempts': attempts,
+        'passing_yards': np.round(completions * rng.normal(11, 1.5, n)),
+        'passing_tds': rng.poisson(attempts * 0.045),
+        'passing_interceptions': rng.poisson(attempts * np.clip(0.025 - skill / 4, 0.005, None)),
+        'sacks_suffered': sacks,
+        'sack_yards_lost': np.round(sacks * rng.normal(7, 2, n)).clip(0),
+        'passing_epa': np.where(passed, rng.normal(attempts * skill * 4, 6), np.nan),
+        'passing_cpoe': np.where(passed, rng.normal(skill * 100, 8), np.nan),
+        'carries': carries,
+        'rushing_yards': np.round(carries * rng.normal(4.3, 1.5, n)),
+        'rushing_epa': np.where(carries > 0, rng.normal(0, 2, n), np.nan),
+        'receptions': receptions,
+        'targets': targets,
+        'receiving_yards': np.round(receptions * rng.normal(11, 3, n)),
+        'receiving_epa': np.where(targets > 0, rng.normal(0, 2, n), np.nan),
+    })
+    for column, mean in PLAYER_OTHER_COUNTS:
+        stats[column] = rng.poisson(mean, n)
+    stats['fantasy_points'] = (stats['passing_yards'] / 25 + stats['rushing_yards'] / 10
+                               + stats['receiving_yards'] / 10 + 4 * stats['passing_tds'])
+    stats['fantasy_points_ppr'] = stats['fantasy_points'] + stats['receptions']
+    return stats.sort_values(['season', 'week', 'team', 'player_id'], kind='stable').reset_index(drop=True)
+
+
+def write_dataset(frame, dataset, out_dir):
+    """``<out_dir>/<dataset>/<season>.parquet`` for each season of ``frame``."""
+    dataset_dir = Path(out_dir) / dataset
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    for season, rows in frame.groupby('season'):
+        rows.to_parquet(dataset_dir / f'{season}.parquet', index=False)
+
+
+def write_fixtures(schedule, team_stats, out_dir):
+    """One Parquet file per dataset and season, as ``data_source`` fixtures."""
+    for dataset, frame in (('schedules', schedule), ('team_stats', team_stats)):
+        write_dataset(frame, dataset, out_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic schedules and team stats.")
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--teams', type=int, default=32)
+    parser.add_argument('--weeks', type=int, default=18)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--players', action='store_true', help="also write weekly player stats")
+    parser.add_argument('--out', required=True, help="directory for <dataset>/<season>.parquet files")
+    args = parser.parse_args()
+
+    schedule, team_stats = synthetic_league(args.seasons, args.teams, args.weeks, args.seed)
+    write_fixtures(schedule, team_stats, args.out)
+    print(f"Wrote {len(schedule):,} games and {len(team_stats):,} team-weeks to {args.out}")
+    if args.players:
+        rows = 0
+        # A season at a time, so memory stays flat at any number of seasons.
+        for season, season_stats in team_stats.groupby('season'):
+            player_stats = synthetic_player_stats(season_stats, seed=args.seed + season)
+            write_dataset(player_stats, 'player_stats', args.out)
+            rows += len(player_stats)
+        print(f"Wrote {rows:,} player-weeks to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
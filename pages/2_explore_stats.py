@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from pathlib import Path
 
+from src.feature_store import last_modified, load_table
+from src.team_table import TeamStatsTable
+
 # Page configuration
 st.set_page_config(
     page_title="Team Stats Explorer",
@@ -18,10 +20,16 @@ st.set_page_config(
 )
 
 # Load data
-@st.cache_data
-def load_team_stats():
-    """Load processed team statistics."""
-    return pd.read_csv('data/df_clean.csv')
+@st.cache_resource(max_entries=1)
+def load_team_table(version):
+    """Indexed team statistics shared by all sessions; ``version`` (the store's
+    mtime) makes a refresh rebuild the table."""
+    return TeamStatsTable(load_table('df_clean'))
+
+SUMMARY_LABELS = ['Season Average', 'Maximum', 'Minimum', 'Std Deviation', 'Current (Latest Week)']
+
+def format_summary(summary):
+    return [f"{value:.2f}" for value in summary.values()]
 
 # Title
 st.title("Team Statistics Explorer")
@@ -29,34 +37,30 @@ st.markdown("Explore individual team performance trends throughout the season us
 
 # Load data
 try:
-    df = load_team_stats()
-    
     # Sidebar controls
     st.sidebar.header("Filters")
     
+    table = load_team_table(last_modified('df_clean'))
+
     # Season selection
-    available_seasons = sorted(df['season'].unique(), reverse=True)
+    available_seasons = sorted(table.seasons(), reverse=True)
+    if not available_seasons:
+        raise FileNotFoundError('data/store/df_clean')
     selected_season = st.sidebar.selectbox(
         "Select Season",
         available_seasons,
         index=0  # Default to most recent
     )
     
-    # Filter data by season
-    season_df = df[df['season'] == selected_season]
-    
     # Team selection
-    available_teams = sorted(season_df['team'].unique())
+    available_teams = table.teams_in(selected_season)
     selected_team = st.sidebar.selectbox(
         "Select Team",
         available_teams
     )
     
-    # Get team data
-    team_df = season_df[season_df['team'] == selected_team].sort_values('week')
-    
     # Statistic selection
-    stat_columns = [col for col in df.columns if col.endswith('_ewma')]
+    stat_columns = table.stat_columns
     stat_names = [col.replace('_ewma', '').replace('_', ' ').title() for col in stat_columns]
     
     stat_display_to_col = dict(zip(stat_names, stat_columns))
@@ -67,6 +71,7 @@ try:
     )
     
     selected_stat = stat_display_to_col[selected_stat_display]
+    team_df = table.team_frame(selected_season, selected_team, selected_stat)
     
     # Comparison team (optional)
     st.sidebar.markdown("---")
@@ -80,7 +85,7 @@ try:
             "Compare with",
             other_teams
         )
-        comparison_df = season_df[season_df['team'] == comparison_team].sort_values('week')
+        comparison_df = table.team_frame(selected_season, comparison_team, selected_stat)
     
     # Main content
     st.markdown("---")
@@ -93,11 +98,11 @@ try:
     with col2:
         st.metric("Season", selected_season)
     with col3:
-        current_value = team_df[selected_stat].iloc[-1] if len(team_df) > 0 else 0
+        current_value = float(team_df[selected_stat].iloc[-1]) if len(team_df) > 0 else 0
         st.metric("Current Value", f"{current_value:.2f}")
     with col4:
         if len(team_df) > 1:
-            prev_value = team_df[selected_stat].iloc[-2]
+            prev_value = float(team_df[selected_stat].iloc[-2])
             delta = current_value - prev_value
             st.metric("Change", f"{delta:+.2f}", delta=f"{delta:+.2f}")
         else:
@@ -171,37 +176,21 @@ try:
     
     with col1:
         st.markdown("### Statistics")
+        team_summary = table.summary(selected_season, selected_team, selected_stat)
         summary_stats = pd.DataFrame({
-            'Metric': ['Season Average', 'Maximum', 'Minimum', 'Std Deviation', 'Current (Latest Week)'],
-            'Value': [
-                f"{team_df[selected_stat].mean():.2f}",
-                f"{team_df[selected_stat].max():.2f}",
-                f"{team_df[selected_stat].min():.2f}",
-                f"{team_df[selected_stat].std():.2f}",
-                f"{team_df[selected_stat].iloc[-1]:.2f}" if len(team_df) > 0 else "N/A"
-            ]
+            'Metric': SUMMARY_LABELS,
+            'Value': format_summary(team_summary)
         })
         st.dataframe(summary_stats, width='content', hide_index=True)
     
     with col2:
         if compare_enabled and comparison_team:
             st.markdown("### Comparison")
+            comparison_summary = table.summary(selected_season, comparison_team, selected_stat)
             comparison_stats = pd.DataFrame({
-                'Metric': ['Season Average', 'Maximum', 'Minimum', 'Std Deviation', 'Current (Latest Week)'],
-                selected_team: [
-                    f"{team_df[selected_stat].mean():.2f}",
-                    f"{team_df[selected_stat].max():.2f}",
-                    f"{team_df[selected_stat].min():.2f}",
-                    f"{team_df[selected_stat].std():.2f}",
-                    f"{team_df[selected_stat].iloc[-1]:.2f}" if len(team_df) > 0 else "N/A"
-                ],
-                comparison_team: [
-                    f"{comparison_df[selected_stat].mean():.2f}",
-                    f"{comparison_df[selected_stat].max():.2f}",
-                    f"{comparison_df[selected_stat].min():.2f}",
-                    f"{comparison_df[selected_stat].std():.2f}",
-                    f"{comparison_df[selected_stat].iloc[-1]:.2f}" if len(comparison_df) > 0 else "N/A"
-                ]
+                'Metric': SUMMARY_LABELS,
+                selected_team: format_summary(team_summary),
+                comparison_team: format_summary(comparison_summary)
             })
             st.dataframe(comparison_stats, width='content', hide_index=True)
     
@@ -212,7 +201,7 @@ try:
     # Prepare display dataframe
     display_df = team_df[['week', 'opponent_team', selected_stat]].copy()
     display_df.columns = ['Week', 'Opponent', selected_stat_display]
-    display_df[selected_stat_display] = display_df[selected_stat_display].round(2)
+    display_df[selected_stat_display] = display_df[selected_stat_display].astype(float).round(2)
     
     st.dataframe(
         display_df.sort_values('Week', ascending=False),
@@ -230,8 +219,8 @@ try:
     )
     
 except FileNotFoundError:
-    st.error("❌ Data file not found. Please make sure 'data/df_clean.csv' exists.")
-    st.info("Run your data processing script first to generate the required data files.")
+    st.error("❌ Data file not found. Please make sure 'data/store/df_clean' exists.")
+    st.info("Run `python -m src.feature_store` to build it from 'data/df_clean.csv'.")
 except Exception as e:
     st.error(f"❌ An error occurred: {e}")
     with st.expander("See full error details"):
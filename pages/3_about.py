@@ -1,8 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from pathlib import Path
 
 st.set_page_config(
     page_title="About",
@@ -0,0 +1,74 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from src.season_sim import PLAYOFF_TEAMS, RESULTS_PATH, load_odds
+
+st.set_page_config(
+    page_title="Playoff Odds",
+    page_icon=":material/emoji_events:",
+    layout="wide"
+)
+
+@st.cache_data
+def load_season_odds(mtime):
+    """Cached simulation result; ``mtime`` makes a re-run invalidate the cache."""
+    return load_odds(RESULTS_PATH)
+
+st.title("Playoff Odds")
+st.markdown("Division, playoff and seed probabilities from simulating the rest of the season with the model's win probabilities")
+
+if not RESULTS_PATH.exists():
+    st.info(f"No simulation results yet. Run `python -m src.season_sim` to create {RESULTS_PATH}.")
+    st.stop()
+
+odds, meta = load_season_odds(RESULTS_PATH.stat().st_mtime)
+
+as_of = f"after week {meta['as_of_week']}" if meta.get("as_of_week") else "with all completed games"
+st.caption(
+    f"{meta['season']} season {as_of} · {meta['simulations']:,} simulations of "
+    f"{meta['remaining_games']} remaining games · model {meta['model_hash'][:12]} · {meta['created_at']}"
+)
+st.markdown("---")
+
+seed_cols = [f"seed_{k}" for k in range(1, PLAYOFF_TEAMS + 1)]
+
+for conference, conf_odds in odds.groupby("conference"):
+    st.subheader(conference)
+    conf_odds = conf_odds.sort_values(["playoff_prob", "mean_wins"], ascending=False)
+
+    col_table, col_chart = st.columns([3, 2])
+
+    with col_table:
+        st.dataframe(
+            conf_odds[["team", "division", "current_wins", "mean_wins",
+                       "division_prob", "playoff_prob", "seed_1"]],
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "team":          st.column_config.TextColumn("Team"),
+                "division":      st.column_config.TextColumn("Division"),
+                "current_wins":  st.column_config.NumberColumn("Wins", format="%.1f"),
+                "mean_wins":     st.column_config.NumberColumn("Proj. Wins", format="%.1f"),
+                "division_prob": st.column_config.ProgressColumn("Win Division", format="%.0f%%", min_value=0, max_value=1),
+                "playoff_prob":  st.column_config.ProgressColumn("Make Playoffs", format="%.0f%%", min_value=0, max_value=1),
+                "seed_1":        st.column_config.ProgressColumn("#1 Seed", format="%.0f%%", min_value=0, max_value=1),
+            },
+        )
+
+    with col_chart:
+        contenders = conf_odds[conf_odds["playoff_prob"] > 0].iloc[::-1]
+        fig = go.Figure([
+            go.Bar(name=f"Seed {k}", y=contenders["team"], x=contenders[f"seed_{k}"], orientation="h")
+            for k in range(1, PLAYOFF_TEAMS + 1)
+        ])
+        fig.update_layout(
+            barmode="stack",
+            title="Seed distribution",
+            xaxis=dict(title="Probability", tickformat=".0%", range=[0, 1]),
+            height=max(300, 28 * len(contenders)),
+            margin=dict(l=10, r=10, t=40, b=10),
+            legend=dict(orientation="h", y=-0.15),
+        )
+        st.plotly_chart(fig, width="stretch")
+
+    st.markdown("---")
@@ -0,0 +1,67 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from src.matchup_matrix import MATRIX_PATH, load_matrix
+
+st.set_page_config(
+    page_title="Matchups",
+    page_icon=":material/sports_football:",
+    layout="wide"
+)
+
+@st.cache_data
+def load_matchups(mtime):
+    """Precomputed 32x32 probabilities; ``mtime`` makes a refresh invalidate the cache."""
+    return load_matrix(MATRIX_PATH)
+
+st.title("Pick Any Two Teams")
+st.markdown("Model win probability for any hypothetical matchup, from the latest team stats")
+
+if not MATRIX_PATH.exists():
+    st.info(f"No matchup matrix yet. Run `python -m src.matchup_matrix` to create {MATRIX_PATH}.")
+    st.stop()
+
+matrix = load_matchups(MATRIX_PATH.stat().st_mtime)
+st.caption(
+    f"Team stats through {matrix.metadata['season']} week {matrix.metadata['week']} · "
+    f"model {matrix.metadata['model_hash'][:12]}"
+)
+st.markdown("---")
+
+col_away, col_at, col_home = st.columns([5, 1, 5])
+with col_away:
+    away_team = st.selectbox("Away team", matrix.teams, index=0)
+with col_at:
+    st.markdown("<h3 style='text-align: center'>@</h3>", unsafe_allow_html=True)
+with col_home:
+    home_options = [t for t in matrix.teams if t != away_team]
+    home_team = st.selectbox("Home team", home_options, index=0)
+
+home_prob = matrix.predict(home_team, away_team)
+neutral = (home_prob + 1 - matrix.predict(away_team, home_team)) / 2
+
+c1, c2, c3 = st.columns(3)
+c1.metric(f"{home_team} win (at home)", f"{home_prob:.1%}")
+c2.metric(f"{away_team} win (on the road)", f"{1 - home_prob:.1%}")
+c3.metric(f"{home_team} win (neutral site)", f"{neutral:.1%}",
+          help="Average of the two home/away orderings")
+
+st.markdown("---")
+st.subheader("All Matchups")
+st.markdown("Probability that the row team beats the column team at home")
+
+fig = go.Figure(go.Heatmap(
+    z=matrix.probs,
+    x=matrix.teams,
+    y=matrix.teams,
+    zmin=0,
+    zmax=1,
+    colorscale="RdBu",
+    hovertemplate="%{y} vs %{x}: %{z:.1%}<extra></extra>",
+))
+fig.update_layout(
+    height=800,
+    xaxis=dict(title="Away team", side="top"),
+    yaxis=dict(title="Home team", autorange="reversed"),
+)
+st.plotly_chart(fig, width="stretch")
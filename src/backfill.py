@@ -0,0 +1,164 @@
+"""Parallel, resumable backfill of the feature tables for historical seasons.
+
+EWMA features reset every season, so each season can be fetched and built on
+its own. ``backfill`` runs one task per season in a process pool; each task
+loads that season through ``data_source`` (cache first), builds ``df_clean``
+and ``games_with_stats`` and writes them to ``data/backfill/season=<year>/``.
+A season directory only appears once its outputs are complete (it is written
+under a temporary name and renamed), so after a crash a re-run skips finished
+seasons. The per-season outputs are then merged into the Parquet feature
+store, replacing those season partitions.
+
+Run from the repo root:
+
+    python -m src.backfill                        # 1999 through the current season
+    python -m src.backfill --start 2010 --end 2020 --workers 8
+    python -m src.backfill --force                # rebuild finished seasons too
+
+The current season is always rebuilt, since it is still being played. The
+CSVs and ``data/ewma_state.pkl`` are not touched, so a later
+``weekly_update --rebuild`` rewrites the store with only its own seasons.
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from src import data_source
+from src.feature_engine import (
+    EWMA_ALPHA,
+    INDEPENDENT_VARIABLES,
+    add_derived_features,
+    build_games_with_stats,
+    build_team_features,
+    completed_games,
+)
+from src.feature_store import STORE_DIR, upsert_rows, write_table
+
+FIRST_SEASON = 1999
+WORK_DIR = Path('data/backfill')
+OUTPUT_TABLES = ('df_clean', 'games_with_stats')
+TIMINGS_FILE = 'timings.json'
+
+
+def season_dir(season, work_dir=WORK_DIR):
+    return Path(work_dir) / f'season={season}'
+
+
+def is_complete(season, work_dir=WORK_DIR):
+    return (season_dir(season, work_dir) / TIMINGS_FILE).exists()
+
+
+def build_season(season, work_dir=WORK_DIR, variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """Fetch and build one season's feature tables; returns its timings."""
+    start = time.perf_counter()
+    team_stats = data_source.load_team_stats(season)
+    schedule = data_source.load_schedules(season)
+    fetched = time.perf_counter()
+
+    df_clean, _ = build_team_features(add_derived_features(team_stats), variables, alpha)
+    games_with_stats = build_games_with_stats(completed_games(schedule), df_clean, variables)
+    built = time.perf_counter()
+
+    final_dir = season_dir(season, work_dir)
+    tmp_dir = final_dir.with_name(final_dir.name + f'.tmp-{os.getpid()}')
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    tables = {'df_clean': df_clean, 'games_with_stats': games_with_stats}
+    for name, df in tables.items():
+        df.to_parquet(tmp_dir / f'{name}.parquet', index=False)
+
+    timings = {
+        'season': season,
+        'fetch_s': fetched - start,
+        'build_s': built - fetched,
+        'write_s': time.perf_counter() - built,
+        'team_weeks': len(df_clean),
+        'games': len(games_with_stats),
+        'pid': os.getpid(),
+    }
+    timings['total_s'] = time.perf_counter() - start
+    (tmp_dir / TIMINGS_FILE).write_text(json.dumps(timings, indent=2) + '\n')
+
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    return timings
+
+
+def merge_into_store(seasons, work_dir=WORK_DIR, store_dir=STORE_DIR):
+    """Replace the given seasons' partitions in the feature store."""
+    for name in OUTPUT_TABLES:
+        df = pd.concat(
+            [pd.read_parquet(season_dir(s, work_dir) / f'{name}.parquet') for s in seasons],
+            ignore_index=True,
+        )
+        if (Path(store_dir) / name).exists():
+            upsert_rows(df, name, keys=('season',), store_dir=store_dir)
+        else:
+            write_table(df, name, store_dir)
+
+
+def backfill(seasons, workers=None, work_dir=WORK_DIR, store_dir=STORE_DIR, force=False, merge=True):
+    """Build every season not yet built (in parallel) and merge all into the store.
+
+    Returns ``(timings, wall_s)``; ``timings`` has one dict per season built
+    in this run.
+    """
+    current = data_source.get_current_season()
+    todo = [s for s in seasons if force or s >= current or not is_complete(s, work_dir)]
+
+    # Workers re-apply the parent's data_source settings, so configure() calls
+    # are honored with the spawn start method too.
+    configure = partial(data_source.configure, **data_source.current_config())
+    timings = []
+    start = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure) as pool:
+            futures = {pool.submit(build_season, s, work_dir): s for s in todo}
+            for future in as_completed(futures):
+                t = future.result()
+                timings.append(t)
+                print(f"  {t['season']}: {t['total_s']:6.2f}s "
+                      f"(fetch {t['fetch_s']:.2f}s, build {t['build_s']:.2f}s) "
+                      f"{t['games']:4d} games")
+
+    if merge:
+        merge_into_store(seasons, work_dir, store_dir)
+    return sorted(timings, key=lambda t: t['season']), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill feature tables for historical seasons.")
+    parser.add_argument('--start', type=int, default=FIRST_SEASON)
+    parser.add_argument('--end', type=int, help="last season (default: current)")
+    parser.add_argument('--workers', type=int, help="processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild seasons that already finished")
+    parser.add_argument('--no-merge', action='store_true', help="skip merging into the feature store")
+    parser.add_argument('--work-dir', default=str(WORK_DIR))
+    parser.add_argument('--store-dir', default=str(STORE_DIR))
+    args = parser.parse_args()
+
+    seasons = list(range(args.start, (args.end or data_source.get_current_season()) + 1))
+    skipped = len(seasons)
+    print(f"Backfilling seasons {seasons[0]}-{seasons[-1]}")
+    timings, wall = backfill(
+        seasons, args.workers, args.work_dir, args.store_dir,
+        force=args.force, merge=not args.no_merge,
+    )
+    skipped -= len(timings)
+
+    busy = sum(t['total_s'] for t in timings)
+    print(f"Built {len(timings)} seasons ({skipped} already done) in {wall:.1f}s wall, "
+          f"{busy:.1f}s of season work ({busy / wall if wall else 0:.1f}x parallel)")
+    if not args.no_merge:
+        print(f"Merged {len(seasons)} seasons into {args.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Walk-forward backtest of the game model, refit every week.
+
+The notebook scores 2025 with a model trained once on 2021-2024. In use the
+model is refit as the season goes, so this backtest does the same: for every
+(season, week) it trains on all games strictly before that week and scores
+that week's games, then reports per-week accuracy, log-loss and Brier score
+next to the Vegas moneyline baseline (``src.odds.add_vegas_implied``).
+
+Features are pregame: each team's ``df_clean`` row for the previous week
+of the season (``pregame_features``). The ``games_with_stats`` rows join the
+game's own week, whose EWMA already includes that game. Week 1 has no
+earlier row, so its games are not scored.
+
+Games are sorted by (season, week) once, so each fold's training set is a
+prefix of one array, and the logistic regression is warm-started from the
+previous week's coefficients, which are close to the next solution. The
+whole backtest takes a fraction of a second, less than starting joblib
+workers, so folds run serially unless ``--jobs`` asks for more.
+
+Feature selection is fixed (the bundle's features by default), so no random
+forest is refit per fold. Those features were chosen on data that includes
+the scored seasons, so the scores are somewhat optimistic.
+
+Run from the repo root:
+
+    python -m src.backtest
+    python -m src.backtest --start-season 2023 --out outputs/backtest_weekly.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.feature_store import load_table
+from src.featurizer import MatchupFeaturizer
+from src.model_bundle import load_bundle
+from src.odds import add_vegas_implied
+
+ID_COLUMNS = ['season', 'week', 'game_id', 'home_team', 'away_team', 'home_win']
+ODDS_COLUMNS = ['home_moneyline', 'away_moneyline']
+
+# Clip probabilities before taking logs, as sklearn's log_loss does.
+EPS = 1e-15
+
+
+def _fit_chunk(X, y, folds, warm_start, C):
+    """Fit and score consecutive folds; each fold is ``(start, end)`` with
+    training rows ``[:start]`` and test rows ``[start:end]``."""
+    model = LogisticRegression(random_state=41, max_iter=1000, C=C, warm_start=warm_start)
+    probs = []
+    for start, end in folds:
+        scaler = StandardScaler().fit(X[:start])
+        model.fit(scaler.transform(X[:start]), y[:start])
+        probs.append(model.predict_proba(scaler.transform(X[start:end]))[:, 1])
+    return probs
+
+
+def pregame_features(games, df_clean, features):
+    """``games`` with ``features`` rebuilt from each team's row for the previous week.
+
+    A team's latest ``df_clean`` row of the season before the game's week
+    (bye weeks fall back to the week before); NaN in week 1.
+    """
+    featurizer = MatchupFeaturizer(df_clean, [f.removesuffix('_diff') for f in features],
+                                   keys=('season', 'week', 'team'), asof=True)
+    diffs = featurizer.transform(games.assign(week=games['week'] - 1))
+    games = games.copy()
+    games[features] = diffs
+    return games
+
+
+def walk_forward(games, features, start_season=None, min_train_games=100,
+                 n_jobs=1, warm_start=True, C=1.0):
+    """Out-of-sample home win probabilities for every week from ``start_season`` on.
+
+    ``games`` is ``games_with_stats`` (completed regular-season games) with
+    pregame ``features`` (``pregame_features``). Returns
+    one row per scored game with ``home_win_prob`` and the Vegas
+    ``home_implied`` probability (NaN where there is no moneyline).
+    """
+    games = games.dropna(subset=features + ['home_win'])
+    games = games.sort_values(['season', 'week'], kind='stable').reset_index(drop=True)
+    if start_season is None:
+        start_season = games['season'].min() + 1
+
+    X = games[features].to_numpy(dtype=np.float64)
+    y = games['home_win'].to_numpy(dtype=np.int64)
+
+    # Row ranges of each (season, week) block.
+    week_key = (games['season'] * 100 + games['week']).to_numpy()
+    bounds = np.flatnonzero(np.diff(week_key)) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(games)]])
+    folds = [
+        (int(s), int(e)) for s, e in zip(starts, ends)
+        if games['season'].iat[s] >= start_season and s >= min_train_games
+    ]
+    if not folds:
+        raise ValueError("no weeks to score; lower start_season or min_train_games")
+
+    chunks = [list(c) for c in np.array_split(folds, min(effective_n_jobs(n_jobs), len(folds))) if len(c)]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_chunk)(X, y, chunk, warm_start, C) for chunk in chunks
+    )
+
+    scored = np.concatenate([np.arange(s, e) for s, e in folds])
+    predictions = games.loc[scored, ID_COLUMNS + ODDS_COLUMNS].reset_index(drop=True)
+    predictions['home_win_prob'] = np.concatenate([p for probs in results for p in probs])
+    predictions = add_vegas_implied(predictions)
+    return predictions.drop(columns=ODDS_COLUMNS + ['away_implied'])
+
+
+def probability_scores(y, p):
+    """Accuracy, log-loss and Brier score of home win probabilities ``p``."""
+    p = np.clip(p, EPS, 1 - EPS)
+    return {
+        'accuracy': np.mean((p > 0.5) == y),
+        'log_loss': -np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)),
+        'brier': np.mean((p - y) ** 2),
+    }
+
+
+def score_predictions(predictions):
+    """Model and Vegas accuracy, log-loss and Brier score for a set of games.
+
+    Vegas scores use only the games that have moneylines.
+    """
+    y = predictions['home_win'].to_numpy()
+    row = {'games': len(predictions)}
+    row.update(probability_scores(y, predictions['home_win_prob'].to_numpy()))
+
+    has_odds = predictions['home_implied'].notna().to_numpy()
+    vegas = probability_scores(y[has_odds], predictions['home_implied'].to_numpy()[has_odds])
+    row.update({f'vegas_{k}': v for k, v in vegas.items()})
+    return row
+
+
+def weekly_report(predictions):
+    """One row of ``score_predictions`` per (season, week)."""
+    rows = [
+        {'season': season, 'week': week, **score_predictions(group)}
+        for (season, week), group in predictions.groupby(['season', 'week'], sort=True)
+    ]
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest with weekly refits.")
+    parser.add_argument('--start-season', type=int, help="first season to score (default: second in data)")
+    parser.add_argument('--min-train-games', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=1, help="parallel workers (default: serial)")
+    parser.add_argument('--cold-start', action='store_true', help="refit every fold from scratch")
+    parser.add_argument('--out', help="write the weekly report to this CSV")
+    args = parser.parse_args()
+
+    features = load_bundle().features
+    games = load_table('games_with_stats', columns=ID_COLUMNS + ODDS_COLUMNS)
+    stat_columns = [f.removesuffix('_diff') for f in features]
+    games = pregame_features(games, load_table('df_clean', columns=['season', 'week', 'team'] + stat_columns),
+                             features)
+
+    start = time.perf_counter()
+    predictions = walk_forward(
+        games, features, args.start_season, args.min_train_games,
+        n_jobs=args.jobs, warm_start=not args.cold_start,
+    )
+    elapsed = time.perf_counter() - start
+
+    report = weekly_report(predictions)
+    with pd.option_context('display.max_rows', None, 'display.float_format', '{:.3f}'.format):
+        print(report.to_string(index=False))
+
+    overall = score_predictions(predictions)
+    print(f"\n{len(report)} weeks, {overall['games']} games in {elapsed:.2f}s")
+    print(f"Model: accuracy {overall['accuracy']:.3f}  log-loss {overall['log_loss']:.3f}  "
+          f"Brier {overall['brier']:.3f}")
+    print(f"Vegas: accuracy {overall['vegas_accuracy']:.3f}  log-loss {overall['vegas_log_loss']:.3f}  "
+          f"Brier {overall['vegas_brier']:.3f}")
+    print("Features are the bundle's, selected on data including these seasons: "
+          "model scores are optimistic.")
+
+    if args.out:
+        report.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Headless batch scoring of any seasons, weeks and model bundles.
+
+``nfl_predictor`` only scores the current week and always opens a plot
+window. This scores every game in a season/week range with one or more
+model bundles and writes one long table (one row per game and model) as
+Parquet or CSV, chosen by the ``--out`` suffix.
+
+Each season is one task: its schedule comes through ``data_source`` (cache
+first) and its ``df_clean`` rows from the feature store. Each team's stats
+are those of its latest week before the game's week (``MatchupFeaturizer``
+with ``asof=True`` at ``week - 1``, like ``backtest.pregame_features``): a
+``df_clean`` row's EWMA includes that week's game, so played games are
+scored from the same pregame stats as games not yet played, and never from
+their own result. Week 1 games have no earlier row of the season, so their
+probabilities are NaN. The featurizer gathers the union of all
+bundles' columns once per season, and each bundle scores every game of
+the season in one call. Seasons are spread over worker processes; spawning
+one costs about a second of imports, so the pool only pays off for many
+seasons or bundles (``--workers 1`` runs in-process).
+
+Run from the repo root:
+
+    python -m src.batch_score --start 2021 --end 2025 --out outputs/predictions.parquet
+    python -m src.batch_score --seasons 2025 --weeks 10-14 --bundle models/model_bundle.json \\
+        --bundle models/candidate.json --out outputs/candidate.csv
+    python -m src.batch_score --seasons 2025 --plot outputs/week_plots   # one PNG per week
+
+Plots are off unless ``--plot`` is given; they are drawn without pyplot, so
+no display is needed.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from src import data_source
+from src.feature_store import STORE_DIR, load_table
+from src.featurizer import MatchupFeaturizer
+from src.instrumentation import run, stage
+from src.model_bundle import BUNDLE_PATH, load_bundle
+
+GAME_COLUMNS = [
+    'season', 'week', 'game_type', 'gameday', 'game_id',
+    'home_team', 'away_team', 'home_score', 'away_score',
+]
+COLUMNS = GAME_COLUMNS + ['home_win', 'model', 'model_hash', 'home_win_prob']
+
+
+def parse_weeks(text):
+    """``'10'`` -> [10], ``'10-14'`` -> [10, ..., 14], ``'1,3,5-6'`` -> [1, 3, 5, 6]."""
+    weeks = []
+    for part in text.split(','):
+        first, _, last = part.partition('-')
+        weeks += range(int(first), int(last or first) + 1)
+    return weeks
+
+
+def model_names(bundle_paths):
+    """File stems as model names, or the full paths when stems collide."""
+    stems = [Path(p).stem for p in bundle_paths]
+    if len(set(stems)) == len(stems):
+        return stems
+    return [str(p) for p in bundle_paths]
+
+
+def score_season(season, bundle_paths, weeks=None, store_dir=STORE_DIR):
+    """Every game of ``season`` (in ``weeks``, if given) scored by every bundle."""
+    bundles = [load_bundle(p) for p in bundle_paths]
+
+    with stage('load_games') as span:
+        games = data_source.load_schedules(season)
+        games = games[games['season'] == season]
+        if weeks is not None:
+            games = games[games['week'].isin(weeks)]
+        games = games.sort_values(['week', 'gameday', 'game_id'], kind='stable').reset_index(drop=True)
+        span.rows = len(games)
+
+    stat_cols = list(dict.fromkeys(f.removesuffix('_diff') for b in bundles for f in b.features))
+    with stage('load_stats') as span:
+        stats = load_table('df_clean', columns=['season', 'week', 'team'] + stat_cols,
+                           filters=[('season', '==', season)], store_dir=store_dir)
+        span.rows = len(stats)
+
+    with stage('diff', rows=len(games)):
+        featurizer = MatchupFeaturizer(stats, stat_cols, keys=('season', 'week', 'team'), asof=True)
+        pregame = featurizer.transform(games.assign(week=games['week'] - 1))
+        diffs = pd.concat([games[GAME_COLUMNS], pd.DataFrame(pregame, columns=featurizer.diff_columns)], axis=1)
+
+    played = diffs['home_score'].notna() & diffs['away_score'].notna()
+    home_win = (diffs['home_score'] > diffs['away_score']).astype('Int8').where(played)
+
+    frames = []
+    with stage('predict', rows=len(diffs) * len(bundles)):
+        for name, bundle in zip(model_names(bundle_paths), bundles):
+            frames.append(diffs[GAME_COLUMNS].assign(
+                home_win=home_win,
+                model=name,
+                model_hash=bundle.content_hash,
+                home_win_prob=bundle.predict_proba(diffs),
+            ))
+    return pd.concat(frames, ignore_index=True)[COLUMNS]
+
+
+def batch_score(seasons, bundle_paths=(BUNDLE_PATH,), weeks=None, workers=None, store_dir=STORE_DIR):
+    """Score all ``seasons``; one process per season when ``workers`` allows.
+
+    Returns one table sorted by model, season, week and kickoff.
+    """
+    bundle_paths = [str(p) for p in bundle_paths]
+    workers = min(workers or os.cpu_count() or 1, len(seasons))
+    score = partial(score_season, bundle_paths=bundle_paths, weeks=weeks, store_dir=store_dir)
+
+    if workers <= 1:
+        frames = [score(season) for season in seasons]
+    else:
+        # Spawned, not forked: forking after polars has started its thread
+        # pool can deadlock the child. Workers re-apply data_source settings.
+        configure = partial(data_source.configure, **data_source.current_config())
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(score, season) for season in seasons]
+            frames = [future.result() for future in as_completed(futures)]
+
+    scores = pd.concat(frames, ignore_index=True)
+    order = {name: i for i, name in enumerate(model_names(bundle_paths))}
+    scores = scores.sort_values(['season', 'week', 'gameday', 'game_id'], kind='stable')
+    scores = scores.sort_values('model', key=lambda m: m.map(order), kind='stable')
+    return scores.reset_index(drop=True)
+
+
+def write_scores(scores, out):
+    """Parquet for ``.parquet``/``.pq`` paths, CSV otherwise."""
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if out.suffix in ('.parquet', '.pq'):
+        scores.to_parquet(out, index=False)
+    else:
+        scores.to_csv(out, index=False)
+
+
+def plot_weeks(scores, plot_dir):
+    """One bar chart per model, season and week: ``<model>_<season>_w<week>.png``."""
+    from matplotlib.figure import Figure
+
+    from src.nfl_predictor import plot_win_probs
+
+    plot_dir = Path(plot_dir)
+    plot_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (model, season, week), week_scores in scores.groupby(['model', 'season', 'week'], sort=False):
+        week_scores = week_scores.rename(columns={'home_win_prob': 'win_prob'})
+        week_scores = week_scores.sort_values('win_prob', ascending=False)
+        fig = Figure(figsize=(10, 6))
+        plot_win_probs(week_scores, fig.subplots())
+        name = Path(model).with_suffix('').as_posix().replace('/', '_')
+        path = plot_dir / f"{name}_{season}_w{week:02d}.png"
+        fig.savefig(path, dpi=150, bbox_inches='tight')
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score games for any seasons, weeks and model bundles.")
+    parser.add_argument('--seasons', type=int, nargs='+', help="seasons to score")
+    parser.add_argument('--start', type=int, help="first season of a range")
+    parser.add_argument('--end', type=int, help="last season of a range (default: current)")
+    parser.add_argument('--weeks', type=parse_weeks, help="e.g. 10, 10-14 or 1,3,5-6 (default: all)")
+    parser.add_argument('--bundle', action='append', help=f"model bundle (repeatable; default {BUNDLE_PATH})")
+    parser.add_argument('--out', default='outputs/batch_scores.parquet', help=".parquet or .csv")
+    parser.add_argument('--workers', type=int, help="processes (default: CPU count, at most one per season)")
+    parser.add_argument('--plot', metavar='DIR', help="also write one PNG per model, season and week")
+    parser.add_argument('--store-dir', default=str(STORE_DIR))
+    args = parser.parse_args()
+
+    if args.seasons:
+        seasons = args.seasons
+    elif args.start:
+        seasons = list(range(args.start, (args.end or data_source.get_current_season()) + 1))
+    else:
+        seasons = [data_source.get_current_season()]
+    bundle_paths = args.bundle or [BUNDLE_PATH]
+
+    start = time.perf_counter()
+    with run('batch_score'):
+        scores = batch_score(seasons, bundle_paths, args.weeks, args.workers, args.store_dir)
+        with stage('write', rows=len(scores)):
+            write_scores(scores, args.out)
+        if args.plot:
+            with stage('render', rows=len(scores)):
+                plots = plot_weeks(scores, args.plot)
+    wall = time.perf_counter() - start
+
+    print(f"Scored {len(scores):,} game-model rows ({len(seasons)} seasons x {len(bundle_paths)} models) "
+          f"in {wall:.1f}s -> {args.out}")
+    if args.plot:
+        print(f"Wrote {len(plots)} plots to {args.plot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Cached, offline-capable access to nflreadpy data.
+
+Every ``nflreadpy`` call downloads from GitHub, so the app, predictor and
+notebook pay network latency on each run and cannot work offline. This module
+sits in front of ``nflreadpy`` and stores each (dataset, season) as a Parquet
+file under ``data/cache/``:
+
+- seasons before the current one never expire;
+- current-season files expire after ``CURRENT_SEASON_TTL[dataset]`` seconds
+  (hourly for schedules, which also drive ``get_current_week``), or after
+  ``max_age`` seconds when a loader is given one;
+- in offline mode, or when a download fails, cached files are served even if
+  stale, and a missing file raises ``FileNotFoundError``;
+- a fixtures directory with the same ``<dataset>/<season>.parquet`` (or
+  ``.csv``) layout takes precedence over both, for tests and offline demos.
+
+Configuration comes from the environment or ``configure``:
+
+    NFL_CACHE_DIR=data/cache  NFL_FIXTURES_DIR=tests/fixtures  NFL_OFFLINE=1
+
+All loaders return pandas DataFrames, like ``nfl.load_*(...).to_pandas()``;
+``scan`` returns a lazy Polars frame over the same files instead.
+"""
+import os
+import time
+import warnings
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.instrumentation import stage
+
+# Dataset -> nflreadpy loader. nflreadpy is only imported when a download is
+# needed; importing it costs about half a second, which the app would
+# otherwise pay on every cold start even when everything is cached. Polars is
+# likewise imported by the functions that read files, not at module level.
+DATASETS = {
+    'schedules': 'load_schedules',
+    'team_stats': 'load_team_stats',
+    'pbp': 'load_pbp',
+    'player_stats': 'load_player_stats',
+}
+
+# Seconds a cached current-season file stays fresh.
+CURRENT_SEASON_TTL = {
+    'schedules': 60 * 60,
+    'team_stats': 6 * 60 * 60,
+    'pbp': 5 * 60,
+    'player_stats': 6 * 60 * 60,
+}
+
+_config = {
+    'cache_dir': Path(os.environ.get('NFL_CACHE_DIR', 'data/cache')),
+    'fixtures_dir': Path(os.environ['NFL_FIXTURES_DIR']) if os.environ.get('NFL_FIXTURES_DIR') else None,
+    'offline': os.environ.get('NFL_OFFLINE', '') not in ('', '0', 'false'),
+}
+
+
+def configure(cache_dir=None, fixtures_dir=None, offline=None):
+    """Override the cache directory, fixtures directory or offline mode."""
+    if cache_dir is not None:
+        _config['cache_dir'] = Path(cache_dir)
+    if fixtures_dir is not None:
+        _config['fixtures_dir'] = Path(fixtures_dir)
+    if offline is not None:
+        _config['offline'] = offline
+
+
+def current_config():
+    """The active settings, as keyword arguments for ``configure``."""
+    return dict(_config)
+
+
+def cache_path(dataset, season):
+    return _config['cache_dir'] / dataset / f'{season}.parquet'
+
+
+def get_current_season():
+    """Current NFL season; computed from today's date, so never downloaded.
+
+    Same rule as ``nfl.get_current_season``: a season starts on the Thursday
+    after Labor Day (the first Monday in September).
+    """
+    today = date.today()
+    september = date(today.year, 9, 1)
+    labor_day = september + timedelta(days=-september.weekday() % 7)
+    return today.year if today >= labor_day + timedelta(days=3) else today.year - 1
+
+
+def _download(dataset, seasons):
+    import nflreadpy as nfl
+
+    return getattr(nfl, DATASETS[dataset])(seasons)
+
+
+def _fixture_path(dataset, season):
+    if _config['fixtures_dir'] is None:
+        return None
+    for suffix in ('.parquet', '.csv'):
+        path = _config['fixtures_dir'] / dataset / f'{season}{suffix}'
+        if path.exists():
+            return path
+    return None
+
+
+def _fixture(dataset, season):
+    path = _fixture_path(dataset, season)
+    if path is None:
+        return None
+    import polars as pl
+
+    return pl.read_parquet(path) if path.suffix == '.parquet' else pl.read_csv(path)
+
+
+def _is_fresh(path, dataset, season, max_age=None):
+    if season < get_current_season():
+        return True
+    if max_age is None:
+        max_age = CURRENT_SEASON_TTL[dataset]
+    return time.time() - path.stat().st_mtime < max_age
+
+
+def _write_cache(df, dataset, season):
+    path = cache_path(dataset, season)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    df.write_parquet(tmp)
+    os.replace(tmp, path)
+
+
+def load_frames(dataset, seasons, max_age=None):
+    """Return ``{season: polars.DataFrame}`` for ``dataset``, downloading only
+    seasons that are neither fixtures nor fresh in the cache.
+
+    ``max_age`` overrides ``CURRENT_SEASON_TTL`` for the current season.
+    """
+    import polars as pl
+
+    if dataset not in DATASETS:
+        raise KeyError(f"unknown dataset: {dataset}")
+    seasons = [seasons] if isinstance(seasons, int) else list(seasons)
+
+    frames, stale = {}, []
+    for season in seasons:
+        fixture = _fixture(dataset, season)
+        path = cache_path(dataset, season)
+        if fixture is not None:
+            frames[season] = fixture
+        elif path.exists() and (_config['offline'] or _is_fresh(path, dataset, season, max_age)):
+            frames[season] = pl.read_parquet(path)
+        else:
+            stale.append(season)
+
+    if stale and _config['offline']:
+        raise FileNotFoundError(
+            f"offline mode: no cached {dataset} for seasons {stale} in {_config['cache_dir']}"
+        )
+
+    if stale:
+        try:
+            with stage('download') as span:
+                downloaded = _download(dataset, stale)
+                span.rows = downloaded.height
+        except Exception as e:
+            cached = [s for s in stale if cache_path(dataset, s).exists()]
+            if len(cached) < len(stale):
+                raise
+            warnings.warn(f"download of {dataset} failed ({e}); serving stale cache")
+            downloaded = None
+
+        for season in stale:
+            if downloaded is None:
+                frames[season] = pl.read_parquet(cache_path(dataset, season))
+            else:
+                frames[season] = downloaded.filter(pl.col('season') == season)
+                _write_cache(frames[season], dataset, season)
+
+    return {season: frames[season] for season in seasons}
+
+
+def season_file(dataset, season):
+    """Path of ``season``'s fixture or cache file, downloading it first if stale.
+
+    For readers that stream the file in chunks instead of loading it whole.
+    A download still holds the season in memory once, while it is written.
+    """
+    fixture = _fixture_path(dataset, season)
+    if fixture is not None:
+        return fixture
+    path = cache_path(dataset, season)
+    if not (path.exists() and (_config['offline'] or _is_fresh(path, dataset, season))):
+        load_frames(dataset, season)
+    return path
+
+
+def scan(dataset, seasons):
+    """``polars.LazyFrame`` over ``dataset``'s season files (fixtures or cache).
+
+    Stale seasons are downloaded first. Nothing is read until the frame is
+    collected, and then only the columns and rows the query needs.
+    """
+    import polars as pl
+
+    seasons = [seasons] if isinstance(seasons, int) else list(seasons)
+    frames = []
+    for season in seasons:
+        path = season_file(dataset, season)
+        frames.append(pl.scan_parquet(path) if path.suffix == '.parquet' else pl.scan_csv(path))
+    return pl.concat(frames, how='diagonal_relaxed')
+
+
+def _load(dataset, seasons, max_age=None):
+    import polars as pl
+
+    with stage(f'load_{dataset}') as span:
+        frames = list(load_frames(dataset, seasons, max_age).values())
+        df = pl.concat(frames, how='diagonal_relaxed').to_pandas()
+        span.rows = len(df)
+    return df
+
+
+def load_schedules(seasons):
+    """Cached ``nfl.load_schedules(seasons).to_pandas()``."""
+    return _load('schedules', seasons)
+
+
+def load_team_stats(seasons):
+    """Cached ``nfl.load_team_stats(seasons).to_pandas()``."""
+    return _load('team_stats', seasons)
+
+
+def load_pbp(seasons, max_age=None):
+    """Cached ``nfl.load_pbp(seasons).to_pandas()``.
+
+    Pollers pass their interval as ``max_age`` so each poll downloads.
+    """
+    return _load('pbp', seasons, max_age)
+
+
+def load_player_stats(seasons):
+    """Cached ``nfl.load_player_stats(seasons).to_pandas()`` (weekly level).
+
+    Large across many seasons; ``src/player_stats.py`` streams the files instead.
+    """
+    return _load('player_stats', seasons)
+
+
+def get_current_week():
+    """Week of the next unplayed game, from the cached current-season schedule.
+
+    Same rule as ``nfl.get_current_week``, so it refreshes with the hourly
+    schedule TTL instead of downloading the schedule on every call.
+    """
+    import polars as pl
+
+    schedule = load_frames('schedules', get_current_season())[get_current_season()]
+    unplayed = schedule.filter(pl.col('result').is_null())
+    weeks = unplayed if unplayed.height else schedule
+    week = weeks.select(pl.col('week').drop_nulls())
+    return int(week.min().item() if unplayed.height else week.max().item())
@@ -0,0 +1,148 @@
+"""Pluggable, cached feature ranking for the training pipeline.
+
+The notebook picked its top 10 features from a 200-tree random forest fitted
+on the whole training set, every time it ran. ``rank_features`` runs one of
+several selectors instead and caches the ranking under
+``data/cache/feature_selection/``, keyed by a SHA-256 of the training data,
+the feature names and the selector config, so re-running on unchanged data
+costs a file read.
+
+Selectors (``SELECTORS``), each returning one importance per feature:
+
+- ``l1_path``: standardized L1 logistic regression over a path of ``C``
+  values; features that enter the path earlier rank higher;
+- ``permutation``: permutation importance (log-loss) of the final
+  standardized logistic regression on all features;
+- ``mutual_info``: mutual information between each feature and ``home_win``;
+- ``random_forest``: the original random forest ``feature_importances_``.
+
+    ranking = rank_features(X_train, y_train, selector='l1_path')
+    feature_list = ranking.head(10)['feature'].to_list()
+
+Compare selectors with ``python -m benchmarks.bench_feature_selection``.
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.refresh import write_atomic
+
+CACHE_DIR = Path('data/cache/feature_selection')
+DEFAULT_SELECTOR = 'l1_path'
+
+
+def _standardize(X):
+    std = X.std(axis=0)
+    return (X - X.mean(axis=0)) / np.where(std > 0, std, 1.)
+
+
+def l1_path_importance(X, y, n_cs=10, random_state=0):
+    """Rank by how early each feature becomes non-zero along an L1 path.
+
+    Ties (features entering at the same ``C``) are broken by the absolute
+    standardized coefficient at the end of the path.
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import l1_min_c
+
+    X = _standardize(X)
+    cs = l1_min_c(X, y, loss='log') * np.logspace(0, 2, n_cs)
+    model = LogisticRegression(solver='saga', l1_ratio=1.0, C=cs[0], tol=1e-4,
+                               max_iter=2000, warm_start=True, random_state=random_state)
+    active = np.zeros(X.shape[1])
+    for c in cs:
+        model.set_params(C=c).fit(X, y)
+        active += model.coef_[0] != 0
+
+    final = np.abs(model.coef_[0])
+    return active + final / (1. + final.max())
+
+
+def permutation_importance(X, y, n_repeats=10, random_state=0):
+    """Mean increase in log-loss when each feature is shuffled."""
+    from sklearn.inspection import permutation_importance as sk_permutation_importance
+    from sklearn.linear_model import LogisticRegression
+
+    X = _standardize(X)
+    model = LogisticRegression(random_state=41, max_iter=1000).fit(X, y)
+    result = sk_permutation_importance(model, X, y, scoring='neg_log_loss',
+                                       n_repeats=n_repeats, random_state=random_state)
+    return result.importances_mean
+
+
+def mutual_info_importance(X, y, random_state=0):
+    from sklearn.feature_selection import mutual_info_classif
+
+    return mutual_info_classif(X, y, random_state=random_state)
+
+
+def random_forest_importance(X, y, n_estimators=200, max_depth=20, min_samples_split=20, random_state=67):
+    from sklearn.ensemble import RandomForestClassifier
+
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth,
+                                   min_samples_split=min_samples_split,
+                                   random_state=random_state, n_jobs=-1)
+    return model.fit(X, y).feature_importances_
+
+
+SELECTORS = {
+    'l1_path': l1_path_importance,
+    'permutation': permutation_importance,
+    'mutual_info': mutual_info_importance,
+    'random_forest': random_forest_importance,
+}
+
+
+def cache_key(X, y, selector, params):
+    """SHA-256 of the training data, feature names and selector config."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'selector': selector,
+        'params': params,
+        'features': list(X.columns),
+        'shape': list(X.shape),
+    }, sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(X.to_numpy(dtype=np.float64)).tobytes())
+    digest.update(np.ascontiguousarray(np.asarray(y, dtype=np.int64)).tobytes())
+    return digest.hexdigest()
+
+
+def rank_features(X, y, selector=DEFAULT_SELECTOR, cache_dir=CACHE_DIR, **params):
+    """Features of ``X`` ranked by ``selector``, most important first.
+
+    Returns a DataFrame with ``feature`` and ``importance`` columns, like the
+    notebook's ``feature_importance`` table. ``params`` go to the selector;
+    pass ``cache_dir=None`` to skip the cache.
+    """
+    if selector not in SELECTORS:
+        raise KeyError(f"unknown selector {selector!r}; choose from {sorted(SELECTORS)}")
+
+    path = None
+    if cache_dir is not None:
+        path = Path(cache_dir) / f'{cache_key(X, y, selector, params)}.json'
+        try:
+            return pd.DataFrame(json.loads(path.read_text())['ranking'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass  # missing, or left truncated by an older writer: recompute
+
+    start = time.perf_counter()
+    importance = SELECTORS[selector](X.to_numpy(dtype=np.float64), np.asarray(y), **params)
+    elapsed = time.perf_counter() - start
+
+    ranking = pd.DataFrame({'feature': list(X.columns), 'importance': importance})
+    ranking = ranking.sort_values('importance', ascending=False, kind='stable').reset_index(drop=True)
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps({
+            'selector': selector,
+            'params': params,
+            'seconds': elapsed,
+            'ranking': ranking.to_dict(orient='list'),
+        }, indent=2) + '\n'
+        write_atomic(path, lambda tmp: tmp.write_text(text))
+    return ranking
@@ -0,0 +1,153 @@
+"""Columnar Parquet copies of the feature tables.
+
+The CSVs in ``data/`` stay the canonical, human-readable artifacts. This module
+mirrors them into ``data/store/`` as Parquet, partitioned by ``season`` for the
+multi-season tables, so readers only parse the columns and seasons they ask
+for instead of every column of every season.
+
+    from src.feature_store import load_table
+
+    load_table(
+        'games_with_stats',
+        columns=['week', 'home_team', 'away_team', 'home_win'],
+        filters=[('season', '==', 2025), ('game_type', '==', 'REG')],
+    )
+
+Rebuild the store from the CSVs with:
+
+    python -m src.feature_store
+"""
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DATA_DIR = Path('data')
+STORE_DIR = DATA_DIR / 'store'
+PARTITION_COL = 'season'
+
+# Table name -> whether it is partitioned by season.
+TABLES = {
+    'df_clean': True,
+    'games_with_stats': True,
+    'most_recent_stats': False,
+    'season_performance': True,
+}
+
+# Tables mirrored from a canonical CSV in ``data/``.
+CSV_TABLES = ('df_clean', 'games_with_stats', 'most_recent_stats')
+
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COL, pa.int64())]), flavor='hive')
+
+
+def _path(name, store_dir=STORE_DIR):
+    if name not in TABLES:
+        raise KeyError(f"unknown feature table: {name}")
+    store_dir = Path(store_dir)
+    return store_dir / name if TABLES[name] else store_dir / f'{name}.parquet'
+
+
+def _dataset(name, store_dir=STORE_DIR):
+    path = _path(name, store_dir)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found; run `python -m src.feature_store` first")
+    if TABLES[name]:
+        return ds.dataset(path, format='parquet', partitioning=_PARTITIONING)
+    return ds.dataset(path, format='parquet')
+
+
+def load_table(name, columns=None, filters=None, store_dir=STORE_DIR):
+    """Read a feature table as a DataFrame.
+
+    ``columns`` projects the read to just those columns. ``filters`` takes the
+    ``pyarrow.parquet`` list-of-tuples form, e.g. ``[('season', '==', 2025)]``;
+    filters on ``season`` skip other partitions without opening their files,
+    and filters on other columns are applied during the scan.
+    """
+    dataset = _dataset(name, store_dir)
+    expression = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def seasons(name, store_dir=STORE_DIR):
+    """Seasons available in a partitioned table, read from the directory names."""
+    return sorted(
+        int(path.name.split('=', 1)[1])
+        for path in _path(name, store_dir).glob(f'{PARTITION_COL}=*')
+    )
+
+
+def last_modified(name, store_dir=STORE_DIR):
+    """Newest modification time of a table's Parquet files, for cache keys."""
+    path = _path(name, store_dir)
+    files = path.rglob('*.parquet') if TABLES[name] else [path]
+    return max((f.stat().st_mtime for f in files if f.exists()), default=0.0)
+
+
+def write_table(df, name, store_dir=STORE_DIR):
+    """Replace a feature table with ``df``."""
+    path = _path(name, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if TABLES[name]:
+        shutil.rmtree(path, ignore_errors=True)
+        pq.write_to_dataset(
+            table, path,
+            partition_cols=[PARTITION_COL],
+            basename_template='part-{i}.parquet',
+        )
+    else:
+        pq.write_table(table, path)
+
+
+def upsert_rows(df, name, keys=('season', 'week'), store_dir=STORE_DIR):
+    """Insert ``df`` into a partitioned table, replacing rows with the same ``keys``.
+
+    Only the seasons present in ``df`` are rewritten.
+    """
+    if not TABLES[name]:
+        raise ValueError(f"{name} is not partitioned; use write_table")
+    if df.empty:
+        return
+
+    path = _path(name, store_dir)
+    schema = _dataset(name, store_dir).schema
+    schema = schema.remove(schema.get_field_index(PARTITION_COL))
+    keys = list(keys)
+
+    for season, rows in df.groupby(PARTITION_COL):
+        part_dir = path / f'{PARTITION_COL}={season}'
+        if part_dir.exists():
+            existing = load_table(name, filters=[(PARTITION_COL, '==', season)], store_dir=store_dir)
+            replaced = existing[keys].apply(tuple, axis=1).isin(rows[keys].apply(tuple, axis=1))
+            rows = pd.concat([existing[~replaced], rows[existing.columns]], ignore_index=True)
+
+        table = pa.Table.from_pandas(rows.drop(columns=PARTITION_COL), preserve_index=False)
+        try:
+            table = table.select(schema.names).cast(schema)
+        except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"{name} schema changed; rebuild the feature store") from e
+
+        part_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, part_dir / 'part-0.parquet')
+
+
+def read_csv_table(name, data_dir=DATA_DIR):
+    """Read one of the canonical CSVs, dropping any saved pandas index columns."""
+    df = pd.read_csv(Path(data_dir) / f'{name}.csv')
+    return df.loc[:, ~df.columns.str.startswith('Unnamed')]
+
+
+def build_store(data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Rebuild the CSV-backed Parquet tables from the CSVs in ``data_dir``."""
+    for name in CSV_TABLES:
+        write_table(read_csv_table(name, data_dir), name, store_dir)
+
+
+if __name__ == "__main__":
+    build_store()
+    print(f"Wrote {', '.join(CSV_TABLES)} to {STORE_DIR}")
@@ -0,0 +1,97 @@
+"""One home-minus-away featurizer for training, weekly scoring and backtests.
+
+Team stats are indexed once by key (``team`` for the latest stats, or
+``season``/``week``/``team`` for the per-week ``df_clean`` rows). Featurizing
+games is then two index lookups that turn team abbreviations into row numbers,
+two fancy-indexed gathers of the home and away blocks, and one array
+subtraction. Games whose team has no stats row gather a row of NaN, like the
+left merges this replaces.
+
+With ``asof=True`` (``season``/``week``/``team`` keys only) a game gathers
+each team's latest row of that season up to the game's week, so games not
+yet played get the same pregame stats ``get_nfl_diffs`` would use.
+
+Built from a model bundle, the columns follow ``bundle.features`` (the order
+the model was trained on), so scoring cannot silently reorder columns:
+
+    featurizer = MatchupFeaturizer.for_bundle(most_recent_stats, bundle)
+    probs = bundle.predict_proba(featurizer.frame(week_games))
+"""
+import numpy as np
+import pandas as pd
+
+
+class MatchupFeaturizer:
+    """``home - away`` differences of ``stat_columns`` for any set of games."""
+
+    def __init__(self, stats, stat_columns, keys=('team',), asof=False):
+        self.stat_columns = list(stat_columns)
+        self.keys = list(keys)
+        self.asof = asof
+        if self.keys[-1] != 'team':
+            raise ValueError("the last key must be 'team'")
+
+        if asof:
+            if self.keys != ['season', 'week', 'team']:
+                raise ValueError("asof lookups need keys ('season', 'week', 'team')")
+            stats = stats.sort_values(['season', 'team', 'week'], kind='stable')
+            self._team_codes = {team: i for i, team in enumerate(sorted(stats['team'].unique()))}
+            self._asof_keys = self._asof_key(stats['season'], stats['team'], stats['week'])
+
+        index = stats.set_index(self.keys).index
+        if not index.is_unique:
+            raise ValueError(f"stats must have one row per {tuple(self.keys)}")
+        self._index = index
+        # One padding row of NaN for teams without stats.
+        values = stats[self.stat_columns].to_numpy(dtype=np.float64)
+        self.values = np.vstack([values, np.full((1, len(self.stat_columns)), np.nan)])
+
+    @classmethod
+    def for_bundle(cls, stats, bundle, keys=('team',), asof=False):
+        """Featurizer producing exactly ``bundle.features``, in that order."""
+        return cls(stats, [f.removesuffix('_diff') for f in bundle.features], keys, asof)
+
+    @property
+    def diff_columns(self):
+        return [f'{col}_diff' for col in self.stat_columns]
+
+    def _asof_key(self, season, team, week):
+        """Sortable int64 key per (season, team, week); -1 for unknown teams."""
+        codes = pd.Series(team).map(self._team_codes).fillna(-1).to_numpy(dtype=np.int64)
+        key = (np.asarray(season, dtype=np.int64) * (len(self._team_codes) + 1) + codes) * 64 \
+            + np.asarray(week, dtype=np.int64)
+        return np.where(codes < 0, -1, key)
+
+    def row_indices(self, games, side):
+        """Row of ``values`` for each game's ``{side}_team`` (the NaN row if unknown)."""
+        if self.asof:
+            wanted = self._asof_key(games['season'], games[f'{side}_team'], games['week'])
+            rows = np.searchsorted(self._asof_keys, wanted, side='right') - 1
+            found = (wanted >= 0) & (rows >= 0)
+            # The match must be the same team and season, not the previous group.
+            found &= self._asof_keys[rows.clip(0)] // 64 == wanted // 64
+            return np.where(found, rows, len(self.values) - 1)
+
+        key_cols = self.keys[:-1] + [f'{side}_team']
+        if len(self.keys) == 1:
+            keys = pd.Index(games[key_cols[0]])
+        else:
+            keys = pd.MultiIndex.from_frame(games[key_cols].set_axis(self.keys, axis=1))
+        rows = self._index.get_indexer(keys)
+        rows[rows < 0] = len(self.values) - 1
+        return rows
+
+    def blocks(self, games):
+        """``(home, away)`` stat arrays, one row per game."""
+        return (self.values[self.row_indices(games, 'home')],
+                self.values[self.row_indices(games, 'away')])
+
+    def transform(self, games):
+        """``home - away`` diffs as a (games x features) array."""
+        home, away = self.blocks(games)
+        return home - away
+
+    def frame(self, games, id_columns=('game_id', 'home_team', 'away_team')):
+        """``id_columns`` of ``games`` plus one ``*_diff`` column per feature."""
+        diffs = pd.DataFrame(self.transform(games), columns=self.diff_columns)
+        return pd.concat([games[list(id_columns)].reset_index(drop=True), diffs], axis=1)
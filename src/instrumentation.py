@@ -0,0 +1,256 @@
+"""Stage-level timing and memory spans for the prediction pipeline.
+
+Wrap a pipeline stage in ``stage`` to record its wall time, the rows it
+processed and its peak Python heap growth (``tracemalloc``, which sees numpy
+and pandas buffers but not Arrow's own allocator). Stages nest; each span
+keeps its parent's name. ``run`` groups the spans of one pipeline run and,
+when it ends, exports them to ``data/traces/``; spans outside a run (the
+app's data loads, the scoring service) are timed but not kept:
+
+- ``spans.jsonl``: one JSON object per span, appended run after run;
+- ``metrics.prom``: the last run in Prometheus text format, for a node
+  exporter textfile collector;
+- ``last_run.json``: the last run, read by the app's sidebar panel.
+
+    from src.instrumentation import run, stage
+
+    with run('weekly_update'):
+        with stage('load') as span:
+            team_stats = data_source.load_team_stats(season)
+            span.rows = len(team_stats)
+
+Tracing is off unless ``NFL_TRACE=1`` is set or ``configure(enabled=True)``
+is called. Disabled, ``stage`` returns a shared no-op context manager, so a
+wrapped stage costs one function call. ``NFL_TRACE_MEMORY=0`` keeps timing
+but skips ``tracemalloc``, which slows allocation-heavy code noticeably.
+
+Memory peaks are only right for single-threaded runs: ``tracemalloc``'s peak
+is process-wide, so allocations (and peak resets) of other threads running
+stages at the same time land in whichever span is open.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+SPANS_FILE = 'spans.jsonl'
+METRICS_FILE = 'metrics.prom'
+LAST_RUN_FILE = 'last_run.json'
+
+_config = {
+    'enabled': os.environ.get('NFL_TRACE', '') not in ('', '0', 'false'),
+    'memory': os.environ.get('NFL_TRACE_MEMORY', '1') not in ('', '0', 'false'),
+    'trace_dir': Path(os.environ.get('NFL_TRACE_DIR', 'data/traces')),
+}
+
+_local = threading.local()
+_spans = []
+_spans_lock = threading.Lock()
+
+
+def configure(enabled=None, memory=None, trace_dir=None):
+    """Turn tracing or memory tracking on or off, or move the trace directory."""
+    if enabled is not None:
+        _config['enabled'] = enabled
+    if memory is not None:
+        _config['memory'] = memory
+    if trace_dir is not None:
+        _config['trace_dir'] = Path(trace_dir)
+
+
+def enabled():
+    return _config['enabled']
+
+
+class _NullSpan:
+    """Stands in for a span when tracing is disabled; ``rows`` is discarded."""
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.parent = None
+        self.depth = 0
+        self.run = None
+        self.started_at = None
+        self.duration_s = None
+        self.peak_bytes = None
+        self.error = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        self.run = getattr(_local, 'run', None)
+        self.started_at = time.time()
+
+        self._memory = _config['memory']
+        if self._memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _local.started_tracemalloc = True
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # reset_peak below would drop the parent's peak so far.
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+            self._base = current
+            self._child_peak = current
+
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_s = time.perf_counter() - self._start
+        stack = _stack()
+        stack.pop()
+
+        if self._memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            self.peak_bytes = peak - self._base
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            elif getattr(_local, 'started_tracemalloc', False):
+                # Tracing slows every allocation; only keep it on inside stages.
+                tracemalloc.stop()
+                _local.started_tracemalloc = False
+
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if self.run is not None:
+            with _spans_lock:
+                _spans.append(self)
+        return False
+
+    def to_dict(self):
+        return {
+            'run': self.run,
+            'stage': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            'duration_s': self.duration_s,
+            'rows': self.rows,
+            'peak_bytes': self.peak_bytes,
+            'error': self.error,
+        }
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def stage(name, rows=None):
+    """Context manager timing one stage; set ``.rows`` on it if unknown up front."""
+    if not _config['enabled']:
+        return _NULL_SPAN
+    return Span(name, rows)
+
+
+def traced(name):
+    """Decorator form of ``stage`` for functions that are a stage on their own."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _config['enabled']:
+                return fn(*args, **kwargs)
+            with Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def run(name):
+    """Collect the spans of one pipeline run and export them when it ends."""
+    if not _config['enabled']:
+        yield
+        return
+    _local.run = f"{name}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S.%fZ')}"
+    try:
+        with Span(name):
+            yield
+    finally:
+        run_id, _local.run = _local.run, None
+        with _spans_lock:
+            spans = [s.to_dict() for s in _spans if s.run == run_id]
+            _spans[:] = [s for s in _spans if s.run != run_id]
+        export(name, run_id, spans)
+
+
+def export(name, run_id, spans, trace_dir=None):
+    """Append ``spans`` to the JSON lines log and replace the last-run files."""
+    # Imported here: src.refresh imports this module.
+    from src.refresh import write_atomic
+
+    trace_dir = Path(trace_dir or _config['trace_dir'])
+    trace_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(trace_dir / SPANS_FILE, 'a') as f:
+        for span in spans:
+            f.write(json.dumps(span) + '\n')
+
+    last_run = {'pipeline': name, 'run': run_id, 'spans': spans}
+    last_run_text = json.dumps(last_run, indent=2) + '\n'
+    metrics_text = prometheus_text(name, spans)
+    write_atomic(trace_dir / LAST_RUN_FILE, lambda tmp: tmp.write_text(last_run_text))
+    write_atomic(trace_dir / METRICS_FILE, lambda tmp: tmp.write_text(metrics_text))
+
+
+def prometheus_text(name, spans):
+    """Prometheus exposition format for one run's spans (gauges per stage)."""
+    metrics = [
+        ('nfl_stage_duration_seconds', 'duration_s', "Wall time of each stage in the last run."),
+        ('nfl_stage_rows', 'rows', "Rows processed by each stage in the last run."),
+        ('nfl_stage_peak_memory_bytes', 'peak_bytes', "Peak traced heap growth of each stage in the last run."),
+    ]
+    # A stage that ran more than once under the same parent is one series:
+    # durations and rows are summed, peaks take the maximum.
+    series = {}
+    for span in spans:
+        key = (span['stage'], span['parent'] or '')
+        total = series.setdefault(key, {'duration_s': 0., 'rows': None, 'peak_bytes': None})
+        total['duration_s'] += span['duration_s']
+        if span['rows'] is not None:
+            total['rows'] = (total['rows'] or 0) + span['rows']
+        if span['peak_bytes'] is not None:
+            total['peak_bytes'] = max(total['peak_bytes'] or 0, span['peak_bytes'])
+
+    lines = []
+    for metric, field, help_text in metrics:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} gauge']
+        for (stage_name, parent), total in series.items():
+            if total[field] is not None:
+                lines.append(f'{metric}{{pipeline="{name}",stage="{stage_name}",'
+                             f'parent="{parent}"}} {total[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+def load_last_run(trace_dir=None):
+    """The last exported run as a dict, or ``None`` if nothing was traced yet."""
+    path = Path(trace_dir or _config['trace_dir']) / LAST_RUN_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
@@ -0,0 +1,375 @@
+"""In-game win probability from a stream of play-by-play records.
+
+Each game starts from its pregame home win probability (``get_nfl_diffs``,
+or any file with ``game_id`` and ``win_prob``/``home_win_prob`` columns, such
+as ``batch_score`` output) and updates it after every play in O(1):
+
+    margin ~ Normal(lead + prior_margin * f + possession_ep, (MARGIN_SD * sqrt(f))^2)
+
+where ``f`` is the fraction of regulation left, ``prior_margin`` is the
+final home margin the pregame probability implies (``MARGIN_SD *
+Phi^-1(prior)``) and ``possession_ep`` is the expected points of the current
+possession from its field position, signed for the home team. At kickoff
+this is exactly the pregame probability; as the clock runs down the score
+takes over.
+
+Plays come from ``nflreadpy`` play-by-play (``data_source.load_pbp``,
+downloaded every ``--poll-interval`` seconds regardless of the cache TTL) or
+are replayed from a local Parquet/CSV file at ``--speed`` game
+seconds per wall second (0 = as fast as possible). Every game of the slate
+is an asyncio task, and the board of all games is written atomically to
+``data/live/live_wp.json`` every ``--publish-interval`` seconds for the
+app's Live tab.
+
+Run from the repo root:
+
+    python -m src.live_wp --replay data/pbp_week10.parquet --speed 60
+    python -m src.live_wp --replay data/pbp_week10.parquet --priors outputs/batch_scores.parquet
+    python -m src.live_wp                             # poll the current week's games
+
+nflverse publishes play-by-play shortly after plays happen, not in real time,
+so polling follows the game with some delay; replays are the stand-in for
+a real feed.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import NormalDist
+
+import pandas as pd
+
+from src import data_source
+from src.refresh import write_atomic
+
+LIVE_PATH = Path('data/live/live_wp.json')
+
+PBP_COLUMNS = [
+    'game_id', 'play_id', 'home_team', 'away_team', 'posteam', 'qtr',
+    'quarter_seconds_remaining', 'game_seconds_remaining', 'yardline_100',
+    'down', 'ydstogo', 'total_home_score', 'total_away_score', 'desc',
+]
+
+GAME_SECONDS = 3600
+QUARTER_SECONDS = 900
+# Standard deviation of NFL final margins around the pregame expectation.
+MARGIN_SD = 13.45
+# Expected points of a possession, linear in yards to the end zone: about
+# 0.3 at the offense's own 20, 2.5 at midfield and 6.2 at the 1.
+EP_INTERCEPT = 6.3
+EP_SLOPE = 0.075
+
+_SQRT2 = math.sqrt(2)
+
+
+def _missing(value):
+    return value is None or value != value
+
+
+def expected_points(yardline_100):
+    return EP_INTERCEPT - EP_SLOPE * yardline_100
+
+
+def prior_margin(prior):
+    """Expected final home margin implied by a pregame home win probability."""
+    prior = min(max(prior, 1e-6), 1 - 1e-6)
+    return MARGIN_SD * NormalDist().inv_cdf(prior)
+
+
+def win_probability(lead, seconds_left, margin, possession_ep=0.0):
+    """Home win probability with ``seconds_left`` to play and a ``lead``."""
+    if seconds_left <= 0:
+        return 1.0 if lead > 0 else 0.0 if lead < 0 else 0.5
+    f = min(seconds_left, GAME_SECONDS) / GAME_SECONDS
+    mean = lead + margin * f + possession_ep
+    return 0.5 * (1 + math.erf(mean / (MARGIN_SD * math.sqrt(f) * _SQRT2)))
+
+
+def elapsed_seconds(play):
+    """Game clock elapsed at ``play``, counting overtime on from 3600."""
+    qtr, left = play['qtr'], play['quarter_seconds_remaining']
+    if _missing(qtr) or _missing(left):
+        return None
+    return (int(qtr) - 1) * QUARTER_SECONDS + QUARTER_SECONDS - left
+
+
+class GameState:
+    """Score, clock, possession and win probability of one game."""
+
+    __slots__ = ('game_id', 'home_team', 'away_team', 'prior', 'margin',
+                 'home_score', 'away_score', 'seconds_left', 'qtr', 'quarter_seconds_left', 'elapsed', 'posteam',
+                 'yardline_100', 'down', 'ydstogo', 'plays', 'last_play_id',
+                 'last_play', 'wp', 'history', 'done')
+
+    def __init__(self, game_id, home_team, away_team, prior=0.5):
+        self.game_id = game_id
+        self.home_team = home_team
+        self.away_team = away_team
+        self.prior = prior
+        self.margin = prior_margin(prior)
+        self.home_score = self.away_score = 0
+        self.seconds_left = GAME_SECONDS
+        # Quarter (5 and up is overtime) and its clock, for display.
+        self.qtr = 1
+        self.quarter_seconds_left = QUARTER_SECONDS
+        self.elapsed = 0
+        self.posteam = self.yardline_100 = self.down = self.ydstogo = None
+        self.plays = 0
+        self.last_play_id = None
+        self.last_play = ''
+        self.wp = prior
+        # (elapsed seconds, home win probability) after each play.
+        self.history = [(0, prior)]
+        self.done = False
+
+    def update(self, play):
+        """Apply one play record and return the new home win probability."""
+        if not _missing(play['total_home_score']):
+            self.home_score = int(play['total_home_score'])
+            self.away_score = int(play['total_away_score'])
+        if not _missing(play['game_seconds_remaining']):
+            self.seconds_left = play['game_seconds_remaining']
+        elapsed = elapsed_seconds(play)
+        if elapsed is not None:
+            self.elapsed = max(self.elapsed, elapsed)
+            self.qtr = int(play['qtr'])
+            self.quarter_seconds_left = play['quarter_seconds_remaining']
+
+        posteam = play['posteam']
+        self.posteam = None if _missing(posteam) else posteam
+        self.yardline_100 = None if _missing(play['yardline_100']) else play['yardline_100']
+        self.down = None if _missing(play['down']) else int(play['down'])
+        self.ydstogo = None if _missing(play['ydstogo']) else int(play['ydstogo'])
+
+        possession_ep = 0.0
+        if self.posteam is not None and self.yardline_100 is not None:
+            sign = 1 if self.posteam == self.home_team else -1
+            possession_ep = sign * expected_points(self.yardline_100)
+
+        self.wp = win_probability(self.home_score - self.away_score, self.seconds_left,
+                                  self.margin, possession_ep)
+        self.plays += 1
+        self.last_play_id = play['play_id']
+        self.last_play = '' if _missing(play['desc']) else play['desc']
+        self.history.append((self.elapsed, self.wp))
+        return self.wp
+
+    def to_dict(self):
+        return {
+            'game_id': self.game_id,
+            'home_team': self.home_team,
+            'away_team': self.away_team,
+            'home_score': self.home_score,
+            'away_score': self.away_score,
+            'seconds_left': self.seconds_left,
+            'qtr': self.qtr,
+            'quarter_seconds_left': self.quarter_seconds_left,
+            'posteam': self.posteam,
+            'down': self.down,
+            'ydstogo': self.ydstogo,
+            'yardline_100': self.yardline_100,
+            'prior': self.prior,
+            'home_win_prob': self.wp,
+            'plays': self.plays,
+            'last_play': self.last_play,
+            'done': self.done,
+            'history': self.history,
+        }
+
+
+def is_game_over(play):
+    return play['desc'] == 'END GAME'
+
+
+async def replay_game(plays, speed=0.0):
+    """Yield ``plays`` (dicts, in order), paced at ``speed`` game seconds per second."""
+    previous = None
+    for play in plays:
+        elapsed = elapsed_seconds(play)
+        if speed > 0 and previous is not None and elapsed is not None:
+            await asyncio.sleep(max(elapsed - previous, 0) / speed)
+        else:
+            # Let the other games run between plays.
+            await asyncio.sleep(0)
+        previous = elapsed if elapsed is not None else previous
+        yield play
+
+
+class PbpPoller:
+    """Shared, periodically reloaded play-by-play for polling many games."""
+
+    def __init__(self, season, interval=60.0):
+        self.season = season
+        self.interval = interval
+        self._plays = {}
+        self._loaded_at = -math.inf
+        self._lock = asyncio.Lock()
+
+    async def _reload(self):
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self.interval:
+                return
+            # The load is blocking I/O; keep it off the event loop. The cache
+            # is only reused within one interval, not the pbp TTL.
+            pbp = await asyncio.to_thread(data_source.load_pbp, self.season, self.interval)
+            self._plays = play_records(pbp)
+            self._loaded_at = time.monotonic()
+
+    async def plays(self, game_id):
+        """Yield each new play of ``game_id`` until the game ends."""
+        sent = 0
+        while True:
+            await self._reload()
+            plays = self._plays.get(game_id, [])
+            for play in plays[sent:]:
+                yield play
+            sent = len(plays)
+            if plays and is_game_over(plays[-1]):
+                return
+            await asyncio.sleep(self.interval)
+
+
+def play_records(pbp):
+    """``{game_id: [play dict, ...]}`` in play order."""
+    pbp = pbp[PBP_COLUMNS].sort_values(['game_id', 'play_id'], kind='stable')
+    return {game_id: plays.to_dict('records') for game_id, plays in pbp.groupby('game_id', sort=False)}
+
+
+def read_pbp(path):
+    path = Path(path)
+    if path.suffix in ('.parquet', '.pq'):
+        return pd.read_parquet(path, columns=PBP_COLUMNS)
+    return pd.read_csv(path, usecols=PBP_COLUMNS)
+
+
+def load_priors(path=None):
+    """Pregame home win probability by ``game_id``.
+
+    From ``path`` (CSV or Parquet with ``win_prob`` or ``home_win_prob``), or
+    from ``get_nfl_diffs`` for the current week.
+    """
+    if path is None:
+        from src.nfl_predictor import get_nfl_diffs
+
+        priors = get_nfl_diffs(plot_path=None, show=False)
+    elif Path(path).suffix in ('.parquet', '.pq'):
+        priors = pd.read_parquet(path)
+    else:
+        priors = pd.read_csv(path)
+    column = 'win_prob' if 'win_prob' in priors else 'home_win_prob'
+    priors = priors.drop_duplicates('game_id', keep='first')
+    return dict(zip(priors['game_id'], priors[column]))
+
+
+def game_states(games, priors):
+    """A ``GameState`` per row of ``games`` (``game_id``, ``home_team``, ``away_team``)."""
+    missing = [g for g in games['game_id'] if g not in priors]
+    if missing:
+        warnings.warn(f"no pregame probability for {len(missing)} games; starting them at 0.5")
+    return [GameState(g.game_id, g.home_team, g.away_team, float(priors.get(g.game_id, 0.5)))
+            for g in games.itertuples(index=False)]
+
+
+class LiveBoard:
+    """All games of a slate, written as one JSON snapshot for the app."""
+
+    def __init__(self, states, path=LIVE_PATH):
+        self.states = states
+        self.path = Path(path)
+        self.sequence = 0
+
+    def snapshot(self):
+        return {
+            'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'sequence': self.sequence,
+            'finished': all(s.done for s in self.states),
+            'games': [s.to_dict() for s in self.states],
+        }
+
+    def publish(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.sequence += 1
+        text = json.dumps(self.snapshot())
+        write_atomic(self.path, lambda tmp: tmp.write_text(text))
+
+
+async def run_game(state, plays, latencies=None):
+    """Apply every play from the async iterable ``plays`` to ``state``.
+
+    With a ``latencies`` list, the nanoseconds of each update are appended.
+    """
+    if latencies is None:
+        async for play in plays:
+            state.update(play)
+    else:
+        async for play in plays:
+            start = time.perf_counter_ns()
+            state.update(play)
+            latencies.append(time.perf_counter_ns() - start)
+    state.done = True
+
+
+async def run_slate(states, sources, path=LIVE_PATH, publish_interval=1.0, latencies=None):
+    """Run every game concurrently, publishing the board while they play.
+
+    ``sources`` holds one async iterable of plays per state. ``path=None``
+    skips publishing.
+    """
+    board = LiveBoard(states, path) if path else None
+    finished = asyncio.Event()
+
+    async def publish():
+        while not finished.is_set():
+            board.publish()
+            try:
+                await asyncio.wait_for(finished.wait(), publish_interval)
+            except TimeoutError:
+                pass
+
+    publisher = asyncio.create_task(publish()) if board else None
+    await asyncio.gather(*(run_game(s, plays, latencies) for s, plays in zip(states, sources)))
+    finished.set()
+    if board:
+        await publisher
+        board.publish()
+    return states
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live in-game win probabilities from play-by-play.")
+    parser.add_argument('--replay', help="play-by-play Parquet/CSV to replay instead of polling nflreadpy")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="replay speed in game seconds per wall second (0: as fast as possible)")
+    parser.add_argument('--priors', help="pregame probabilities (default: get_nfl_diffs)")
+    parser.add_argument('--season', type=int, help="season to poll (default: current)")
+    parser.add_argument('--week', type=int, help="week to poll (default: current)")
+    parser.add_argument('--poll-interval', type=float, default=60.0, help="seconds between play-by-play reloads")
+    parser.add_argument('--publish-interval', type=float, default=1.0)
+    parser.add_argument('--out', default=str(LIVE_PATH))
+    args = parser.parse_args()
+
+    if args.replay:
+        records = play_records(read_pbp(args.replay))
+        games = pd.DataFrame([plays[0] for plays in records.values()])
+        sources = [replay_game(records[g], args.speed) for g in games['game_id']]
+    else:
+        season = args.season or data_source.get_current_season()
+        week = args.week or data_source.get_current_week()
+        schedule = data_source.load_schedules(season)
+        games = schedule[(schedule['season'] == season) & (schedule['week'] == week)]
+        poller = PbpPoller(season, args.poll_interval)
+        sources = [poller.plays(g) for g in games['game_id']]
+
+    states = game_states(games, load_priors(args.priors))
+    start = time.perf_counter()
+    asyncio.run(run_slate(states, sources, args.out, args.publish_interval))
+    print(f"{len(states)} games, {sum(s.plays for s in states):,} plays "
+          f"in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Precomputed home win probability for every pair of teams.
+
+The model is a logistic regression on ``home - away`` EWMA diffs, so with
+the scaler folded in (``src/model_bundle.py``) each team reduces to one score
+``s = stats @ weights`` and
+
+    P(home beats away) = sigmoid(s[home] - s[away] + bias)
+
+for all 32 x 32 pairs is one outer difference. The matrix is rebuilt with the
+latest team stats after every weekly refresh and saved as a small JSON file,
+so what-if lookups are an index into an array with no model call.
+
+    python -m src.matchup_matrix    # rebuild from the feature store and bundle
+"""
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.feature_store import load_table
+from src.model_bundle import load_bundle
+
+MATRIX_PATH = Path('data/matchup_matrix.json')
+
+
+class MatchupMatrix:
+    """``probs[i, j]`` is the probability that ``teams[i]`` beats ``teams[j]`` at home."""
+
+    def __init__(self, teams, probs, metadata=None):
+        self.teams = list(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.metadata = dict(metadata or {})
+
+    def _indices(self, teams):
+        try:
+            return np.fromiter((self.team_index[t] for t in teams), dtype=np.intp, count=len(teams))
+        except KeyError as e:
+            raise KeyError(f"unknown team: {e.args[0]}") from None
+
+    def predict(self, home_team, away_team):
+        return float(self.probs[self._indices([home_team])[0], self._indices([away_team])[0]])
+
+    def predict_many(self, home_teams, away_teams):
+        """Home win probabilities for aligned sequences of home and away teams."""
+        return self.probs[self._indices(home_teams), self._indices(away_teams)]
+
+
+def build_matchup_matrix(most_recent_stats, bundle):
+    """All home-vs-away probabilities from the latest team stats."""
+    stat_cols = [f.removesuffix('_diff') for f in bundle.features]
+    scores = most_recent_stats[stat_cols].to_numpy(dtype=np.float64) @ bundle.weights
+    probs = 1. / (1. + np.exp(-(scores[:, None] - scores[None, :] + bundle.bias)))
+    np.fill_diagonal(probs, np.nan)
+
+    season = most_recent_stats['season'].max()
+    metadata = {
+        'model_hash': bundle.content_hash,
+        'season': int(season),
+        'week': int(most_recent_stats.loc[most_recent_stats['season'] == season, 'week'].max()),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    return MatchupMatrix(most_recent_stats['team'], probs, metadata)
+
+
+def save_matrix(matrix, path=MATRIX_PATH):
+    # Imported here: the matchups page loads this module but never saves.
+    from src.refresh import write_atomic
+
+    doc = {
+        **matrix.metadata,
+        'teams': matrix.teams,
+        # JSON has no NaN; the diagonal is stored as null.
+        'probs': [[None if np.isnan(p) else p for p in row] for row in matrix.probs.tolist()],
+    }
+    # Written then renamed, so the matchups page never reads a partial file.
+    text = json.dumps(doc) + '\n'
+    write_atomic(path, lambda tmp: tmp.write_text(text))
+
+
+def load_matrix(path=MATRIX_PATH):
+    doc = json.loads(Path(path).read_text())
+    probs = np.array(doc.pop('probs'), dtype=np.float64)
+    return MatchupMatrix(doc.pop('teams'), probs, doc)
+
+
+def write_matchup_matrix(most_recent_stats, bundle=None, path=MATRIX_PATH):
+    """Rebuild and save the matrix, e.g. after a weekly refresh or retraining."""
+    matrix = build_matchup_matrix(most_recent_stats, bundle or load_bundle())
+    save_matrix(matrix, path)
+    return matrix
+
+
+if __name__ == "__main__":
+    matrix = write_matchup_matrix(load_table('most_recent_stats'))
+    print(f"Wrote {MATRIX_PATH}: {len(matrix.teams)} teams, "
+          f"{matrix.metadata['season']} week {matrix.metadata['week']}")
@@ -0,0 +1,132 @@
+"""Single-file model bundle with the scaler folded into the coefficients.
+
+The notebook used to save ``finalized_model.pkl``, ``scaler.pkl`` and
+``feature_list.pkl`` separately, and each consumer unpickled sklearn objects
+and had to keep the column order in sync by hand. A bundle is one small JSON
+file holding:
+
+- ``features``: the exact column order the model expects;
+- ``weights`` and ``bias``: ``coef / scale`` and
+  ``intercept - weights @ mean``, so ``X @ weights + bias`` on raw ``*_diff``
+  values gives the same logit as ``scaler.transform`` + ``LogisticRegression``;
+- ``metadata``: how and on what the model was trained;
+- ``content_hash``: SHA-256 of the scoring content (format, features,
+  weights, bias), usable as a cache key or version id.
+
+JSON floats round-trip exactly and loading needs no sklearn import.
+
+Convert the existing pickles with:
+
+    python -m src.model_bundle
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+BUNDLE_FORMAT = 1
+BUNDLE_PATH = Path('models/model_bundle.json')
+
+
+class ModelBundle:
+    """Logistic regression on raw feature diffs with a fixed feature order."""
+
+    def __init__(self, features, weights, bias, metadata=None):
+        self.features = list(features)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.metadata = dict(metadata or {})
+        if self.weights.shape != (len(self.features),):
+            raise ValueError(f"expected {len(self.features)} weights, got {self.weights.shape}")
+
+    @property
+    def content_hash(self):
+        payload = json.dumps({
+            'format': BUNDLE_FORMAT,
+            'features': self.features,
+            'weights': self.weights.tolist(),
+            'bias': self.bias,
+        }, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def validate(self, frame):
+        """Return ``frame``'s feature columns as a float array in bundle order.
+
+        Raises ``ValueError`` if a feature is missing or non-numeric.
+        """
+        missing = [f for f in self.features if f not in frame.columns]
+        if missing:
+            raise ValueError(f"feature frame is missing columns: {missing}")
+        try:
+            return frame[self.features].to_numpy(dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"feature columns must be numeric: {e}") from e
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+
+    def predict_proba(self, frame):
+        """Home win probability for each row of a ``*_diff`` feature frame."""
+        return 1. / (1. + np.exp(-self.decision_function(self.validate(frame))))
+
+
+def fold_model(model, scaler, features, metadata=None):
+    """Build a bundle from a fitted ``StandardScaler`` + ``LogisticRegression``."""
+    weights = model.coef_[0] / scaler.scale_
+    bias = model.intercept_[0] - weights @ scaler.mean_
+
+    metadata = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'estimator': type(model).__name__,
+        'params': {k: v for k, v in model.get_params().items()
+                   if isinstance(v, (int, float, str, bool, type(None)))},
+        'n_train': int(scaler.n_samples_seen_),
+        **(metadata or {}),
+    }
+    return ModelBundle(features, weights, bias, metadata)
+
+
+def save_bundle(bundle, path=BUNDLE_PATH):
+    doc = {
+        'format': BUNDLE_FORMAT,
+        'content_hash': bundle.content_hash,
+        'features': bundle.features,
+        'weights': bundle.weights.tolist(),
+        'bias': bundle.bias,
+        'metadata': bundle.metadata,
+    }
+    Path(path).write_text(json.dumps(doc, indent=2) + '\n')
+
+
+def load_bundle(path=BUNDLE_PATH):
+    """Load a bundle, checking its format version and content hash."""
+    doc = json.loads(Path(path).read_text())
+    if doc.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"{path}: unsupported bundle format {doc.get('format')!r}")
+
+    bundle = ModelBundle(doc['features'], doc['weights'], doc['bias'], doc['metadata'])
+    if bundle.content_hash != doc['content_hash']:
+        raise ValueError(f"{path}: content hash mismatch, file is corrupt or was edited")
+    return bundle
+
+
+def convert_pickles(model_dir='models', path=BUNDLE_PATH):
+    """Write a bundle from the legacy ``finalized_model``/``scaler``/``feature_list`` pickles."""
+    import joblib
+
+    model_dir = Path(model_dir)
+    bundle = fold_model(
+        joblib.load(model_dir / 'finalized_model.pkl'),
+        joblib.load(model_dir / 'scaler.pkl'),
+        joblib.load(model_dir / 'feature_list.pkl'),
+        metadata={'source': 'converted from finalized_model.pkl, scaler.pkl, feature_list.pkl'},
+    )
+    save_bundle(bundle, path)
+    return bundle
+
+
+if __name__ == "__main__":
+    bundle = convert_pickles()
+    print(f"Wrote {BUNDLE_PATH} ({len(bundle.features)} features, {bundle.content_hash[:12]})")
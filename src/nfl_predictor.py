@@ -1,106 +1,84 @@
-import nflreadpy as nfl
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
-import pickle
-import joblib
-from datetime import datetime
-from sklearn.preprocessing import StandardScaler
-
-
-
-def get_nfl_diffs():
-    # 1. Load your cleaned stats and model
-    most_recent_stats = pd.read_csv('data/most_recent_stats.csv')
-    schedule = nfl.load_schedules(2025).to_pandas()
-    current_season = nfl.get_current_season()
-    current_week = nfl.get_current_week()
-
-    # 2. Identify current week/season
-
-    week_games = schedule[(schedule['week'] == current_week) & 
-                          (schedule['season'] == current_season)].copy()
-
-    # 3. Define the stats we want to compare (based on your columns)
-    keep_cols_old = [
-        'team', 
-        'passing_yards_ewma',
-        'passing_tds_ewma',
-        'rushing_yards_ewma',
-        'sacks_suffered_ewma',
-        'rushing_tds_ewma',
-        'completion_pct_ewma',
-        'turnovers_offense_ewma',
-        'turnovers_defense_ewma',
-        'turnover_margin_ewma',
-        'def_tackles_for_loss_ewma'
-    ]
-    keep_cols = [
-        'team',
-        'completion_pct_ewma',
-        'passing_tds_ewma',
-        'rushing_tds_ewma',
-        'turnover_margin_ewma',
-        'turnovers_offense_ewma',
-        'rushing_yards_ewma',
-        'sacks_suffered_ewma',
-        'turnovers_defense_ewma',
-        'passing_yards_ewma',
-        'def_tackles_for_loss_ewma']
-
-    # 4. Merge Home Team Stats
-    df_matchups = pd.merge(
-        week_games[['game_id', 'home_team', 'away_team']],
-        most_recent_stats[keep_cols],
-        left_on='home_team',
-        right_on='team',
-        how='left'
-    ).rename(columns={col: f"{col}_home" for col in keep_cols if col != 'team'})
-
-    # 5. Merge Away Team Stats
-    df_matchups = pd.merge(
-        df_matchups,
-        most_recent_stats[keep_cols],
-        left_on='away_team',
-        right_on='team',
-        how='left'
-    ).rename(columns={col: f"{col}_away" for col in keep_cols if col != 'team'})
-
-    # 6. Calculate Differences (Home - Away)
-    stat_names = [col.replace('_home', '') for col in df_matchups.columns if col.endswith('_home')]
-    
-    for stat in stat_names:
-        df_matchups[f"{stat}_diff"] = df_matchups[f"{stat}_home"] - df_matchups[f"{stat}_away"]
+import argparse
 
-    # 7. Final Cleanup: Keep only IDs and Diffs
-    diff_cols = [c for c in df_matchups.columns if c.endswith('_diff')]
-    final_df = df_matchups[['game_id', 'home_team', 'away_team'] + diff_cols].copy()
+from src import data_source
+from src.feature_store import load_table
+from src.featurizer import MatchupFeaturizer
+from src.instrumentation import run, stage
+from src.model_bundle import load_bundle
+
+
+def matchup_diffs(week_games, most_recent_stats, bundle):
+    """Home - away differences of the latest team stats, in ``bundle.features`` order."""
+    featurizer = MatchupFeaturizer.for_bundle(most_recent_stats, bundle)
+    with stage('diff', rows=len(week_games)):
+        return featurizer.frame(week_games)
+
+
+def plot_win_probs(final_df, ax):
+    """Horizontal bars of each game's home win probability on ``ax``."""
+    ax.barh(range(len(final_df)), final_df['win_prob'])
+    ax.set_yticks(range(len(final_df)), final_df['game_id'].to_list())
+    ax.set_xlabel("Home Win Prob")
+    ax.set_ylabel("This week's games")
 
-    #8. Run each game through the model.
 
-    model = joblib.load('models/finalized_model.pkl')
-    scaler = joblib.load('models/scaler.pkl')
+def get_nfl_diffs(plot_path='outputs/wild_card_probs', show=True):
+    """Score the current week's games; ``plot_path=None, show=False`` skips plotting."""
+    import polars as pl
 
-    model_cols = [c for c in final_df.columns if c.endswith("_diff")]
-    X_scaled = scaler.transform(final_df[model_cols])
+    # 1. Load the schedule (served from data/cache when fresh)
+    current_season = data_source.get_current_season()
+    current_week = data_source.get_current_week()
+    schedule = data_source.scan('schedules', current_season)
 
-    final_df['win_prob'] = model.predict_proba(X_scaled)[:,1]
-    final_df = final_df.sort_values(by='win_prob', ascending=False)
+    # 2. Identify current week/season (filtered in the scan, so only this
+    # week's rows are converted to pandas)
 
-    #9. Visualize results.
-    plt.figure(figsize=(10, 6))
-    plt.barh(range(len(final_df)), final_df['win_prob'])
-    plt.yticks(range(len(final_df)), final_df['game_id'].to_list())
-    plt.xlabel("Home Win Prob")
-    plt.ylabel("This week's games")
-    plt.savefig('outputs/wild_card_probs', dpi=300, bbox_inches='tight')
-    plt.show()
+    week_games = schedule.filter((pl.col('week') == current_week) &
+                                 (pl.col('season') == current_season)).collect().to_pandas()
+
+    # 3. The bundle lists its features in the order it was trained on; the
+    # featurizer builds exactly those columns. Scaling is folded into the
+    # bundle's weights, so there is no separate scale step.
+    with stage('model_load'):
+        bundle = load_bundle()
+
+    with stage('load_most_recent_stats') as span:
+        stat_cols = [f.removesuffix('_diff') for f in bundle.features]
+        most_recent_stats = load_table('most_recent_stats', columns=['team'] + stat_cols)
+        span.rows = len(most_recent_stats)
+
+    # 4.-7. Home - away stat differences for each game
+    final_df = matchup_diffs(week_games, most_recent_stats, bundle)
+
+    #8. Run each game through the model.
+    with stage('predict', rows=len(final_df)):
+        final_df['win_prob'] = bundle.predict_proba(final_df)
+        final_df = final_df.sort_values(by='win_prob', ascending=False)
+
+    #9. Visualize results (matplotlib is only imported when plotting).
+    if plot_path or show:
+        with stage('render', rows=len(final_df)):
+            import matplotlib.pyplot as plt
+
+            fig, ax = plt.subplots(figsize=(10, 6))
+            plot_win_probs(final_df, ax)
+            if plot_path:
+                fig.savefig(plot_path, dpi=300, bbox_inches='tight')
+        if show:
+            plt.show()
     
     return final_df
 
 if __name__ == "__main__":
-    result = get_nfl_diffs()
-    print("--- Upcoming NFL Game Stat Differences ---")
-    print(result)#.to_string(index=False))
-    result.to_csv('data/upcoming_diffs.csv')
-
+    parser = argparse.ArgumentParser(description="Score the current week's games.")
+    parser.add_argument('--plot', default='outputs/wild_card_probs', help="plot file ('' to skip)")
+    parser.add_argument('--no-show', action='store_true', help="don't open a plot window")
+    args = parser.parse_args()
+
+    with run('predict_week'):
+        result = get_nfl_diffs(args.plot or None, show=not args.no_show)
+        print("--- Upcoming NFL Game Stat Differences ---")
+        print(result)#.to_string(index=False))
+        with stage('write', rows=len(result)):
+            result.to_csv('data/upcoming_diffs.csv')
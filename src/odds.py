@@ -0,0 +1,217 @@
+"""Vectorized conversion of betting lines to implied probabilities.
+
+Every function takes scalars or arrays of any shape, so one call converts a
+season of closing lines or years of line history from many books and
+snapshots (e.g. a ``(games, books, snapshots, 2)`` array of two-way odds).
+
+Raw implied probabilities of a market's outcomes sum to more than one (the
+bookmaker's margin, or vig). ``remove_vig`` takes it out along the last axis:
+
+- ``proportional``: divide by the total (what the app has always shown);
+- ``power``: raise each raw probability to the power ``k`` that makes them
+  sum to one, which takes more vig from longshots;
+- ``shin``: Shin's model of a book facing a share ``z`` of insider money,
+  solved for ``z`` per market; also shades longshots.
+
+Spreads and totals are two-way markets too. With NFL final margins and
+totals roughly normal around the line, the de-vigged cover and over
+probabilities give the market's expected margin and total, and from them a
+spread-implied win probability and implied team scores.
+
+``implied_lines`` does all of this for a long table of lines (one row per
+game, book and snapshot), and ``consensus`` reduces the books' latest lines
+to one row per game.
+"""
+import numpy as np
+import pandas as pd
+
+VIG_METHODS = ('proportional', 'power', 'shin')
+
+# Standard deviations of NFL final margins and totals around the closing lines.
+MARGIN_SD = 13.45
+TOTAL_SD = 13.8
+
+# Newton steps for the power method (it converges monotonically, in under
+# ten steps for real odds) and bisection steps for Shin with more than two
+# outcomes (each halves the bracket; 60 are past float64 precision).
+_NEWTON_STEPS = 50
+_BISECT_STEPS = 60
+
+
+def moneyline_to_prob(ml):
+    """Convert American moneylines to raw implied probability (before vig removal).
+
+    Accepts a scalar or any array-like and works element-wise.
+    """
+    ml = np.asarray(ml, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(ml < 0, -ml / (-ml + 100), 100 / (ml + 100))
+
+
+def american_to_decimal(odds):
+    """American odds to decimal odds (total payout per unit staked)."""
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(odds < 0, 1 + 100 / -odds, 1 + odds / 100)
+
+
+def overround(raw):
+    """Total raw implied probability of each market (last axis) minus one."""
+    return np.asarray(raw, dtype=np.float64).sum(axis=-1) - 1
+
+
+def _power(raw):
+    # f(k) = sum(raw ** k) - 1 is convex and decreasing, so Newton steps
+    # converge: from k=1 they rise monotonically to the root when there is vig;
+    # underround markets (root k < 1) overshoot below the root once, then rise.
+    log_raw = np.log(raw)
+    k = np.ones(raw.shape[:-1])
+    for _ in range(_NEWTON_STEPS):
+        powered = raw ** k[..., None]
+        step = (powered.sum(axis=-1) - 1) / (powered * log_raw).sum(axis=-1)
+        k = k - step
+        if np.abs(step).max(initial=0) < 1e-14:
+            break
+    return raw ** k[..., None]
+
+
+def _shin(raw):
+    total = raw.sum(axis=-1, keepdims=True)
+    if raw.shape[-1] == 2:
+        # Two outcomes have a closed form: p = (1 + (raw_1^2 - raw_2^2) / total) / 2.
+        diff = (raw[..., :1] ** 2 - raw[..., 1:] ** 2) / total
+        return np.concatenate([(1 + diff) / 2, (1 - diff) / 2], axis=-1)
+
+    def probs(z):
+        z = z[..., None]
+        return (np.sqrt(z ** 2 + 4 * (1 - z) * raw ** 2 / total) - z) / (2 * (1 - z))
+
+    # At z=0 the probabilities sum to sqrt(total) > 1 and they fall as z grows.
+    lo = np.zeros(raw.shape[:-1])
+    hi = np.full(raw.shape[:-1], 0.999)
+    for _ in range(_BISECT_STEPS):
+        mid = (lo + hi) / 2
+        too_low = probs(mid).sum(axis=-1) > 1
+        lo = np.where(too_low, mid, lo)
+        hi = np.where(too_low, hi, mid)
+    return probs((lo + hi) / 2)
+
+
+def remove_vig(raw, method='proportional'):
+    """De-vigged probabilities of each market's outcomes (along the last axis).
+
+    ``raw`` holds raw implied probabilities (``moneyline_to_prob``). Markets
+    with any missing outcome come back as NaN; markets that sum to exactly
+    one are returned as they are by every method. Underround markets (stale
+    or boosted lines summing to less than one) are scaled up too: ``power``
+    solves for ``k < 1``, and ``shin``, whose insider share cannot be
+    negative, falls back to ``proportional``.
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    if method == 'proportional':
+        return raw / raw.sum(axis=-1, keepdims=True)
+    if method not in VIG_METHODS:
+        raise ValueError(f"unknown vig removal method {method!r}; expected one of {VIG_METHODS}")
+
+    total = raw.sum(axis=-1, keepdims=True)
+    finite = np.isfinite(raw).all(axis=-1, keepdims=True)
+    solve = finite & ((total != 1) if method == 'power' else (total > 1))
+    # Solve on clean inputs only; the rest are filled in below.
+    safe = np.where(solve, raw, 0.5)
+    probs = _power(safe) if method == 'power' else _shin(safe)
+    probs = np.where(solve, probs, raw / total)
+    return np.where(finite, probs, np.nan)
+
+
+def two_way(home_odds, away_odds, method='proportional'):
+    """``(home, away)`` de-vigged probabilities of a two-way market in American odds."""
+    raw = np.stack([moneyline_to_prob(home_odds), moneyline_to_prob(away_odds)], axis=-1)
+    probs = remove_vig(raw, method)
+    return probs[..., 0], probs[..., 1]
+
+
+def spread_implied(spread_line, home_spread_odds, away_spread_odds, method='proportional'):
+    """Home cover probability, expected home margin and home win probability.
+
+    ``spread_line`` follows nflverse: positive when the home team is favored,
+    and the home team covers when it wins by more than the line.
+    """
+    from scipy.special import ndtr, ndtri
+
+    spread_line = np.asarray(spread_line, dtype=np.float64)
+    cover, _ = two_way(home_spread_odds, away_spread_odds, method)
+    margin = spread_line + MARGIN_SD * ndtri(cover)
+    return cover, margin, ndtr(margin / MARGIN_SD)
+
+
+def total_implied(total_line, over_odds, under_odds, method='proportional'):
+    """Over probability and expected total points."""
+    from scipy.special import ndtri
+
+    total_line = np.asarray(total_line, dtype=np.float64)
+    over, _ = two_way(over_odds, under_odds, method)
+    return over, total_line + TOTAL_SD * ndtri(over)
+
+
+def add_vegas_implied(df, method='proportional'):
+    """Add vig-normalized Vegas implied probability columns to a dataframe."""
+    df = df.copy()
+    home, away = two_way(df["home_moneyline"], df["away_moneyline"], method)
+    df["away_implied"] = away
+    df["home_implied"] = home
+    return df
+
+
+def implied_lines(lines, method='proportional'):
+    """Implied probabilities for every row of a line table.
+
+    ``lines`` has any of the moneyline (``home_moneyline``/``away_moneyline``),
+    spread (``spread_line``, ``home_spread_odds``, ``away_spread_odds``) and
+    total (``total_line``, ``over_odds``, ``under_odds``) columns, with one
+    row per game, or per game, book and snapshot. Adds ``home_implied``,
+    ``away_implied``, ``home_cover``, ``spread_margin``, ``spread_home_win``,
+    ``over_prob``, ``implied_total`` and the implied team scores, for the
+    markets present.
+    """
+    df = lines.copy()
+    if {'home_moneyline', 'away_moneyline'} <= set(df):
+        df['home_implied'], df['away_implied'] = two_way(df['home_moneyline'], df['away_moneyline'], method)
+    if {'spread_line', 'home_spread_odds', 'away_spread_odds'} <= set(df):
+        df['home_cover'], df['spread_margin'], df['spread_home_win'] = spread_implied(
+            df['spread_line'], df['home_spread_odds'], df['away_spread_odds'], method)
+    if {'total_line', 'over_odds', 'under_odds'} <= set(df):
+        df['over_prob'], df['implied_total'] = total_implied(
+            df['total_line'], df['over_odds'], df['under_odds'], method)
+        if 'spread_margin' in df:
+            df['implied_home_score'] = (df['implied_total'] + df['spread_margin']) / 2
+            df['implied_away_score'] = (df['implied_total'] - df['spread_margin']) / 2
+    return df
+
+
+def latest_lines(lines, at=None, keys=('game_id', 'book'), time_col='snapshot'):
+    """Each game and book's last line, or its last one at or before ``at``."""
+    if at is not None:
+        lines = lines[lines[time_col] <= at]
+    lines = lines.sort_values([*keys, time_col], kind='stable')
+    return lines.drop_duplicates(list(keys), keep='last').reset_index(drop=True)
+
+
+def consensus(lines, method='proportional', how='median', at=None, time_col='snapshot'):
+    """One row per game: ``how`` across books of their latest implied lines.
+
+    ``lines`` is a long table with ``game_id``, ``book`` and ``time_col``
+    columns plus line columns (see ``implied_lines``). Probabilities are
+    de-vigged per book before they are combined.
+    """
+    implied = implied_lines(latest_lines(lines, at, time_col=time_col), method)
+    numeric = implied.drop(columns=['book', time_col]).select_dtypes('number').columns
+    result = implied.groupby('game_id', sort=False)[list(numeric)].agg(how)
+    result.insert(0, 'books', implied.groupby('game_id', sort=False)['book'].nunique())
+    return result.reset_index()
+
+
+def line_history(lines, value='home_implied', method='proportional', time_col='snapshot'):
+    """Wide ``(game_id, snapshot) x book`` table of one implied column, for charts
+    of line movement."""
+    implied = implied_lines(lines, method)
+    return pd.pivot_table(implied, index=['game_id', time_col], columns='book', values=value, aggfunc='last')
@@ -0,0 +1,507 @@
+"""The training notebook as a DAG of cached stages.
+
+Changing the logistic regression ``C``, the top-N feature cutoff or the
+chart meant re-running the notebook top to bottom: loads, derived features,
+EWMA, merges and feature selection included. Here each step is a ``Stage``
+and its output is cached under ``data/cache/pipeline/<stage>/<key>.pkl``,
+where the key is a SHA-256 of
+
+- the stage's code: the source of its function and of the ``src`` modules
+  it relies on;
+- its parameters;
+- the digests of its inputs' outputs (a hash of their contents).
+
+A run walks the stages in order and recomputes only those whose key has no
+cache entry. Keys use the inputs' content digests rather than their keys,
+so a stage that recomputes to the same output leaves everything downstream
+cached. The raw loads are sources: they always run (through
+``data_source``, cache first) and are hashed, never stored, so new games
+invalidate exactly the stages that read them.
+
+Stages (``nfl_pipeline``)::
+
+    schedule -> games --------------.
+    team_stats -> derived -> ewma -> games_with_stats -> selection -> scale -> fit
+    week_games -----------------------------------------------------------------> predict -> render
+                                ewma, fit ----------------------------------------^
+
+With ``player_features=True``, ``player_files -> player_features`` also
+feeds ``derived``, adding ``src.player_stats.PLAYER_VARIABLES`` to the EWMA
+variables. ``player_files`` is a source of file sizes and modification
+times, so the streamed aggregation only reruns when a file changes.
+
+``games_with_stats`` is the home/away merge and the diffs (one
+``MatchupFeaturizer`` gather), ``selection`` ranks every diff feature and
+``scale`` keeps the top ``top_n``, so a new cutoff skips the ranking.
+
+Entries not used by the current run are evicted, least recently used
+first, once the cache is over its disk budget. ``--dry-run`` prints what a
+run would do; it runs the sources, since whether anything downstream is
+stale depends on the data they return. A stage after one that would run is
+listed as running, although it stays cached if that stage's output comes
+out unchanged.
+
+Run from the repo root:
+
+    python -m src.pipeline                        # train, score this week, write outputs/pipeline/
+    python -m src.pipeline --C 0.5 --dry-run      # only fit, predict and render would run
+    python -m src.pipeline --top-n 8 --selector mutual_info --save-bundle models/candidate.json
+    python -m src.pipeline --player-features      # add team features from weekly player stats
+    python -m src.pipeline --evict --budget-mb 100
+"""
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import data_source, feature_engine, feature_selection, featurizer, model_bundle, player_stats
+from src.feature_engine import EWMA_ALPHA, INDEPENDENT_VARIABLES
+from src.feature_selection import DEFAULT_SELECTOR
+from src.instrumentation import run, stage
+from src.nfl_predictor import matchup_diffs, plot_win_probs
+from src.refresh import build_predictions, write_atomic
+
+CACHE_DIR = Path('data/cache/pipeline')
+BUDGET_BYTES = 512 * 2**20
+LATEST_FILE = 'latest.json'
+
+
+def digest(value):
+    """SHA-256 of a stage output's contents."""
+    h = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        h.update(json.dumps([[str(c), str(t)] for c, t in frame.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(f'{value.dtype}{value.shape}'.encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            h.update(digest(item).encode())
+    elif isinstance(value, model_bundle.ModelBundle):
+        h.update(value.content_hash.encode())
+    else:
+        h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return h.hexdigest()
+
+
+def source_hash(objects):
+    """SHA-256 of the source code of functions and modules."""
+    h = hashlib.sha256()
+    for obj in objects:
+        h.update(inspect.getsource(obj).encode())
+    return h.hexdigest()
+
+
+class Stage:
+    """One step: ``fn(**inputs, **params)``, where ``inputs`` name earlier stages.
+
+    ``code`` lists the modules or functions besides ``fn`` whose source is
+    part of the cache key. Stages with ``cache=False`` are sources: they
+    run every time and their output is only hashed.
+    """
+
+    def __init__(self, name, fn, inputs=(), params=None, code=(), cache=True):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.code = source_hash((fn, *code))
+        self.cache = cache
+
+    def parts(self, input_digests):
+        return {
+            'code': self.code,
+            'params': json.loads(json.dumps(self.params, sort_keys=True, default=str)),
+            'inputs': {name: input_digests[name] for name in self.inputs},
+        }
+
+    def key(self, parts):
+        payload = json.dumps({'stage': self.name, **parts}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def changes(previous, parts):
+    """Why a stage's key differs from its last run's: ``'params: C'``, ``'code'``, ..."""
+    if previous is None:
+        return 'not run before'
+    reasons = []
+    if previous['code'] != parts['code']:
+        reasons.append('code')
+    params = sorted(k for k in {*previous['params'], *parts['params']}
+                    if previous['params'].get(k) != parts['params'].get(k))
+    if params:
+        reasons.append('params: ' + ', '.join(params))
+    inputs = [k for k in parts['inputs'] if previous['inputs'].get(k) != parts['inputs'][k]]
+    if inputs:
+        reasons.append('input: ' + ', '.join(inputs))
+    return '; '.join(reasons) or 'evicted'
+
+
+class Pipeline:
+    """Stages (in dependency order) over a content-addressed cache directory."""
+
+    def __init__(self, stages, cache_dir=CACHE_DIR, budget_bytes=BUDGET_BYTES):
+        self.stages = {s.name: s for s in stages}
+        self.cache_dir = Path(cache_dir)
+        self.budget_bytes = budget_bytes
+
+    def _path(self, name, key, suffix):
+        return self.cache_dir / name / f'{key}{suffix}'
+
+    def _meta(self, name, key):
+        path = self._path(name, key, '.json')
+        if not (path.exists() and self._path(name, key, '.pkl').exists()):
+            return None
+        os.utime(path)  # last used, for eviction
+        return json.loads(path.read_text())
+
+    def _store(self, name, key, value, seconds):
+        path = self._path(name, key, '.pkl')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, lambda tmp: tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        meta = {'digest': digest(value), 'seconds': seconds, 'bytes': path.stat().st_size}
+        # The metadata goes last and marks the entry complete.
+        write_atomic(self._path(name, key, '.json'), lambda tmp: tmp.write_text(json.dumps(meta) + '\n'))
+        return meta
+
+    def _latest(self):
+        path = self.cache_dir / LATEST_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def needed(self, targets=None):
+        """Names of ``targets`` (default: every stage) and all their inputs, in order."""
+        wanted = set(targets or self.stages)
+        for name in reversed(list(self.stages)):
+            if name in wanted:
+                wanted.update(self.stages[name].inputs)
+        return [name for name in self.stages if name in wanted]
+
+    def run(self, targets=None, dry_run=False):
+        """Bring ``targets`` up to date; returns ``(outputs, report)``.
+
+        ``outputs`` maps each target to its value (``None`` in a dry run)
+        and ``report`` has one row per stage with its ``status``
+        (``source``, ``cached``, ``run`` or, in a dry run, ``would run``),
+        the reason it ran, seconds spent and cache entry size.
+        """
+        order = self.needed(targets)
+        latest = self._latest()
+        values, keys, digests, rows = {}, {}, {}, []
+
+        def load(name):
+            if name not in values:
+                path = self._path(name, keys[name], '.pkl')
+                values[name] = pickle.loads(path.read_bytes())
+            return values[name]
+
+        for name in order:
+            s = self.stages[name]
+            row = {'stage': name, 'status': 'run', 'reason': '', 'seconds': 0., 'bytes': None}
+            rows.append(row)
+
+            if any(digests[i] is None for i in s.inputs):
+                # Only in a dry run: an input would be recomputed, so its digest is unknown.
+                row.update(status='would run', reason='after ' + ', '.join(i for i in s.inputs if digests[i] is None))
+                digests[name] = None
+                continue
+
+            if not s.cache:
+                start = time.perf_counter()
+                with stage(name):
+                    values[name] = s.fn(**{i: load(i) for i in s.inputs}, **s.params)
+                digests[name] = digest(values[name])
+                row.update(status='source', seconds=time.perf_counter() - start)
+                continue
+
+            parts = s.parts(digests)
+            keys[name] = key = s.key(parts)
+            meta = self._meta(name, key)
+            if meta is not None:
+                digests[name] = meta['digest']
+                row.update(status='cached', bytes=meta['bytes'])
+            elif dry_run:
+                digests[name] = None
+                row.update(status='would run', reason=changes(latest.get(name), parts))
+            else:
+                row['reason'] = changes(latest.get(name), parts)
+                start = time.perf_counter()
+                with stage(name):
+                    values[name] = s.fn(**{i: load(i) for i in s.inputs}, **s.params)
+                row['seconds'] = time.perf_counter() - start
+                meta = self._store(name, key, values[name], row['seconds'])
+                digests[name] = meta['digest']
+                row['bytes'] = meta['bytes']
+            latest[name] = parts
+
+        report = pd.DataFrame(rows)
+        if dry_run:
+            return {name: None for name in targets or order}, report
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.cache_dir / LATEST_FILE, lambda tmp: tmp.write_text(json.dumps(latest, indent=2) + '\n'))
+        if self.budget_bytes is not None:
+            self.evict(self.budget_bytes, keep=set(keys.values()))
+        return {name: load(name) for name in targets or order}, report
+
+    def entries(self):
+        """Every cache entry, least recently used first."""
+        rows = []
+        for path in self.cache_dir.glob('*/*.pkl'):
+            meta = path.with_suffix('.json')
+            used = meta.stat().st_mtime if meta.exists() else path.stat().st_mtime
+            size = path.stat().st_size + (meta.stat().st_size if meta.exists() else 0)
+            rows.append({'stage': path.parent.name, 'key': path.stem, 'bytes': size, 'last_used': used})
+        return pd.DataFrame(rows, columns=['stage', 'key', 'bytes', 'last_used']).sort_values('last_used')
+
+    def evict(self, budget_bytes=None, keep=()):
+        """Delete least recently used entries, except ``keep`` keys, until the
+        cache fits in ``budget_bytes``. Returns the evicted entries."""
+        budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+        entries = self.entries()
+        over = entries['bytes'].sum() - budget_bytes
+        evicted = []
+        for entry in entries.itertuples():
+            if over <= 0:
+                break
+            if entry.key in keep:
+                continue
+            for suffix in ('.json', '.pkl'):
+                self._path(entry.stage, entry.key, suffix).unlink(missing_ok=True)
+            over -= entry.bytes
+            evicted.append(entry._asdict())
+        return pd.DataFrame(evicted, columns=entries.columns)
+
+
+# The notebook's steps as stage functions.
+
+def load_schedule(seasons):
+    return data_source.load_schedules(seasons)
+
+
+def load_team_stats(seasons):
+    return data_source.load_team_stats(seasons)
+
+
+def load_week_games(season, week):
+    schedule = data_source.load_schedules(season)
+    week_games = schedule[(schedule['season'] == season) & (schedule['week'] == week)]
+    return week_games.reset_index(drop=True)
+
+
+def player_files(seasons):
+    """``(path, size, mtime_ns)`` of each season's player stats file, standing in for its contents."""
+    files = []
+    for season in seasons:
+        path = data_source.season_file('player_stats', season)
+        stat = path.stat()
+        files.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return files
+
+
+def player_team_features(player_files, lookback):
+    frames = [player_stats.season_features(path, lookback=lookback)[0] for path, _, _ in player_files]
+    return pd.concat(frames, ignore_index=True)
+
+
+def games(schedule):
+    return feature_engine.completed_games(schedule)
+
+
+def derived(team_stats, player_features=None):
+    team_stats = feature_engine.add_derived_features(team_stats)
+    if player_features is not None:
+        team_stats = player_stats.add_player_features(team_stats, player_features)
+    return team_stats
+
+
+def ewma(derived, variables, alpha):
+    """``(df_clean, state)``."""
+    return feature_engine.build_team_features(derived, variables, alpha)
+
+
+def games_with_stats(games, ewma):
+    """Home/away merge and diffs, with missing kicking percentages as 0 like the notebook."""
+    df_clean, _ = ewma
+    variables = [c.removesuffix('_ewma') for c in df_clean.columns if c.endswith('_ewma')]
+    merged = feature_engine.build_games_with_stats(games, df_clean, variables)
+    return merged.fillna({'pat_pct_ewma_diff': 0, 'fg_pct_ewma_diff': 0})
+
+
+def _split(games_with_stats, test_season):
+    train = games_with_stats[games_with_stats['season'] < test_season]
+    test = games_with_stats[games_with_stats['season'] == test_season]
+    return train, test
+
+
+def selection(games_with_stats, selector, test_season):
+    """Every diff feature ranked on the training seasons."""
+    train, _ = _split(games_with_stats, test_season)
+    features = [c for c in games_with_stats.columns if c.endswith('_ewma_diff')]
+    return feature_selection.rank_features(train[features], train['home_win'], selector=selector, cache_dir=None)
+
+
+def scale(games_with_stats, selection, top_n, test_season):
+    """``(feature_list, scaler)`` for the top ``top_n`` features."""
+    from sklearn.preprocessing import StandardScaler
+
+    feature_list = selection.head(top_n)['feature'].to_list()
+    train, _ = _split(games_with_stats, test_season)
+    return feature_list, StandardScaler().fit(train[feature_list])
+
+
+def fit(games_with_stats, scale, C, test_season, metadata):
+    """The notebook's logistic regression, folded into a ``ModelBundle``."""
+    from sklearn.linear_model import LogisticRegression
+
+    feature_list, scaler = scale
+    train, test = _split(games_with_stats, test_season)
+    X_train = scaler.transform(train[feature_list])
+    model = LogisticRegression(random_state=41, max_iter=1000, C=C).fit(X_train, train['home_win'])
+
+    metadata = {
+        'train_seasons': sorted(int(s) for s in train['season'].unique()),
+        'test_seasons': sorted(int(s) for s in test['season'].unique()),
+        'train_accuracy': float(model.score(X_train, train['home_win'])),
+        **metadata,
+    }
+    if len(test):
+        metadata['test_accuracy'] = float(model.score(scaler.transform(test[feature_list]), test['home_win']))
+    return model_bundle.fold_model(model, scaler, feature_list, metadata)
+
+
+def predict(week_games, ewma, fit):
+    """This week's ``latest_predictions.csv`` table from each team's latest stats."""
+    _, state = ewma
+    variables = [c.removesuffix('_ewma') for c in state.columns if c.endswith('_ewma')]
+    return build_predictions(week_games, feature_engine.latest_team_stats(state, variables), fit)
+
+
+def render(predict, title, dpi):
+    """PNG bytes of the week's win probability chart."""
+    from matplotlib.figure import Figure
+
+    predictions = predict.rename(columns={'home_win_prob': 'win_prob'})
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    plot_win_probs(predictions.sort_values('win_prob', ascending=False), ax)
+    ax.set_title(title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def nfl_pipeline(seasons, season, week, test_season=None, variables=INDEPENDENT_VARIABLES,
+                 alpha=EWMA_ALPHA, selector=DEFAULT_SELECTOR, top_n=10, C=1.0, dpi=150,
+                 player_features=False, lookback=player_stats.LOOKBACK,
+                 cache_dir=CACHE_DIR, budget_bytes=BUDGET_BYTES):
+    """Train on ``seasons`` before ``test_season`` (default: the last one) and
+    score ``week`` of ``season``."""
+    seasons = sorted(seasons)
+    test_season = seasons[-1] if test_season is None else test_season
+    variables = list(variables)
+    player_stages = []
+    if player_features:
+        variables += player_stats.PLAYER_VARIABLES
+        player_stages = [
+            Stage('player_files', player_files, params={'seasons': seasons}, code=[data_source], cache=False),
+            Stage('player_features', player_team_features, ['player_files'], {'lookback': lookback},
+                  code=[player_stats]),
+        ]
+    return Pipeline([
+        Stage('schedule', load_schedule, params={'seasons': seasons}, code=[data_source], cache=False),
+        Stage('team_stats', load_team_stats, params={'seasons': seasons}, code=[data_source], cache=False),
+        Stage('week_games', load_week_games, params={'season': season, 'week': week},
+              code=[data_source], cache=False),
+        *player_stages,
+        Stage('games', games, ['schedule'], code=[feature_engine]),
+        Stage('derived', derived, ['team_stats', 'player_features'] if player_features else ['team_stats'],
+              code=[feature_engine, player_stats]),
+        Stage('ewma', ewma, ['derived'], {'variables': variables, 'alpha': alpha}, code=[feature_engine]),
+        Stage('games_with_stats', games_with_stats, ['games', 'ewma'], code=[feature_engine, featurizer]),
+        Stage('selection', selection, ['games_with_stats'], {'selector': selector, 'test_season': test_season},
+              code=[_split, feature_selection]),
+        Stage('scale', scale, ['games_with_stats', 'selection'], {'top_n': top_n, 'test_season': test_season},
+              code=[_split]),
+        Stage('fit', fit, ['games_with_stats', 'scale'],
+              {'C': C, 'test_season': test_season,
+               'metadata': {'ewma_alpha': alpha, 'feature_selector': selector}},
+              code=[_split, model_bundle]),
+        Stage('predict', predict, ['week_games', 'ewma', 'fit'],
+              code=[build_predictions, matchup_diffs, feature_engine.latest_team_stats, featurizer]),
+        Stage('render', render, ['predict'], {'title': f'NFL Predictions - Week {week}, {season}', 'dpi': dpi},
+              code=[plot_win_probs]),
+    ], cache_dir, budget_bytes)
+
+
+def format_report(report):
+    lines = [f"{'stage':<18} {'status':<10} {'seconds':>8} {'size':>9}  reason"]
+    for row in report.itertuples():
+        size = '' if pd.isna(row.bytes) else f'{row.bytes / 2**20:.1f}MB'
+        seconds = f'{row.seconds:.2f}' if row.seconds else ''
+        lines.append(f"{row.stage:<18} {row.status:<10} {seconds:>8} {size:>9}  {row.reason}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the training pipeline, recomputing only stale stages.")
+    parser.add_argument('--start', type=int, default=2021, help="first training season")
+    parser.add_argument('--end', type=int, help="last season, used for testing (default: current)")
+    parser.add_argument('--test-season', type=int, help="held-out season (default: --end)")
+    parser.add_argument('--season', type=int, help="season to score (default: current)")
+    parser.add_argument('--week', type=int, help="week to score (default: current)")
+    parser.add_argument('--alpha', type=float, default=EWMA_ALPHA)
+    parser.add_argument('--selector', default=DEFAULT_SELECTOR, choices=sorted(feature_selection.SELECTORS))
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--C', type=float, default=1.0, help="inverse regularization strength")
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--player-features', action='store_true',
+                        help="add src.player_stats team features from weekly player stats")
+    parser.add_argument('--dry-run', action='store_true', help="show what would be recomputed")
+    parser.add_argument('--evict', action='store_true', help="only evict entries down to the budget")
+    parser.add_argument('--budget-mb', type=float, default=BUDGET_BYTES / 2**20, help="cache disk budget")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR))
+    parser.add_argument('--out-dir', default='outputs/pipeline', help="predictions.csv and predictions.png")
+    parser.add_argument('--save-bundle', metavar='PATH', help="also save the fitted model bundle")
+    args = parser.parse_args()
+
+    season = args.season or data_source.get_current_season()
+    end = args.end or data_source.get_current_season()
+    pipeline = nfl_pipeline(range(args.start, end + 1), season, args.week or data_source.get_current_week(),
+                            args.test_season, alpha=args.alpha, selector=args.selector, top_n=args.top_n,
+                            C=args.C, dpi=args.dpi, player_features=args.player_features,
+                            cache_dir=args.cache_dir,
+                            budget_bytes=int(args.budget_mb * 2**20))
+
+    if args.evict:
+        evicted = pipeline.evict()
+        print(f"Evicted {len(evicted)} entries ({evicted['bytes'].sum() / 2**20:.1f}MB)")
+        return
+
+    with run('pipeline'):
+        outputs, report = pipeline.run(['fit', 'predict', 'render'], dry_run=args.dry_run)
+    print(format_report(report))
+    if args.dry_run:
+        return
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    outputs['predict'].to_csv(out_dir / 'predictions.csv', index=False)
+    (out_dir / 'predictions.png').write_bytes(outputs['render'])
+    if args.save_bundle:
+        model_bundle.save_bundle(outputs['fit'], args.save_bundle)
+    print(f"{len(outputs['predict'])} games -> {out_dir}; model {outputs['fit'].content_hash[:12]} "
+          f"({report['seconds'].sum():.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
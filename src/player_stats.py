@@ -0,0 +1,249 @@
+"""Chunked ingestion of weekly player stats into team-week features.
+
+The model only used ``load_team_stats``. Weekly player stats have about 50
+rows per team-week and over 100 columns, so a multi-season backfill of them
+should not be loaded as one pandas frame. ``build_player_features`` reads
+each season's file (``data_source.season_file``) in batches of
+``chunk_rows`` rows, keeping only ``READ_COLUMNS``, and reduces every batch
+to two small partial results:
+
+- starters: per team-week, the QB with the most dropbacks (attempts plus
+  sacks) in the batch, with their passing totals;
+- usage: one slim row per player-week, the plays the player was involved in
+  (dropbacks, carries and targets).
+
+Both combine exactly across batches (a player-week is one row, and the
+starter of the combined partials is the starter overall), so the result does
+not depend on ``chunk_rows``. At the end of each season they become one row
+per team-week of ``PLAYER_VARIABLES``:
+
+- ``qb_epa_per_play``: the starting QB's passing EPA per dropback;
+- ``qb_cpoe``: the starter's completion percentage over expected;
+- ``qb_any_a``: the starter's adjusted net yards per attempt,
+  (yards + 20 TD - 45 INT - sack yards) / dropbacks;
+- ``usage_out``: an injuries-out proxy, the share of the team's plays that
+  went to players who played in any of its last ``LOOKBACK`` games but have
+  no row this week, each weighted by their average share of those games
+  (usage stands in for snaps, which player stats do not have).
+
+``add_player_features`` merges them onto raw team stats, and from there
+they take the same EWMA and diff path as ``INDEPENDENT_VARIABLES``:
+
+    team_stats = add_player_features(team_stats, build_player_features(seasons))
+    variables = INDEPENDENT_VARIABLES + PLAYER_VARIABLES
+    df_clean, state = build_team_features(add_derived_features(team_stats), variables)
+
+Peak memory is one batch of ``READ_COLUMNS`` plus one season of slim usage
+rows, whatever the number of seasons; Parquet is decoded a row group at a
+time, so files with row groups larger than ``chunk_rows`` hold one decoded
+row group of the read columns instead. On synthetic seasons of 64 teams
+(about 55,000 player-weeks and 60 columns each; one core), from
+``python -m benchmarks.bench_player_stats``:
+
+    seasons   eager peak RSS   chunked peak RSS   chunked rows/s
+    5         330 MB           50 MB              ~550k
+    20        1,150 MB         50 MB              ~500k
+
+Loading every season eagerly grows with the seasons and runs at ~400k
+rows/s; the default 65,536-row chunks stay near 50 MB (25 MB with
+8,192-row chunks, at ~320k rows/s).
+
+Run from the repo root:
+
+    python -m src.player_stats --start 2021 --end 2025 --out data/player_features.parquet
+    python -m src.weekly_update --rebuild --player-features
+    python -m src.pipeline --player-features
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import data_source
+from src.instrumentation import run, stage
+
+KEYS = ['season', 'week', 'team']
+PLAYER_VARIABLES = ['qb_epa_per_play', 'qb_cpoe', 'qb_any_a', 'usage_out']
+
+PASSING_COLUMNS = [
+    'attempts', 'sacks_suffered', 'passing_yards', 'passing_tds',
+    'passing_interceptions', 'sack_yards_lost', 'passing_epa', 'passing_cpoe',
+]
+READ_COLUMNS = ['player_id', 'position'] + KEYS + PASSING_COLUMNS + ['carries', 'targets']
+
+# Names used by older nflverse player stats files.
+COLUMN_ALIASES = {
+    'recent_team': 'team',
+    'interceptions': 'passing_interceptions',
+    'sacks': 'sacks_suffered',
+    'sack_yards': 'sack_yards_lost',
+}
+
+CHUNK_ROWS = 65_536
+LOOKBACK = 3
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """``READ_COLUMNS`` of a Parquet or CSV player stats file, ``chunk_rows`` rows at a time."""
+    path = Path(path)
+    wanted = set(READ_COLUMNS) | set(COLUMN_ALIASES)
+    if path.suffix == '.csv':
+        chunks = pd.read_csv(path, usecols=lambda c: c in wanted, chunksize=chunk_rows)
+    else:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        columns = [c for c in parquet.schema_arrow.names if c in wanted]
+        chunks = (batch.to_pandas() for batch in parquet.iter_batches(chunk_rows, columns=columns))
+    for chunk in chunks:
+        yield chunk.rename(columns=COLUMN_ALIASES).reindex(columns=READ_COLUMNS)
+
+
+def starters(qbs):
+    """The QB with the most dropbacks per team-week (ties go to the larger ``player_id``)."""
+    qbs = qbs.sort_values(KEYS + ['dropbacks', 'player_id'], kind='stable')
+    return qbs.drop_duplicates(KEYS, keep='last')
+
+
+def reduce_chunk(chunk):
+    """``(starters, usage)`` partials of one chunk of player-week rows."""
+    plays = chunk[['attempts', 'sacks_suffered', 'carries', 'targets']].fillna(0).to_numpy()
+    dropbacks = plays[:, 0] + plays[:, 1]
+    usage = plays.sum(axis=1)
+
+    is_qb = (chunk['position'] == 'QB').to_numpy() & (dropbacks > 0)
+    qbs = chunk.loc[is_qb, KEYS + ['player_id'] + PASSING_COLUMNS].assign(dropbacks=dropbacks[is_qb])
+    involved = usage > 0
+    usage = chunk.loc[involved, KEYS + ['player_id']].assign(usage=usage[involved].astype(np.float32))
+    return starters(qbs), usage
+
+
+def qb_features(starters):
+    """Starting-QB efficiency per team-week."""
+    dropbacks = starters['dropbacks']
+    any_yards = (starters['passing_yards'] + 20 * starters['passing_tds']
+                 - 45 * starters['passing_interceptions'] - starters['sack_yards_lost'].fillna(0))
+    return pd.DataFrame({
+        **{key: starters[key] for key in KEYS},
+        'qb_epa_per_play': starters['passing_epa'] / dropbacks,
+        'qb_cpoe': starters['passing_cpoe'],
+        'qb_any_a': any_yards / dropbacks,
+    })
+
+
+def usage_out(usage, lookback=LOOKBACK):
+    """``usage_out`` per team-week, from player-week usage rows.
+
+    Games are counted per team, so bye weeks do not shorten the lookback.
+    A traded player counts as out for the old team, which did lose the player.
+    """
+    usage = usage.assign(share=usage['usage'] / usage.groupby(KEYS)['usage'].transform('sum'))
+
+    team_weeks = usage[KEYS].drop_duplicates().sort_values(['season', 'team', 'week'], kind='stable')
+    games = team_weeks.groupby(['season', 'team'], sort=False)
+    team_weeks = team_weeks.assign(group=games.ngroup(), game=games.cumcount()).reset_index(drop=True)
+    n_games = games.size().to_numpy()
+
+    usage = usage.merge(team_weeks, on=KEYS)
+    player = usage.groupby(['season', 'team', 'player_id'], sort=False).ngroup().to_numpy()
+    n_players, max_games = player.max() + 1, int(n_games.max())
+    player_group = np.empty(n_players, dtype=np.intp)
+    player_group[player] = usage['group'].to_numpy()
+
+    # (player, game) shares, and the sums over the previous `lookback` games
+    # as differences of cumulative sums.
+    share = np.zeros((n_players, max_games))
+    present = np.zeros((n_players, max_games), dtype=bool)
+    share[player, usage['game'].to_numpy()] = usage['share'].to_numpy()
+    present[player, usage['game'].to_numpy()] = True
+    game = np.arange(max_games)
+    start = np.maximum(game - lookback, 0)
+    share_sums = np.hstack([np.zeros((n_players, 1)), share.cumsum(axis=1)])
+    game_counts = np.hstack([np.zeros((n_players, 1)), present.cumsum(axis=1)])
+    recent_share = share_sums[:, game] - share_sums[:, start]
+    recent_games = game_counts[:, game] - game_counts[:, start]
+
+    out = (recent_games > 0) & ~present & (game < n_games[player_group][:, None])
+    missing = np.where(out, recent_share / np.maximum(recent_games, 1), 0.)
+    totals = np.zeros((len(n_games), max_games))
+    np.add.at(totals, player_group, missing)
+
+    team_weeks['usage_out'] = totals[team_weeks['group'].to_numpy(), team_weeks['game'].to_numpy()]
+    return team_weeks[KEYS + ['usage_out']]
+
+
+def season_features(path, chunk_rows=CHUNK_ROWS, lookback=LOOKBACK):
+    """``(features, rows)``: one season file's team-week ``PLAYER_VARIABLES`` and
+    the number of player-week rows read."""
+    starter_parts, usage_parts, rows = [], [], 0
+    for chunk in iter_chunks(path, chunk_rows):
+        with stage('reduce_chunk', rows=len(chunk)):
+            chunk_starters, chunk_usage = reduce_chunk(chunk)
+        starter_parts.append(chunk_starters)
+        usage_parts.append(chunk_usage)
+        rows += len(chunk)
+        del chunk
+
+    with stage('team_week_features', rows=rows):
+        qbs = qb_features(starters(pd.concat(starter_parts, ignore_index=True)))
+        features = usage_out(pd.concat(usage_parts, ignore_index=True), lookback)
+        features = features.merge(qbs, on=KEYS, how='left')
+    return features[KEYS + PLAYER_VARIABLES], rows
+
+
+def build_player_features(seasons, chunk_rows=CHUNK_ROWS, lookback=LOOKBACK):
+    """Team-week ``PLAYER_VARIABLES`` for ``seasons``, streamed one season at a time."""
+    seasons = [seasons] if isinstance(seasons, int) else list(seasons)
+    frames = []
+    for season in seasons:
+        with stage('player_features') as span:
+            features, span.rows = season_features(data_source.season_file('player_stats', season),
+                                                  chunk_rows, lookback)
+        frames.append(features)
+    return pd.concat(frames, ignore_index=True)
+
+
+def add_player_features(team_stats, player_features):
+    """Left-join ``PLAYER_VARIABLES`` onto team stats rows (NaN where missing)."""
+    columns = [c for c in PLAYER_VARIABLES if c in player_features]
+    team_stats = team_stats.drop(columns=[c for c in columns if c in team_stats])
+    return team_stats.merge(player_features[KEYS + columns], on=KEYS, how='left')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate weekly player stats into team-week features.")
+    parser.add_argument('--start', type=int, default=2021)
+    parser.add_argument('--end', type=int, help="last season (default: current)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--lookback', type=int, default=LOOKBACK, help="games behind for usage_out")
+    parser.add_argument('--out', default='data/player_features.parquet')
+    args = parser.parse_args()
+
+    import resource
+
+    seasons = range(args.start, (args.end or data_source.get_current_season()) + 1)
+    frames, total_rows = [], 0
+    start = time.perf_counter()
+    with run('player_stats'):
+        for season in seasons:
+            season_start = time.perf_counter()
+            features, rows = season_features(data_source.season_file('player_stats', season),
+                                             args.chunk_rows, args.lookback)
+            frames.append(features)
+            total_rows += rows
+            print(f"{season}: {rows:,} player-weeks -> {len(features):,} team-weeks "
+                  f"({time.perf_counter() - season_start:.2f}s)")
+    wall = time.perf_counter() - start
+
+    player_features = pd.concat(frames, ignore_index=True)
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    player_features.to_parquet(args.out, index=False)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{total_rows:,} player-weeks in {wall:.1f}s ({total_rows / wall:,.0f} rows/s), "
+          f"peak RSS {peak_mb:.0f} MB -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
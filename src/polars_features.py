@@ -0,0 +1,189 @@
+"""Lazy Polars build of the team and game feature tables.
+
+``data_source`` loaders convert each season's Polars frame to pandas right
+away, so the filters, derived columns, EWMA and home/away merges of
+``feature_engine`` all run eagerly in pandas. This module builds the same
+tables as one lazy Polars query over the cached Parquet files
+(``data_source.scan``):
+
+- ``completed_games``' ``game_type`` and score filters, and the column
+  selection, are pushed down into the Parquet scans;
+- the derived turnover and completion columns are expressions;
+- the per-(team, season) EWMA is ``ewm_mean(adjust=False)`` over a window,
+  carried forward through missing values as ``compute_ewma`` does;
+- home and away stats are two joins on (season, week, team).
+
+``build_features`` collects ``df_clean``, then ``games_with_stats`` and
+``most_recent_stats`` from it together (``collect_all``), all on Polars'
+thread pool. The tables stay Polars frames;
+``training_data`` filters the train/test seasons and hands NumPy arrays to
+the model, and ``.to_pandas()`` gives ``feature_engine``'s layout.
+
+The EWMA differs from ``compute_ewma`` by float rounding only (last-digit
+differences, under 1e-13 on yardage); every other column is identical.
+From files to the three tables, on synthetic leagues (one core, so Polars
+runs single-threaded; ``python -m benchmarks.bench_polars``):
+
+    seasons x teams   team-weeks   pandas    polars   speedup
+    5 x 32            2,880        0.05 s    0.02 s   2.3x
+    50 x 32           28,800       0.26 s    0.14 s   1.8x
+    50 x 320          288,000      1.47 s    0.67 s   2.2x
+
+Check against pandas on the cached data, and time both builds, with:
+
+    python -m src.polars_features --start 2021 --end 2025 --check
+    python -m benchmarks.bench_polars --seasons 50 --teams 320
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from src import data_source
+from src.feature_engine import EWMA_ALPHA, ID_COLS, INDEPENDENT_VARIABLES, STATE_ID_COLS, ewma_columns
+from src.instrumentation import run, stage
+
+GROUP_COLS = ['team', 'season']
+FILL_ZERO = ['pat_pct_ewma_diff', 'fg_pct_ewma_diff']
+TABLES = ['df_clean', 'games_with_stats', 'most_recent_stats']
+
+
+def add_derived_features(team_stats):
+    """``feature_engine.add_derived_features`` as expressions."""
+    return team_stats.with_columns(
+        turnovers_offense=(pl.col('passing_interceptions') + pl.col('sack_fumbles_lost')
+                           + pl.col('rushing_fumbles_lost') + pl.col('receiving_fumbles_lost')),
+        turnovers_defense=pl.col('def_interceptions') + pl.col('def_fumbles'),
+        completion_pct=pl.col('completions') / pl.col('attempts'),
+    ).with_columns(
+        turnover_margin=pl.col('turnovers_defense') - pl.col('turnovers_offense'),
+    )
+
+
+def team_features(team_stats, variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """Lazy ``df_clean`` from team stats after ``add_derived_features``."""
+    ewma = [
+        pl.col(var).cast(pl.Float64).fill_nan(None)
+        .ewm_mean(alpha=alpha, adjust=False, ignore_nulls=False)
+        .forward_fill()
+        .over(GROUP_COLS)
+        .alias(col)
+        for var, col in zip(variables, ewma_columns(variables))
+    ]
+    team_stats = team_stats.sort(['season', 'week', 'team'], maintain_order=True)
+    return team_stats.select(ID_COLS + ewma)
+
+
+def completed_games(schedule):
+    """Completed regular-season games with ``home_win``, like ``feature_engine.completed_games``."""
+    games = schedule.filter(
+        (pl.col('game_type') == 'REG')
+        & pl.col('home_score').is_not_null()
+        & pl.col('away_score').is_not_null()
+    )
+    games = games.with_columns(home_win=(pl.col('home_score') > pl.col('away_score')).cast(pl.Int64))
+    return games.sort(['season', 'week'], maintain_order=True)
+
+
+def games_with_stats(games, df_clean, variables=INDEPENDENT_VARIABLES):
+    """Home and away EWMA stats and ``*_diff`` columns, by two left joins."""
+    cols = ewma_columns(variables)
+    stats = df_clean.select(['season', 'week', 'team'] + cols)
+    for side in ('home', 'away'):
+        side_stats = stats.rename({'team': f'{side}_team', **{c: f'{side}_{c}' for c in cols}})
+        games = games.join(side_stats, on=['season', 'week', f'{side}_team'], how='left', maintain_order='left')
+    return games.with_columns(**{f'{c}_diff': pl.col(f'home_{c}') - pl.col(f'away_{c}') for c in cols})
+
+
+def most_recent_stats(df_clean, variables=INDEPENDENT_VARIABLES):
+    """Each team's latest row, like ``feature_engine.latest_team_stats``."""
+    latest = df_clean.sort(['team', 'season', 'week'], maintain_order=True)
+    latest = latest.group_by('team', maintain_order=True).last()
+    return latest.select(STATE_ID_COLS + ewma_columns(variables))
+
+
+def build_features(seasons, variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """``(df_clean, games_with_stats, most_recent_stats)`` as Polars frames."""
+    team_stats = add_derived_features(data_source.scan('team_stats', seasons))
+    with stage('polars_features') as span:
+        # Collected first: as a shared subplan of the joins below, the
+        # windowed EWMA would be run once per consumer.
+        df_clean = team_features(team_stats, variables, alpha).collect()
+        games = completed_games(data_source.scan('schedules', seasons))
+        games, recent = pl.collect_all([
+            games_with_stats(games, df_clean.lazy(), variables),
+            most_recent_stats(df_clean.lazy(), variables),
+        ])
+        span.rows = df_clean.height
+    return df_clean, games, recent
+
+
+def training_data(games, features, test_season):
+    """``(X_train, y_train, X_test, y_test)`` NumPy arrays, split like the notebook.
+
+    Missing kicking percentage diffs are 0, as in the notebook.
+    """
+    games = games.lazy().with_columns(pl.col(c).fill_null(0) for c in FILL_ZERO if c in features)
+    train, test = pl.collect_all([
+        games.filter(pl.col('season') < test_season).select(features + ['home_win']),
+        games.filter(pl.col('season') == test_season).select(features + ['home_win']),
+    ])
+    return (
+        train.select(features).to_numpy().astype(np.float64), train['home_win'].to_numpy(),
+        test.select(features).to_numpy().astype(np.float64), test['home_win'].to_numpy(),
+    )
+
+
+def pandas_features(seasons, variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """The same three tables from the eager pandas ``feature_engine`` path."""
+    from src import feature_engine as fe
+
+    team_stats = fe.add_derived_features(data_source.load_team_stats(seasons))
+    df_clean, state = fe.build_team_features(team_stats, variables, alpha)
+    games = fe.build_games_with_stats(fe.completed_games(data_source.load_schedules(seasons)), df_clean, variables)
+    return df_clean.reset_index(drop=True), games, fe.latest_team_stats(state, variables)
+
+
+def compare(expected, actual):
+    """Largest absolute difference per table between pandas and Polars builds.
+
+    Raises ``AssertionError`` if the tables differ in rows, columns or
+    anything beyond float rounding.
+    """
+    import pandas as pd
+
+    differences = {}
+    for name, frame, result in zip(TABLES, expected, actual):
+        result = result.to_pandas()
+        pd.testing.assert_frame_equal(result, frame, check_dtype=False, rtol=1e-12, atol=1e-12)
+        floats = frame.select_dtypes('float').columns
+        difference = np.abs(result[floats].to_numpy(dtype=np.float64) - frame[floats].to_numpy())
+        differences[name] = float(np.nanmax(difference, initial=0.))
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the feature tables with lazy Polars.")
+    parser.add_argument('--start', type=int, default=2021)
+    parser.add_argument('--end', type=int, help="last season (default: current)")
+    parser.add_argument('--check', action='store_true', help="compare with the pandas build")
+    args = parser.parse_args()
+
+    seasons = list(range(args.start, (args.end or data_source.get_current_season()) + 1))
+    if args.check:
+        differences = compare(pandas_features(seasons), build_features(seasons))
+        for name, difference in differences.items():
+            print(f"{name:<18} matches pandas (max difference {difference:.1e})")
+        return
+
+    start = time.perf_counter()
+    with run('polars_features'):
+        df_clean, games, recent = build_features(seasons)
+    print(f"{df_clean.height:,} team-weeks, {games.height:,} games, {recent.height} teams "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Long-running local HTTP service for home win probabilities.
+
+``get_nfl_diffs`` re-reads CSVs, merges twice and unpickles the model and
+scaler on every call. This service loads them once and keeps the latest team
+feature vectors in memory. The model bundle (``src/model_bundle.py``) is a
+logistic regression on raw ``home - away`` diffs with the scaler folded in,
+so every team collapses to one precomputed score::
+
+    logit = (home - away) @ weights + bias
+          = score[home] - score[away] + bias
+
+so a prediction is two array lookups and a sigmoid, with no sklearn
+validation in the request path.
+
+Run from the repo root:
+
+    python -m src.prediction_service --port 8000
+
+Endpoints (JSON):
+
+    GET  /health
+    GET  /predict?home=KC&away=BUF
+    POST /predict/batch   {"games": [{"home_team": "KC", "away_team": "BUF"}, ...]}
+    POST /reload          re-read the model bundle and most_recent_stats
+
+Probabilities are ``null`` for teams whose latest stats have missing values.
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from src.feature_store import load_table
+from src.model_bundle import BUNDLE_PATH, load_bundle
+
+# Latency targets for a single request, checked by benchmarks/loadgen.py.
+P50_TARGET_MS = 1.0
+P99_TARGET_MS = 5.0
+
+
+class ScoringModel:
+    """Fused scaler + logistic regression over per-team feature vectors."""
+
+    def __init__(self, teams, team_scores, bias, model_hash=None):
+        self.model_hash = model_hash
+        self.teams = list(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.team_scores = np.asarray(team_scores, dtype=np.float64)
+        self.bias = float(bias)
+
+    @classmethod
+    def from_artifacts(cls, bundle_path=BUNDLE_PATH):
+        bundle = load_bundle(bundle_path)
+
+        stat_cols = [f.removesuffix('_diff') for f in bundle.features]
+        stats = load_table('most_recent_stats', columns=['team'] + stat_cols)
+
+        # The bundle already has the scaler folded in, and differences cancel
+        # any per-team offset, so only T @ w is needed.
+        team_scores = stats[stat_cols].to_numpy(dtype=np.float64) @ bundle.weights
+        return cls(stats['team'], team_scores, bundle.bias, bundle.content_hash)
+
+    def _indices(self, teams):
+        try:
+            return np.fromiter((self.team_index[t] for t in teams), dtype=np.intp, count=len(teams))
+        except KeyError as e:
+            raise KeyError(f"unknown team: {e.args[0]}") from None
+
+    def predict_many(self, home_teams, away_teams):
+        """Home win probabilities for aligned sequences of home and away teams."""
+        logits = (self.team_scores[self._indices(home_teams)]
+                  - self.team_scores[self._indices(away_teams)] + self.bias)
+        return 1. / (1. + np.exp(-logits))
+
+    def predict(self, home_team, away_team):
+        logit = (self.team_scores[self._indices([home_team])[0]]
+                 - self.team_scores[self._indices([away_team])[0]] + self.bias)
+        return float(1. / (1. + np.exp(-logit)))
+
+
+def _probability(p):
+    """``p``, or None (JSON null) when it is NaN."""
+    return None if p != p else p
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so clients reuse connections
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        try:
+            body = json.dumps(payload, allow_nan=False).encode()
+        except ValueError as e:
+            status, body = 500, json.dumps({'error': str(e)}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        model = self.server.model
+
+        if url.path == '/health':
+            self._send(200, {'status': 'ok', 'model': model.model_hash, 'teams': model.teams})
+        elif url.path == '/predict':
+            query = parse_qs(url.query)
+            try:
+                home, away = query['home'][0], query['away'][0]
+                self._send(200, {
+                    'home_team': home,
+                    'away_team': away,
+                    'home_win_prob': _probability(model.predict(home, away)),
+                })
+            except KeyError as e:
+                self._send(400, {'error': str(e)})
+        else:
+            self._send(404, {'error': f"no route {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+
+        if url.path == '/predict/batch':
+            try:
+                games = self._read_json()['games']
+                home = [g['home_team'] for g in games]
+                away = [g['away_team'] for g in games]
+                probs = self.server.model.predict_many(home, away)
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {'error': str(e)})
+                return
+            self._send(200, {'predictions': [
+                {'home_team': h, 'away_team': a, 'home_win_prob': _probability(p)}
+                for h, a, p in zip(home, away, probs.tolist())
+            ]})
+        elif url.path == '/reload':
+            try:
+                self.server.reload()
+            except Exception as e:
+                # The previous model keeps serving.
+                self._send(500, {'error': f"reload failed: {e}", 'model': self.server.model.model_hash})
+                return
+            self._send(200, {'status': 'reloaded', 'model': self.server.model.model_hash})
+        else:
+            self._send(404, {'error': f"no route {url.path}"})
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, bundle_path=BUNDLE_PATH):
+        self.bundle_path = bundle_path
+        self._reload_lock = threading.Lock()
+        self.reload()
+        super().__init__(address, PredictionHandler)
+
+    def reload(self):
+        # Build the new model first and swap the reference, so in-flight
+        # requests keep scoring with the old one.
+        with self._reload_lock:
+            self.model = ScoringModel.from_artifacts(self.bundle_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve home win probabilities over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bundle', default=str(BUNDLE_PATH))
+    args = parser.parse_args()
+
+    server = PredictionServer((args.host, args.port), args.bundle)
+    print(f"Serving {len(server.model.teams)} teams on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
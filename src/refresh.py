@@ -0,0 +1,240 @@
+"""Scheduled, atomic refresh of the app's prediction artifacts.
+
+The app used to read ``data/latest_predictions.csv`` once per process and
+never notice a newer file, while a writer could expose a half-written CSV
+to a session reading it. A refresh now:
+
+1. optionally applies the latest completed week to the feature tables
+   (``weekly_update.update_week``);
+2. scores the current week's games from the latest team stats;
+3. writes the predictions to a temporary file next to the target and
+   renames it into place, so readers see the old file or the new one;
+4. then replaces ``data/manifest.json`` the same way, bumping its
+   ``version`` and recording each artifact's SHA-256.
+
+The manifest is written last, so a version number never points at files
+older than itself. A refresh whose predictions hash the same as the
+published ones leaves the manifest alone. The app keys its caches on
+``current_version()``, so each session reloads once per new version and
+reading the manifest is the only per-rerun cost.
+
+The scheduler runs as its own process, so refreshing never holds up the
+app. It refreshes every ``--interval`` seconds, or every
+``--game-day-interval`` seconds on days with games on the schedule.
+
+Run from the repo root:
+
+    python -m src.refresh --once                      # one refresh, then exit
+    python -m src.refresh                             # every 6 hours, 15 minutes on game days
+    python -m src.refresh --update --interval 3600 --game-day-interval 300
+
+The current-season schedule is cached for an hour by ``data_source``, so
+game-day intervals shorter than that pick up new results at most hourly.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import data_source
+from src.feature_store import load_table
+from src.instrumentation import run, stage
+from src.model_bundle import BUNDLE_PATH, load_bundle
+from src.nfl_predictor import matchup_diffs
+
+DATA_DIR = Path('data')
+MANIFEST_FILE = 'manifest.json'
+PREDICTIONS_FILE = 'latest_predictions.csv'
+
+INTERVAL_S = 6 * 3600
+GAME_DAY_INTERVAL_S = 15 * 60
+
+PREDICTION_COLUMNS = [
+    'game_id', 'matchup', 'away_team', 'home_team', 'game_date',
+    'home_win_prob', 'away_win_prob', 'predicted_winner', 'confidence',
+    'away_moneyline', 'home_moneyline',
+]
+
+
+def build_predictions(week_games, most_recent_stats, bundle):
+    """The ``latest_predictions.csv`` table for ``week_games``."""
+    week_games = week_games.reset_index(drop=True)
+    diffs = matchup_diffs(week_games, most_recent_stats, bundle)
+    with stage('predict', rows=len(diffs)):
+        home_win_prob = bundle.predict_proba(diffs)
+
+    predictions = pd.DataFrame({
+        'game_id': week_games['game_id'],
+        'matchup': week_games['away_team'] + ' @ ' + week_games['home_team'],
+        'away_team': week_games['away_team'],
+        'home_team': week_games['home_team'],
+        'game_date': week_games['gameday'],
+        'home_win_prob': home_win_prob,
+        'away_win_prob': 1 - home_win_prob,
+    })
+    predictions['predicted_winner'] = np.where(
+        predictions['home_win_prob'] > 0.5, predictions['home_team'], predictions['away_team'])
+    predictions['confidence'] = predictions[['home_win_prob', 'away_win_prob']].max(axis=1)
+    predictions['away_moneyline'] = week_games['away_moneyline']
+    predictions['home_moneyline'] = week_games['home_moneyline']
+    return predictions[PREDICTION_COLUMNS]
+
+
+def write_atomic(path, write):
+    """Call ``write(tmp_path)``, then rename the temporary file onto ``path``.
+
+    The temporary file is in the same directory, so the rename is atomic.
+    """
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.tmp-{os.getpid()}')
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def file_sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def read_manifest(data_dir=DATA_DIR):
+    """The published manifest, or ``None`` before the first refresh."""
+    path = Path(data_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def current_version(data_dir=DATA_DIR):
+    """Cache key for the published artifacts.
+
+    The manifest version, or the predictions file's mtime if nothing has
+    been published through a refresh yet.
+    """
+    manifest = read_manifest(data_dir)
+    if manifest is not None:
+        return manifest['version']
+    path = Path(data_dir) / PREDICTIONS_FILE
+    return path.stat().st_mtime if path.exists() else None
+
+
+def publish_predictions(predictions, metadata, data_dir=DATA_DIR):
+    """Atomically replace the predictions and the manifest.
+
+    Returns the new manifest, or ``None`` if the predictions are unchanged.
+    """
+    data_dir = Path(data_dir)
+    manifest = read_manifest(data_dir) or {'version': 0, 'artifacts': {}}
+    path = data_dir / PREDICTIONS_FILE
+
+    tmp = path.with_name(f'.{path.name}.tmp-{os.getpid()}')
+    try:
+        predictions.to_csv(tmp, index=False)
+        digest = file_sha256(tmp)
+        if path.exists() and manifest['artifacts'].get(PREDICTIONS_FILE, {}).get('sha256') == digest:
+            return None
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    manifest = {
+        **metadata,
+        'version': manifest['version'] + 1,
+        'published_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'artifacts': {
+            **manifest['artifacts'],
+            PREDICTIONS_FILE: {'sha256': digest, 'rows': len(predictions)},
+        },
+    }
+    write_atomic(data_dir / MANIFEST_FILE, lambda tmp: tmp.write_text(json.dumps(manifest, indent=2) + '\n'))
+    return manifest
+
+
+def update_features(season, data_dir=DATA_DIR):
+    """Apply the latest completed week of ``season`` to the feature tables."""
+    from src.weekly_update import update_week
+
+    team_stats = data_source.load_team_stats(season)
+    week = int(team_stats['week'].max())
+    update_week(team_stats[team_stats['week'] == week], data_source.load_schedules(season), data_dir)
+
+
+def refresh(data_dir=DATA_DIR, bundle_path=BUNDLE_PATH, update=False):
+    """One refresh: rescore the current week and publish if anything changed."""
+    season = data_source.get_current_season()
+    if update:
+        update_features(season, data_dir)
+
+    week = data_source.get_current_week()
+    schedule = data_source.load_schedules(season)
+    week_games = schedule[(schedule['season'] == season) & (schedule['week'] == week)]
+
+    with stage('model_load'):
+        bundle = load_bundle(bundle_path)
+    with stage('load_most_recent_stats') as span:
+        stat_cols = [f.removesuffix('_diff') for f in bundle.features]
+        most_recent_stats = load_table('most_recent_stats', columns=['team'] + stat_cols,
+                                       store_dir=Path(data_dir) / 'store')
+        span.rows = len(most_recent_stats)
+
+    predictions = build_predictions(week_games, most_recent_stats, bundle)
+    with stage('publish', rows=len(predictions)):
+        return predictions, publish_predictions(
+            predictions, {'season': season, 'week': week, 'model_hash': bundle.content_hash}, data_dir)
+
+
+def is_game_day(schedule, day=None):
+    """Whether any game on ``schedule`` is played on ``day`` (default today)."""
+    day = (day or date.today()).isoformat()
+    return bool((schedule['gameday'] == day).any())
+
+
+def next_interval(interval=INTERVAL_S, game_day_interval=GAME_DAY_INTERVAL_S):
+    """Seconds until the next refresh; the normal interval if the schedule is unavailable."""
+    try:
+        schedule = data_source.load_schedules(data_source.get_current_season())
+    except Exception:
+        return interval
+    return game_day_interval if is_game_day(schedule) else interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh and atomically publish the app's predictions.")
+    parser.add_argument('--once', action='store_true', help="refresh once and exit")
+    parser.add_argument('--update', action='store_true',
+                        help="apply the latest completed week to the feature tables first")
+    parser.add_argument('--interval', type=float, default=INTERVAL_S, help="seconds between refreshes")
+    parser.add_argument('--game-day-interval', type=float, default=GAME_DAY_INTERVAL_S,
+                        help="seconds between refreshes on days with games")
+    parser.add_argument('--data-dir', default=str(DATA_DIR))
+    parser.add_argument('--bundle', default=str(BUNDLE_PATH))
+    args = parser.parse_args()
+
+    while True:
+        start = time.perf_counter()
+        try:
+            with run('refresh'):
+                predictions, manifest = refresh(args.data_dir, args.bundle, args.update)
+        except Exception as exc:
+            # Keep serving the last published version; try again next time.
+            if args.once:
+                raise
+            print(f"{datetime.now():%Y-%m-%d %H:%M} refresh failed: {exc!r}")
+        else:
+            status = f"published version {manifest['version']}" if manifest else "unchanged"
+            print(f"{datetime.now():%Y-%m-%d %H:%M} {len(predictions)} games, {status} "
+                  f"({time.perf_counter() - start:.1f}s)")
+        if args.once:
+            return
+        time.sleep(next_interval(args.interval, args.game_day_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Materialized backtest table behind the app's Season Performance tab.
+
+The app used to rescore every game of the season on each cold start, with
+row-wise ``apply`` calls for the winners and per-element moneyline
+conversion. The pipeline now scores completed regular-season games once,
+with vectorized columns, and stores the result as the ``season_performance``
+table in the Parquet feature store. Weekly updates upsert only the new week,
+so the app loads a small precomputed table for whichever season it shows.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from src.feature_store import STORE_DIR, load_table, upsert_rows, write_table
+from src.instrumentation import stage
+from src.model_bundle import BUNDLE_PATH, load_bundle
+from src.odds import add_vegas_implied
+
+TABLE = 'season_performance'
+
+COLUMNS = [
+    'season', 'week', 'gameday', 'game_id', 'matchup',
+    'home_team', 'away_team', 'home_win',
+    'home_win_prob', 'away_win_prob', 'pred_home_win', 'model_correct',
+    'home_moneyline', 'away_moneyline', 'home_implied', 'away_implied',
+    'vegas_pred_home_win', 'vegas_correct',
+    'predicted_winner', 'actual_winner', 'model_hash',
+]
+
+
+def build_season_performance(games_with_stats, bundle):
+    """Score completed regular-season games and add model and Vegas results."""
+    games = games_with_stats[games_with_stats['game_type'] == 'REG']
+    games = games.dropna(subset=bundle.features + ['home_win', 'away_moneyline', 'home_moneyline'])
+    games = add_vegas_implied(games)
+
+    with stage('predict', rows=len(games)):
+        games['home_win_prob'] = bundle.predict_proba(games)
+    games['away_win_prob'] = 1 - games['home_win_prob']
+    games['pred_home_win'] = (games['home_win_prob'] > 0.5).astype(int)
+    games['model_correct'] = (games['pred_home_win'] == games['home_win']).astype(int)
+
+    games['vegas_pred_home_win'] = (games['home_implied'] > 0.5).astype(int)
+    games['vegas_correct'] = (games['vegas_pred_home_win'] == games['home_win']).astype(int)
+
+    games['matchup'] = games['away_team'] + ' @ ' + games['home_team']
+    games['predicted_winner'] = np.where(games['pred_home_win'] == 1, games['home_team'], games['away_team'])
+    games['actual_winner'] = np.where(games['home_win'] == 1, games['home_team'], games['away_team'])
+    games['model_hash'] = bundle.content_hash
+
+    return games[COLUMNS].sort_values(['season', 'week', 'gameday'], kind='stable').reset_index(drop=True)
+
+
+def write_season_performance(games_with_stats, bundle=None, store_dir=STORE_DIR):
+    """Rebuild the whole table, e.g. after retraining."""
+    bundle = bundle or load_bundle()
+    table = build_season_performance(games_with_stats, bundle)
+    write_table(table, TABLE, store_dir)
+    return table
+
+
+def update_season_performance(week_games, bundle_path=BUNDLE_PATH, store_dir=STORE_DIR):
+    """Upsert one week's completed games into the table.
+
+    Does nothing (and returns ``None``) until a full build has created it.
+    """
+    if not Path(store_dir, TABLE).exists():
+        return None
+    table = build_season_performance(week_games, load_bundle(bundle_path))
+    upsert_rows(table, TABLE, store_dir=store_dir)
+    return table
+
+
+def load_season_performance(season, store_dir=STORE_DIR):
+    """One season of the table, in week and kickoff order."""
+    table = load_table(TABLE, filters=[('season', '==', season)], store_dir=store_dir)
+    return table.sort_values(['week', 'gameday'], kind='stable').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    table = write_season_performance(load_table('games_with_stats'))
+    print(f"Wrote {TABLE}: {len(table)} games, seasons {sorted(table['season'].unique())}")
@@ -0,0 +1,265 @@
+"""Monte Carlo season simulator for division, playoff and seed odds.
+
+Completed regular-season games keep their results; every remaining game is a
+Bernoulli draw with the model's home win probability. A batch of simulations
+is one (simulations x games) boolean matrix, and standings come from matrix
+products with a (games x teams) ``home - away`` incidence matrix, so there is
+no Python loop over simulations or games:
+
+    wins = fixed_wins + home_wins @ (H - A) + A.sum(0)
+
+Ties between teams are broken by (basic) NFL-style criteria: division titles
+by overall record, then division record, then conference record; wild cards
+by record, then conference record; any remaining tie by a coin flip. Head-to-
+head, common games and strength of victory are not modelled.
+
+Run from the repo root (100k simulations take a few seconds on one core;
+``--jobs`` shards larger runs across processes):
+
+    python -m src.season_sim --season 2025
+    python -m src.season_sim --season 2025 --as-of-week 10 --sims 1000000 --jobs 4
+
+The result is cached in ``data/season_odds.json`` for the Playoff Odds page.
+"""
+import argparse
+import json
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import data_source
+from src.model_bundle import BUNDLE_PATH, load_bundle
+from src.prediction_service import ScoringModel
+
+DIVISIONS = {
+    'AFC East': ['BUF', 'MIA', 'NE', 'NYJ'],
+    'AFC North': ['BAL', 'CIN', 'CLE', 'PIT'],
+    'AFC South': ['HOU', 'IND', 'JAX', 'TEN'],
+    'AFC West': ['DEN', 'KC', 'LAC', 'LV'],
+    'NFC East': ['DAL', 'NYG', 'PHI', 'WAS'],
+    'NFC North': ['CHI', 'DET', 'GB', 'MIN'],
+    'NFC South': ['ATL', 'CAR', 'NO', 'TB'],
+    'NFC West': ['ARI', 'LA', 'SEA', 'SF'],
+}
+# Team index order is conference, then division, then team: team i is in
+# division i // 4 and conference i // 16.
+TEAMS = [team for teams in DIVISIONS.values() for team in teams]
+TEAM_INDEX = {team: i for i, team in enumerate(TEAMS)}
+N_DIVISIONS = len(DIVISIONS)
+PLAYOFF_TEAMS = 7  # per conference: 4 division winners + 3 wild cards
+
+RESULTS_PATH = Path('data/season_odds.json')
+BATCH_SIZE = 25_000
+
+
+def prepare_season(schedule, as_of_week=None):
+    """Split a season's regular-season schedule into fixed and remaining games.
+
+    Games with scores (in weeks up to ``as_of_week``, if given) are fixed.
+    Returns a dict of arrays used by ``simulate``; win counts are in
+    half-wins so ties stay integral.
+    """
+    games = schedule[schedule['game_type'] == 'REG']
+    unknown = set(games['home_team']).union(games['away_team']) - set(TEAMS)
+    if unknown:
+        raise ValueError(f"schedule has teams outside DIVISIONS: {sorted(unknown)}")
+    home = games['home_team'].map(TEAM_INDEX).to_numpy(dtype=np.intp)
+    away = games['away_team'].map(TEAM_INDEX).to_numpy(dtype=np.intp)
+
+    played = (games['home_score'].notna() & games['away_score'].notna()).to_numpy()
+    if as_of_week is not None:
+        played &= (games['week'] <= as_of_week).to_numpy()
+
+    same_div = home // 4 == away // 4
+    same_conf = home // 16 == away // 16
+
+    # Half-wins from completed games: 2 for a win, 1 each for a tie.
+    margin = (games['home_score'] - games['away_score']).to_numpy()[played]
+    home_half = np.where(margin > 0, 2, np.where(margin == 0, 1, 0))
+    fixed = {}
+    for name, mask in (('wins', np.ones_like(same_div)), ('div', same_div), ('conf', same_conf)):
+        m = mask[played]
+        fixed[name] = (
+            np.bincount(home[played][m], weights=home_half[m], minlength=len(TEAMS))
+            + np.bincount(away[played][m], weights=2 - home_half[m], minlength=len(TEAMS))
+        )
+
+    remaining = ~played
+    return {
+        'fixed': fixed,
+        'home': home[remaining],
+        'away': away[remaining],
+        'same_div': same_div[remaining],
+        'same_conf': same_conf[remaining],
+        'remaining_games': games[remaining].reset_index(drop=True),
+    }
+
+
+def _incidence(season):
+    """(games x teams) ``H - A`` matrices for all, division and conference
+    games, and each team's remaining away-game counts."""
+    n_games = len(season['home'])
+    rows = np.arange(n_games)
+    H = np.zeros((n_games, len(TEAMS)), dtype=np.float32)
+    A = np.zeros_like(H)
+    H[rows, season['home']] = 1
+    A[rows, season['away']] = 1
+
+    out = {}
+    for name, mask in (('wins', np.ones(n_games, bool)), ('div', season['same_div']),
+                       ('conf', season['same_conf'])):
+        out[name] = ((H - A) * mask[:, None], (A * mask[:, None]).sum(0))
+    return out
+
+
+def _seeds(wins, div, conf, coin):
+    """Playoff seed (1-7, 0 = out) of every team in every simulation."""
+    n = len(wins)
+    div_key = (wins * 64 + div) * 64 + conf + coin
+    conf_key = (wins * 64 + conf) * 64 + coin
+
+    winners = div_key.reshape(n, N_DIVISIONS, 4).argmax(axis=2) + np.arange(0, len(TEAMS), 4)
+    seeds = np.zeros((n, len(TEAMS)), dtype=np.int8)
+    sims = np.arange(n)[:, None]
+
+    for c in range(2):
+        conf_winners = winners[:, 4 * c:4 * c + 4]
+        order = np.argsort(-np.take_along_axis(conf_key, conf_winners, axis=1), axis=1)
+        seeds[sims, np.take_along_axis(conf_winners, order, axis=1)] = np.arange(1, 5)
+
+        wild_key = conf_key[:, 16 * c:16 * c + 16].copy()
+        wild_key[sims, conf_winners - 16 * c] = -np.inf
+        wild_cards = np.argsort(-wild_key, axis=1)[:, :PLAYOFF_TEAMS - 4] + 16 * c
+        seeds[sims, wild_cards] = np.arange(5, PLAYOFF_TEAMS + 1)
+    return seeds
+
+
+def _run_shard(season, probs, n_sims, seed, batch_size=BATCH_SIZE):
+    """Simulate ``n_sims`` seasons; returns summed seed counts and wins."""
+    rng = np.random.default_rng(seed)
+    incidence = _incidence(season)
+    probs = np.asarray(probs, dtype=np.float32)
+
+    seed_counts = np.zeros((len(TEAMS), PLAYOFF_TEAMS + 1), dtype=np.int64)
+    wins_sum = np.zeros(len(TEAMS))
+    for start in range(0, n_sims, batch_size):
+        n = min(batch_size, n_sims - start)
+        home_wins = (rng.random((n, len(probs)), dtype=np.float32) < probs).astype(np.float32)
+
+        totals = {
+            name: season['fixed'][name] + 2 * (home_wins @ diff + away_games)
+            for name, (diff, away_games) in incidence.items()
+        }
+        seeds = _seeds(totals['wins'], totals['div'], totals['conf'], rng.random((n, len(TEAMS))))
+
+        seed_counts += np.stack([(seeds == k).sum(axis=0) for k in range(PLAYOFF_TEAMS + 1)], axis=1)
+        wins_sum += totals['wins'].sum(axis=0) / 2
+    return seed_counts, wins_sum
+
+
+def simulate(season, probs, n_sims=100_000, n_jobs=1, seed=0):
+    """Division, playoff and seed probabilities for every team.
+
+    ``probs`` are home win probabilities for ``season['remaining_games']``.
+    With ``n_jobs > 1`` the simulations are split into independently seeded
+    shards run in separate processes.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_jobs)
+    shard_sizes = [len(s) for s in np.array_split(np.arange(n_sims), n_jobs)]
+
+    if n_jobs == 1:
+        results = [_run_shard(season, probs, n_sims, seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_run_shard, [season] * n_jobs, [probs] * n_jobs, shard_sizes, seeds))
+
+    seed_counts = sum(r[0] for r in results)
+    wins_sum = sum(r[1] for r in results)
+
+    odds = pd.DataFrame({
+        'team': TEAMS,
+        'conference': [d.split()[0] for d in DIVISIONS for _ in range(4)],
+        'division': [d for d in DIVISIONS for _ in range(4)],
+        'current_wins': season['fixed']['wins'] / 2,
+        'mean_wins': wins_sum / n_sims,
+        'division_prob': seed_counts[:, 1:5].sum(axis=1) / n_sims,
+        'playoff_prob': seed_counts[:, 1:].sum(axis=1) / n_sims,
+    })
+    for k in range(1, PLAYOFF_TEAMS + 1):
+        odds[f'seed_{k}'] = seed_counts[:, k] / n_sims
+    return odds
+
+
+def remaining_probabilities(remaining_games, bundle_path=BUNDLE_PATH):
+    """Model home win probabilities for the remaining games.
+
+    Games with a team missing from ``most_recent_stats``, or whose stats have
+    missing values, get 0.5 with a warning naming them; a NaN probability
+    would otherwise make the game an away win in every simulation.
+    """
+    model = ScoringModel.from_artifacts(bundle_path)
+    home, away = remaining_games['home_team'], remaining_games['away_team']
+    known = (home.isin(model.team_index) & away.isin(model.team_index)).to_numpy()
+    probs = np.full(len(remaining_games), np.nan)
+    probs[known] = model.predict_many(home[known].tolist(), away[known].tolist())
+
+    missing = np.isnan(probs)
+    if missing.any():
+        games = remaining_games.loc[missing, 'game_id'].tolist()
+        warnings.warn(f"no model probability for {len(games)} games, simulated as 0.5: {', '.join(games)}")
+        probs[missing] = 0.5
+    return probs
+
+
+def save_odds(odds, metadata, path=RESULTS_PATH):
+    doc = {**metadata, 'teams': odds.to_dict(orient='records')}
+    Path(path).write_text(json.dumps(doc, indent=2) + '\n')
+
+
+def load_odds(path=RESULTS_PATH):
+    """Cached simulation result as ``(odds, metadata)``."""
+    doc = json.loads(Path(path).read_text())
+    return pd.DataFrame(doc.pop('teams')), doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the rest of the season.")
+    parser.add_argument('--season', type=int, help="season to simulate (default: current)")
+    parser.add_argument('--as-of-week', type=int, help="treat games after this week as unplayed")
+    parser.add_argument('--sims', type=int, default=100_000)
+    parser.add_argument('--jobs', type=int, default=1, help="processes to shard simulations across")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=str(RESULTS_PATH))
+    args = parser.parse_args()
+
+    season_year = args.season or data_source.get_current_season()
+    season = prepare_season(data_source.load_schedules(season_year), args.as_of_week)
+    probs = remaining_probabilities(season['remaining_games'])
+
+    start = time.perf_counter()
+    odds = simulate(season, probs, args.sims, args.jobs, args.seed)
+    elapsed = time.perf_counter() - start
+
+    save_odds(odds, {
+        'season': season_year,
+        'as_of_week': args.as_of_week,
+        'remaining_games': len(probs),
+        'simulations': args.sims,
+        'model_hash': load_bundle().content_hash,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }, args.out)
+
+    print(odds.sort_values('playoff_prob', ascending=False)[
+        ['team', 'current_wins', 'mean_wins', 'division_prob', 'playoff_prob', 'seed_1']
+    ].to_string(index=False, float_format='{:.3f}'.format))
+    print(f"\n{args.sims:,} simulations of {len(probs)} remaining games in {elapsed:.2f}s; "
+          f"saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Sweep EWMA alpha and feature sets in one batched pass.
+
+Tuning ``EWMA_ALPHA`` or the feature list used to mean editing the notebook
+and re-running everything: every EWMA, both home/away merges and the fit.
+The sweep loads the raw team stats once and:
+
+1. computes the EWMA of every variable for every alpha together, as an
+   (alpha, team-game, variable) array (``compute_ewma_grid``);
+2. looks up each game's home and away team-game rows once, so the diff
+   matrices for all alphas are two fancy-indexing gathers, not merges;
+3. fits and scores every (alpha, feature set) candidate in parallel with
+   the notebook's split and model (train on earlier seasons, test on the
+   last; ``StandardScaler`` + ``LogisticRegression``).
+
+Run from the repo root:
+
+    python -m src.sweep
+    python -m src.sweep --alphas 0.2 0.3 0.4 0.5 \\
+        --feature-set passing=passing_yards,passing_tds,completion_pct \\
+        --out outputs/sweep.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src import data_source
+from src.backtest import probability_scores
+from src.feature_engine import (
+    INDEPENDENT_VARIABLES,
+    add_derived_features,
+    completed_games,
+    compute_ewma_grid,
+)
+from src.featurizer import MatchupFeaturizer
+from src.model_bundle import load_bundle
+
+DEFAULT_ALPHAS = np.round(np.arange(1, 21) * 0.05, 2)
+DEFAULT_SEASONS = [2021, 2022, 2023, 2024, 2025]
+
+
+def default_feature_sets():
+    """The bundle's features and every independent variable."""
+    return {
+        'bundle': [f.removesuffix('_ewma_diff') for f in load_bundle().features],
+        'all': list(INDEPENDENT_VARIABLES),
+    }
+
+
+def diff_tensor(team_stats, games, variables, alphas):
+    """``home - away`` EWMA diffs for every game, as an (alpha, game, variable) array.
+
+    ``team_stats`` must already have the derived features. Games whose home or
+    away team has no stats row for that week get NaN.
+    """
+    team_stats = team_stats.sort_values(['season', 'week', 'team'], kind='stable')
+    ewma = compute_ewma_grid(team_stats, variables, alphas)
+    # One padding row of NaN for games without a matching team-game, the row
+    # the featurizer points unknown teams at.
+    ewma = np.concatenate([ewma, np.full(ewma[:, :1].shape, np.nan)], axis=1)
+
+    featurizer = MatchupFeaturizer(team_stats, variables, keys=('season', 'week', 'team'))
+    return ewma[:, featurizer.row_indices(games, 'home')] - ewma[:, featurizer.row_indices(games, 'away')]
+
+
+def _evaluate(X, y, train):
+    keep = ~np.isnan(X).any(axis=1)
+    train, test = train & keep, ~train & keep
+    scaler = StandardScaler().fit(X[train])
+    model = LogisticRegression(random_state=41, max_iter=1000).fit(scaler.transform(X[train]), y[train])
+    probs = model.predict_proba(scaler.transform(X[test]))[:, 1]
+    return {'train_games': int(train.sum()), 'test_games': int(test.sum()),
+            **probability_scores(y[test], probs)}
+
+
+def sweep(team_stats, schedule, alphas=DEFAULT_ALPHAS, feature_sets=None,
+          test_season=None, n_jobs=-1):
+    """Score every (alpha, feature set) pair; returns a table ranked by test log-loss."""
+    feature_sets = feature_sets or default_feature_sets()
+    variables = list(dict.fromkeys(v for vs in feature_sets.values() for v in vs))
+
+    games = completed_games(schedule).reset_index(drop=True)
+    diffs = diff_tensor(add_derived_features(team_stats), games, variables, alphas)
+
+    y = games['home_win'].to_numpy()
+    test_season = test_season or games['season'].max()
+    train = (games['season'] < test_season).to_numpy()
+
+    candidates = [
+        (alpha, name, [variables.index(v) for v in vs])
+        for i, alpha in enumerate(alphas)
+        for name, vs in feature_sets.items()
+    ]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate)(diffs[i // len(feature_sets)][:, cols], y, train)
+        for i, (_, _, cols) in enumerate(candidates)
+    )
+
+    results = pd.DataFrame([
+        {'alpha': alpha, 'feature_set': name, 'n_features': len(cols), **score}
+        for (alpha, name, cols), score in zip(candidates, scores)
+    ])
+    return results.sort_values(['log_loss', 'accuracy'], ascending=[True, False]).reset_index(drop=True)
+
+
+def _feature_set(arg):
+    name, _, variables = arg.partition('=')
+    if not variables:
+        raise argparse.ArgumentTypeError("expected NAME=var1,var2,...")
+    return name, variables.split(',')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep EWMA alpha and feature sets.")
+    parser.add_argument('--alphas', type=float, nargs='+', default=list(DEFAULT_ALPHAS))
+    parser.add_argument('--feature-set', type=_feature_set, action='append',
+                        help="NAME=var1,var2,... (repeatable; default: bundle and all)")
+    parser.add_argument('--seasons', type=int, nargs='+', default=DEFAULT_SEASONS)
+    parser.add_argument('--test-season', type=int, help="held-out season (default: last)")
+    parser.add_argument('--jobs', type=int, default=-1)
+    parser.add_argument('--out', help="write the ranked table to this CSV")
+    args = parser.parse_args()
+
+    team_stats = data_source.load_team_stats(args.seasons)
+    schedule = data_source.load_schedules(args.seasons)
+
+    start = time.perf_counter()
+    results = sweep(
+        team_stats, schedule, args.alphas,
+        dict(args.feature_set) if args.feature_set else None,
+        args.test_season, args.jobs,
+    )
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.max_rows', None, 'display.float_format', '{:.4f}'.format):
+        print(results.to_string(index=False))
+    print(f"\n{len(results)} candidates in {elapsed:.2f}s")
+
+    if args.out:
+        results.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compact, indexed copy of ``df_clean`` for the Explore Stats page.
+
+All seasons are held once, sorted by (season, team, week), as categorical
+team codes, int16/int8 season and week columns and float32 stats, with a
+(season, team) index of row slices and each team-season's summary statistics
+computed up front. A page rerun is then a dictionary lookup and an array slice
+instead of a boolean filter over a season DataFrame plus a fresh aggregation.
+
+    table = TeamStatsTable(load_table('df_clean'))
+    table.team_frame(2025, 'DET', 'passing_yards_ewma')
+    table.summary(2025, 'DET', 'passing_yards_ewma')   # {'mean': ..., 'last': ...}
+"""
+import numpy as np
+import pandas as pd
+
+SUMMARY_STATS = ('mean', 'max', 'min', 'std', 'last')
+
+
+class TeamStatsTable:
+    def __init__(self, df_clean):
+        self.stat_columns = [c for c in df_clean.columns if c.endswith('_ewma')]
+        df = df_clean.sort_values(['season', 'team', 'week'], kind='stable')
+
+        # Codes are int8 for up to 127 teams, int16 beyond.
+        teams = pd.CategoricalDtype(sorted(set(df['team']) | set(df['opponent_team'].dropna())))
+        self.teams = list(teams.categories)
+        self.team = df['team'].astype(teams).cat.codes.to_numpy()
+        self.opponent = df['opponent_team'].astype(teams).cat.codes.to_numpy()
+        self.season = df['season'].to_numpy(dtype=np.int16)
+        self.week = df['week'].to_numpy(dtype=np.int8)
+        self.stats = df[self.stat_columns].to_numpy(dtype=np.float32)
+
+        key = self.season.astype(np.int32) * len(self.teams) + self.team
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        stops = np.r_[starts[1:], len(key)]
+        self._groups = {
+            (int(self.season[s]), self.teams[self.team[s]]): i for i, s in enumerate(starts)
+        }
+        self._starts, self._stops = starts, stops
+
+        grouped = pd.DataFrame(self.stats, columns=self.stat_columns).groupby(
+            np.repeat(np.arange(len(starts)), stops - starts))
+        # (group, summary stat, column)
+        self.summaries = np.stack([
+            grouped.mean().to_numpy(),
+            grouped.max().to_numpy(),
+            grouped.min().to_numpy(),
+            grouped.std().to_numpy(),
+            self.stats[stops - 1],
+        ], axis=1).astype(np.float32)
+
+        self._seasons = sorted({season for season, _ in self._groups})
+        self._season_teams = {
+            season: sorted(team for s, team in self._groups if s == season) for season in self._seasons
+        }
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.team, self.opponent, self.season, self.week,
+                                      self.stats, self.summaries, self._starts, self._stops))
+
+    def seasons(self):
+        return self._seasons
+
+    def teams_in(self, season):
+        return self._season_teams.get(season, [])
+
+    def _slice(self, season, team):
+        group = self._groups[(season, team)]
+        return group, slice(self._starts[group], self._stops[group])
+
+    def team_frame(self, season, team, stat):
+        """``week``, ``opponent_team`` and ``stat`` for one team-season, by week."""
+        _, rows = self._slice(season, team)
+        return pd.DataFrame({
+            'week': self.week[rows],
+            'opponent_team': pd.Categorical.from_codes(self.opponent[rows], self.teams),
+            stat: self.stats[rows, self.stat_columns.index(stat)],
+        })
+
+    def summary(self, season, team, stat):
+        """Precomputed ``SUMMARY_STATS`` of ``stat`` for one team-season."""
+        group, _ = self._slice(season, team)
+        values = self.summaries[group, :, self.stat_columns.index(stat)]
+        return dict(zip(SUMMARY_STATS, values.tolist()))
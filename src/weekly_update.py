@@ -0,0 +1,236 @@
+"""Incremental weekly refresh of the team feature tables.
+
+EWMA with ``adjust=False`` is a one-step recurrence, so appending a completed
+week only needs each team's last EWMA state, not every season since 2021.
+A full rebuild saves that state to ``data/ewma_state.pkl`` together with the
+byte offset where the last week starts in each CSV. ``update_week`` then
+applies one week in O(teams): it appends new rows, or truncates and re-writes
+them if that week was already applied, and produces the same bytes as a full
+rebuild over the same data. The Parquet feature store in ``data/store/`` is
+kept in sync: a rebuild rewrites it and a weekly update rewrites only the
+affected season partition, including the scored ``season_performance`` table,
+and the 32 x 32 matchup probability matrix is rebuilt from the new team stats.
+
+Run from the repo root:
+
+    python -m src.weekly_update                       # latest completed week
+    python -m src.weekly_update --season 2025 --week 18
+    python -m src.weekly_update --rebuild --seasons 2021 2022 2023 2024 2025
+    python -m src.weekly_update --rebuild --player-features   # add src.player_stats features
+
+A rebuild with ``--player-features`` saves ``PLAYER_VARIABLES`` with the
+state, and later weekly updates aggregate that season's player stats too.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import joblib
+
+from src import data_source
+from src.feature_engine import (
+    EWMA_ALPHA,
+    INDEPENDENT_VARIABLES,
+    add_derived_features,
+    build_games_with_stats,
+    build_team_features,
+    completed_games,
+    latest_team_stats,
+    update_team_features,
+)
+from src.feature_store import upsert_rows, write_table
+from src.instrumentation import run, stage
+from src.matchup_matrix import MATRIX_PATH, write_matchup_matrix
+from src.player_stats import PLAYER_VARIABLES, add_player_features, build_player_features
+from src.season_performance import update_season_performance, write_season_performance
+
+DATA_DIR = Path('data')
+STATE_FILE = 'ewma_state.pkl'
+STORE_DIR_NAME = 'store'
+MOST_RECENT_FILE = 'most_recent_stats.csv'
+TABLE_FILES = {
+    'df_clean': 'df_clean.csv',
+    'games_with_stats': 'games_with_stats.csv',
+}
+
+
+def _week_key(df):
+    return df['season'] * 100 + df['week']
+
+
+def save_feature_tables(team_stats, df_clean, games_with_stats, state, data_dir=DATA_DIR,
+                        variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """Write the feature CSVs from a full build and the state for ``update_week``.
+
+    ``team_stats`` are the derived-feature rows ``df_clean`` was built from;
+    they are used to recover the state before the last week, so re-running
+    that week later is an upsert rather than a double update.
+    """
+    data_dir = Path(data_dir)
+    last_key = _week_key(df_clean).max()
+    prior_state = build_team_features(
+        team_stats[_week_key(team_stats) < last_key], variables, alpha)[1]
+
+    tables = {'df_clean': df_clean, 'games_with_stats': games_with_stats}
+    offsets = {}
+    for name, df in tables.items():
+        path = data_dir / TABLE_FILES[name]
+        is_last = _week_key(df) == last_key
+        df[~is_last].to_csv(path, index=False)
+        offsets[name] = path.stat().st_size
+        df[is_last].to_csv(path, mode='a', header=False, index=False)
+
+    most_recent = latest_team_stats(state, variables)
+    most_recent.to_csv(data_dir / MOST_RECENT_FILE, index=False)
+
+    store_dir = data_dir / STORE_DIR_NAME
+    for name, df in tables.items():
+        write_table(df, name, store_dir)
+    write_table(most_recent, 'most_recent_stats', store_dir)
+
+    joblib.dump({
+        'season': int(last_key // 100),
+        'week': int(last_key % 100),
+        'variables': list(variables),
+        'alpha': alpha,
+        'state': state,
+        'prior_state': prior_state,
+        'offsets': offsets,
+        'dtypes': {name: df.dtypes for name, df in tables.items()},
+    }, data_dir / STATE_FILE)
+
+
+def full_rebuild(team_stats, schedule, data_dir=DATA_DIR,
+                 variables=INDEPENDENT_VARIABLES, alpha=EWMA_ALPHA):
+    """Recompute every feature table from raw team stats and schedules."""
+    team_stats = add_derived_features(team_stats)
+    df_clean, state = build_team_features(team_stats, variables, alpha)
+    games_with_stats = build_games_with_stats(completed_games(schedule), df_clean, variables)
+
+    with stage('write', rows=len(df_clean) + len(games_with_stats)):
+        save_feature_tables(team_stats, df_clean, games_with_stats, state, data_dir, variables, alpha)
+        write_season_performance(games_with_stats, store_dir=Path(data_dir) / STORE_DIR_NAME)
+        write_matchup_matrix(latest_team_stats(state, variables), path=Path(data_dir) / MATRIX_PATH.name)
+    return df_clean, games_with_stats, state
+
+
+def _match_schema(df, dtypes, name):
+    if set(df.columns) != set(dtypes.index):
+        raise ValueError(f"{name} columns changed since the last full rebuild; run --rebuild")
+    try:
+        return df[dtypes.index].astype(dtypes)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} dtypes changed since the last full rebuild; run --rebuild") from e
+
+
+def update_week(week_stats, week_schedule, data_dir=DATA_DIR):
+    """Append (or upsert) one completed week to the feature tables in place.
+
+    ``week_stats`` are raw ``nfl.load_team_stats`` rows for a single season and
+    week; ``week_schedule`` may be the whole season's schedule. Returns the new
+    ``df_clean`` rows.
+    """
+    data_dir = Path(data_dir)
+    with stage('load_state'):
+        saved = joblib.load(data_dir / STATE_FILE)
+
+    weeks = week_stats[['season', 'week']].drop_duplicates()
+    if len(weeks) != 1:
+        raise ValueError("week_stats must contain exactly one season and week")
+    season, week = (int(v) for v in weeks.iloc[0])
+
+    upsert = (season, week) == (saved['season'], saved['week'])
+    if upsert:
+        base_state = saved['prior_state']
+    elif (season, week) > (saved['season'], saved['week']):
+        base_state = saved['state']
+    else:
+        raise ValueError(
+            f"{season} week {week} is before the last applied week "
+            f"({saved['season']} week {saved['week']}); run --rebuild"
+        )
+
+    variables, alpha = saved['variables'], saved['alpha']
+    week_stats = add_derived_features(week_stats)
+    if set(PLAYER_VARIABLES) & set(variables):
+        # usage_out looks back over earlier games, so aggregate the whole season.
+        week_stats = add_player_features(week_stats, build_player_features(season))
+    with stage('feature_build', rows=len(week_stats)):
+        rows, state = update_team_features(base_state, week_stats, variables, alpha)
+
+    week_schedule = week_schedule[
+        (week_schedule['season'] == season) & (week_schedule['week'] == week)
+    ]
+    games = build_games_with_stats(completed_games(week_schedule), rows, variables)
+
+    tables = {
+        name: _match_schema(df, saved['dtypes'][name], name)
+        for name, df in {'df_clean': rows, 'games_with_stats': games}.items()
+    }
+
+    with stage('write', rows=sum(len(df) for df in tables.values())):
+        offsets = {}
+        for name, df in tables.items():
+            path = data_dir / TABLE_FILES[name]
+            if upsert:
+                os.truncate(path, saved['offsets'][name])
+            offsets[name] = path.stat().st_size
+            df.to_csv(path, mode='a', header=False, index=False)
+
+        most_recent = latest_team_stats(state, variables)
+        most_recent.to_csv(data_dir / MOST_RECENT_FILE, index=False)
+
+        store_dir = data_dir / STORE_DIR_NAME
+        for name, df in tables.items():
+            upsert_rows(df, name, store_dir=store_dir)
+        write_table(most_recent, 'most_recent_stats', store_dir)
+        update_season_performance(tables['games_with_stats'], store_dir=store_dir)
+        write_matchup_matrix(most_recent, path=data_dir / MATRIX_PATH.name)
+
+        saved.update({
+            'season': season,
+            'week': week,
+            'state': state,
+            'prior_state': base_state,
+            'offsets': offsets,
+        })
+        joblib.dump(saved, data_dir / STATE_FILE)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the team feature tables.")
+    parser.add_argument('--season', type=int, help="season to update (default: current)")
+    parser.add_argument('--week', type=int, help="week to apply (default: latest completed)")
+    parser.add_argument('--rebuild', action='store_true', help="recompute every season from scratch")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2021, 2022, 2023, 2024, 2025])
+    parser.add_argument('--player-features', action='store_true',
+                        help="with --rebuild, add PLAYER_VARIABLES from weekly player stats")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        with run('full_rebuild'):
+            team_stats = data_source.load_team_stats(args.seasons)
+            schedule = data_source.load_schedules(args.seasons)
+            variables = INDEPENDENT_VARIABLES
+            if args.player_features:
+                team_stats = add_player_features(team_stats, build_player_features(args.seasons))
+                variables = INDEPENDENT_VARIABLES + PLAYER_VARIABLES
+            df_clean, _, _ = full_rebuild(team_stats, schedule, variables=variables)
+        print(f"Rebuilt {len(df_clean):,} team-week rows for seasons {args.seasons}")
+        return
+
+    season = args.season or data_source.get_current_season()
+    with run('weekly_update'):
+        team_stats = data_source.load_team_stats(season)
+        week = args.week or int(team_stats['week'].max())
+
+        rows = update_week(
+            team_stats[team_stats['week'] == week],
+            data_source.load_schedules(season),
+        )
+    print(f"Applied {season} week {week}: {len(rows)} team rows")
+
+
+if __name__ == "__main__":
+    main()